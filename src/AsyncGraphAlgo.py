@@ -0,0 +1,144 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from GraphAlgo import GraphAlgo
+
+
+class _Batch:
+    """This class represents the shortest path requests from one source which wait for the same search."""
+
+    __slots__ = ("targets", "future", "task")
+
+    def __init__(self, future):
+        self.targets = set()
+        self.future = future
+        self.task = None
+
+
+class AsyncGraphAlgo:
+    """This class represents an asyncio front-end of a GraphAlgo, its coroutines run the queries on an executor
+    so the event loop is never blocked.
+    Concurrent shortest_path requests from the same source are coalesced into a single search: the requests
+    which arrive while a search from the source waits for its turn join it, and it ends once all their
+    targets are settled (see GraphAlgo.shortest_paths).
+    At most max_in_flight searches and calls run on the executor at a time, the others wait in the event loop,
+    which is where bursts of requests from the same source are batched together.
+    The queries hold the read lock of the graph while they run and mutate holds its write lock, so mutations
+    are serialized with respect to the running queries."""
+
+    def __init__(self, graph_algo: GraphAlgo, executor=None, max_in_flight: int = 4):
+        """A constructor for the class.
+        @:param graph_algo - GraphAlgo, the algorithms which answer the queries
+        @:param executor - concurrent.futures.Executor which runs the queries, None for a thread pool
+        of max_in_flight threads owned (and shut down by close) by this object
+        @:param max_in_flight - int, the maximal number of queries running on the executor at a time"""
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be positive")
+        self._algo = graph_algo
+        self._own_executor = executor is None
+        self._executor = ThreadPoolExecutor(max_in_flight) if executor is None else executor
+        self._max_in_flight = max_in_flight
+        self._semaphore = None
+        self._batches = {}
+        self._searches = 0
+        self._requests = 0
+
+    def get_graph_algo(self) -> GraphAlgo:
+        """This method returns the wrapped GraphAlgo.
+        @:return GraphAlgo - the algorithms of this class"""
+        return self._algo
+
+    def get_stats(self) -> dict:
+        """This method returns the counters of the coalescing.
+        @:return dict - the number of shortest_path requests and of the searches which answered them"""
+        return {"requests": self._requests, "searches": self._searches}
+
+    def close(self) -> None:
+        """This method shuts down the executor if it is owned by this object."""
+        if self._own_executor:
+            self._executor.shutdown()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    async def shortest_path(self, id1: int, id2: int) -> (float, list):
+        """
+        Returns the shortest path from node id1 to node id2, see GraphAlgo.shortest_path.
+        The request joins the pending search from id1 if there is one.
+        @:param id1 - The start node id
+        @:param id2 - The end node id
+        @:return The distance of the path, a list of the nodes ids that the path goes through
+        """
+        self._requests += 1
+        batch = self._batches.get(id1)
+        if batch is None:
+            batch = self._batches[id1] = _Batch(asyncio.get_running_loop().create_future())
+            batch.task = asyncio.ensure_future(self._search(id1, batch))
+        batch.targets.add(id2)
+        return (await asyncio.shield(batch.future))[id2]
+
+    async def call(self, method: str, *args, **kwargs):
+        """
+        Runs a query of the GraphAlgo on the executor, e.g. await call("connected_component", 1).
+        @:param method - str, the name of the GraphAlgo method
+        @:return the result of the method
+        """
+        async with self._limit():
+            return await self._run(getattr(self._algo, method), *args, **kwargs)
+
+    async def mutate(self, function, *args, **kwargs):
+        """
+        Runs function(graph, *args, **kwargs) on the executor while holding the write lock of the graph,
+        so it runs alone and all its changes are seen at once by the queries, e.g.
+        await mutate(lambda graph: graph.add_edge(1, 2, 3.5)).
+        @:param function - the function which changes the graph
+        @:return the result of the function
+        """
+        graph = self._algo.get_graph()
+
+        def locked():
+            with graph.get_lock().writing():
+                return function(graph, *args, **kwargs)
+        async with self._limit():
+            return await self._run(locked)
+
+    async def _search(self, src: int, batch: _Batch) -> None:
+        """This coroutine answers a batch once a place on the executor is free, the batch is closed to new
+        requests when its search starts.
+        @:param src - The start node id
+        @:param batch - _Batch, the requests from src"""
+        try:
+            async with self._limit():
+                del self._batches[src]
+                self._searches += 1
+                targets = list(batch.targets)
+                if len(targets) == 1:
+                    result = {targets[0]: await self._run(self._algo.shortest_path, src, targets[0])}
+                else:
+                    result = await self._run(self._algo.shortest_paths, src, targets)
+        except asyncio.CancelledError:
+            batch.future.cancel()
+            raise
+        except Exception as e:
+            batch.future.set_exception(e)
+        else:
+            batch.future.set_result(result)
+        finally:
+            if self._batches.get(src) is batch:
+                del self._batches[src]
+
+    def _limit(self) -> asyncio.Semaphore:
+        """This method returns the semaphore which bounds the queries on the executor, it is created
+        in the event loop of the first query.
+        @:return asyncio.Semaphore - the semaphore"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_in_flight)
+        return self._semaphore
+
+    def _run(self, function, *args, **kwargs):
+        """This method runs a function on the executor.
+        @:return asyncio.Future - the result of the function"""
+        return asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
@@ -0,0 +1,261 @@
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import numpy as np
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def random_sparse(n: int, seed: int = 0, degree: int = 4) -> DiGraph:
+    """This function generates a random sparse graph, every node has about degree random out edges.
+    @:param n - the number of nodes
+    @:param seed - the seed of the generator, the same seed gives the same graph
+    @:param degree - the average out degree
+    @:return DiGraph - the graph"""
+    rng = np.random.default_rng(seed)
+    positions = rng.random((n, 2)) * 1000
+    edges = np.column_stack([rng.integers(0, n, n * degree), rng.integers(0, n, n * degree),
+                             rng.uniform(1, 10, n * degree)])
+    return _build(positions, edges)
+
+
+def grid_graph(n: int, seed: int = 0) -> DiGraph:
+    """This function generates a road-like graph: a square grid whose neighbours are connected in both
+    directions, the weight of every edge is its length times a random congestion factor in [1, 2).
+    @:param n - the number of nodes, rounded down to a square
+    @:param seed - the seed of the generator, the same seed gives the same graph
+    @:return DiGraph - the graph"""
+    rng = np.random.default_rng(seed)
+    side = max(1, math.isqrt(n))
+    keys = np.arange(side * side)
+    positions = np.column_stack([keys % side, keys // side]).astype(np.float64) * 10
+    right = keys[keys % side != side - 1]
+    down = keys[keys < side * (side - 1)]
+    sources = np.concatenate([right, right + 1, down, down + side])
+    dests = np.concatenate([right + 1, right, down + side, down])
+    weights = 10 * rng.uniform(1, 2, len(sources))
+    return _build(positions, np.column_stack([sources, dests, weights]))
+
+
+def scale_free(n: int, seed: int = 0, m: int = 3) -> DiGraph:
+    """This function generates a scale-free graph by preferential attachment (Barabasi-Albert): every new node
+    links to m existing nodes picked by their degree, and every such edge is reversed too with probability 1/2.
+    @:param n - the number of nodes
+    @:param seed - the seed of the generator, the same seed gives the same graph
+    @:param m - the number of edges of every new node
+    @:return DiGraph - the graph"""
+    rng = np.random.default_rng(seed)
+    picks = rng.random(n * m)
+    endpoints = list(range(min(n, m)))
+    sources = []
+    dests = []
+    for key in range(m, n):
+        for j in range(m):
+            target = endpoints[int(picks[key * m + j] * len(endpoints))]
+            sources.append(key)
+            dests.append(target)
+            endpoints.append(target)
+        endpoints.extend([key] * m)
+    sources = np.array(sources, dtype=np.int64)
+    dests = np.array(dests, dtype=np.int64)
+    back = rng.random(len(sources)) < 0.5
+    edges = np.column_stack([np.concatenate([sources, dests[back]]), np.concatenate([dests, sources[back]]),
+                             rng.uniform(1, 10, len(sources) + int(back.sum()))])
+    return _build(rng.random((n, 2)) * 1000, edges)
+
+
+GENERATORS = {"random": random_sparse, "grid": grid_graph, "scale_free": scale_free}
+
+
+def _build(positions: np.ndarray, edges: np.ndarray) -> DiGraph:
+    """This function builds a graph with the bulk methods of DiGraph.
+    @:param positions - np.ndarray of shape nx2, the (x, y) of node i
+    @:param edges - np.ndarray of shape mx3 of (src, dest, weight), invalid and repeated edges are skipped
+    @:return DiGraph - the graph"""
+    graph = DiGraph()
+    graph.add_nodes_from((key, (x, y, 0.0)) for key, (x, y) in enumerate(positions.tolist()))
+    graph.add_edges_from(edges)
+    return graph
+
+
+def peak_rss_kb():
+    """This function returns the peak resident set size of the current process.
+    @:return int - the peak RSS in KiB, None if it is not available on this platform"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _stats(samples: list) -> dict:
+    """This function summarizes the timings of repeated calls.
+    @:param samples - list of the seconds of every call
+    @:return dict - the number of calls, their total, mean, median, p95 and max seconds"""
+    samples = np.array(samples, dtype=np.float64)
+    return {"calls": len(samples), "seconds": float(samples.sum()), "mean": float(samples.mean()),
+            "median": float(np.median(samples)), "p95": float(np.percentile(samples, 95)),
+            "max": float(samples.max())}
+
+
+def _timed(call) -> float:
+    """This function times a single call.
+    @:param call - a function without arguments
+    @:return float - the seconds the call took"""
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+def run_case(generator: str, n: int, seed: int = 0, queries: int = 20, mutations: int = 1000,
+             plot: bool = True) -> dict:
+    """This function runs all the benchmarks on a single generated graph.
+    @:param generator - the name of the generator in GENERATORS
+    @:param n - the number of nodes
+    @:param seed - the seed of the graph and of the queries
+    @:param queries - the number of shortest_path and connected_component queries
+    @:param mutations - the number of add_edge calls (and a tenth as many remove_node calls)
+    @:param plot - if False plot_graph is not timed
+    @:return dict - the sizes of the graph, the timings by benchmark name and the peak RSS"""
+    timings = {}
+    start = time.perf_counter()
+    graph = GENERATORS[generator](n, seed)
+    timings["generate"] = {"seconds": time.perf_counter() - start}
+    algo = GraphAlgo(graph)
+    v_size = graph.v_size()
+    e_size = graph.e_size()
+    rng = np.random.default_rng(seed + 1)
+    handle, file_name = tempfile.mkstemp(suffix=".json")
+    os.close(handle)
+    try:
+        timings["save_to_json"] = {"seconds": _timed(lambda: algo.save_to_json(file_name)),
+                                   "bytes": os.path.getsize(file_name)}
+        loaded = GraphAlgo()
+        timings["load_from_json"] = {"seconds": _timed(lambda: loaded.load_from_json(file_name))}
+    finally:
+        os.remove(file_name)
+    pairs = rng.integers(0, v_size, (queries, 2)).tolist()
+    for method in ("dijkstra", "astar", "bidirectional"):
+        timings["shortest_path_" + method] = _stats([_timed(lambda: algo.shortest_path(src, dst, method=method))
+                                                     for src, dst in pairs])
+    timings["connected_components"] = {"seconds": _timed(GraphAlgo(graph).connected_components)}
+    components = GraphAlgo(graph)
+    timings["connected_component"] = _stats([_timed(lambda: components.connected_component(src))
+                                             for src, dst in pairs[:max(1, queries // 4)]])
+    if plot:
+        handle, image_name = tempfile.mkstemp(suffix=".png")
+        os.close(handle)
+        try:
+            timings["plot_graph"] = {"seconds": _timed(lambda: algo.plot_graph(save_to=image_name))}
+        finally:
+            os.remove(image_name)
+    edges = rng.integers(0, v_size, (mutations, 2)).tolist()
+    weights = rng.uniform(1, 10, mutations).tolist()
+    timings["add_edge"] = _stats([_timed(lambda: graph.add_edge(src, dst, w))
+                                  for (src, dst), w in zip(edges, weights)])
+    removed = rng.choice(v_size, size=min(v_size, max(1, mutations // 10)), replace=False).tolist()
+    timings["remove_node"] = _stats([_timed(lambda: graph.remove_node(key)) for key in removed])
+    return {"generator": generator, "nodes": v_size, "edges": e_size, "seed": seed, "timings": timings,
+            "peak_rss_kb": peak_rss_kb()}
+
+
+def run(generators: list, sizes: list, seed: int = 0, queries: int = 20, mutations: int = 1000,
+        plot: bool = True, isolate: bool = True, verbose: bool = False) -> dict:
+    """This function runs the benchmarks on every generator and size.
+    @:param generators - list of the names of the generators
+    @:param sizes - list of the numbers of nodes
+    @:param seed - the seed of the graphs and of the queries
+    @:param queries - the number of queries of every kind
+    @:param mutations - the number of add_edge calls
+    @:param plot - if False plot_graph is not timed
+    @:param isolate - if True every case runs in a fresh process, so its peak RSS is its own
+    @:param verbose - if True the timings of every case are printed to stderr as soon as it ends
+    @:return dict - the environment of the run and the results of every case"""
+    results = []
+    for generator in generators:
+        for n in sizes:
+            args = (generator, n, seed, queries, mutations, plot)
+            if isolate:
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                    result = pool.submit(run_case, *args).result()
+            else:
+                result = run_case(*args)
+            results.append(result)
+            if verbose:
+                print("%s %d: %s" % (generator, n, ", ".join("%s %.4fs" % (name, timing["seconds"])
+                                                              for name, timing in result["timings"].items())),
+                      file=sys.stderr)
+    return {"meta": {"python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+                     "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "seed": seed, "queries": queries,
+                     "mutations": mutations},
+            "results": results}
+
+
+def compare(report: dict, baseline: dict, threshold: float = 1.2) -> list:
+    """This function compares a report to a baseline report of the same cases.
+    @:param report - dict, the report of run()
+    @:param baseline - dict, an earlier report of run()
+    @:param threshold - a benchmark regressed if it took more than threshold times its baseline seconds
+    @:return list - (generator, nodes, benchmark, baseline seconds, seconds) of every regression"""
+    old = {(case["generator"], case["nodes"]): case["timings"] for case in baseline["results"]}
+    regressions = []
+    for case in report["results"]:
+        before = old.get((case["generator"], case["nodes"]))
+        if before is None:
+            continue
+        for name, timing in case["timings"].items():
+            if name in before and timing["seconds"] > threshold * before[name]["seconds"]:
+                regressions.append((case["generator"], case["nodes"], name, before[name]["seconds"],
+                                    timing["seconds"]))
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    """This function runs the benchmarks from the command line, e.g.
+    python Benchmark.py --sizes 1000 100000 --output bench.json --baseline old_bench.json
+    @:param argv - list of the command line arguments
+    @:return int - the exit code, 1 if there are regressions against the baseline"""
+    parser = argparse.ArgumentParser(description="Benchmarks of DiGraph and GraphAlgo on generated graphs.")
+    parser.add_argument("--generators", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 100000],
+                        help="numbers of nodes, up to 1000000")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--mutations", type=int, default=1000)
+    parser.add_argument("--no-plot", action="store_true", help="do not time plot_graph")
+    parser.add_argument("--in-process", action="store_true", help="run all the cases in this process")
+    parser.add_argument("--output", help="the JSON file of the report, stdout if not given")
+    parser.add_argument("--baseline", help="a JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    parser.add_argument("--quiet", action="store_true", help="do not print the timings of every case to stderr")
+    args = parser.parse_args(argv)
+    report = run(args.generators, args.sizes, args.seed, args.queries, args.mutations, not args.no_plot,
+                 not args.in_process, not args.quiet)
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=4)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(report, json.load(f), args.threshold)
+    for generator, n, name, before, after in regressions:
+        print("regression: %s %d %s %.4fs -> %.4fs" % (generator, n, name, before, after), file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+from array import array
+import numpy as np
+from GraphInterface import GraphInterface as gi
+from NodeData import NodeData as nd
+
+
+class CSRGraph(gi):
+    """This class represents a frozen, read-only snapshot of a directed weighted graph.
+    The out- and in- adjacency of the graph are packed into contiguous NumPy arrays in CSR form
+    (indptr, indices, weights), every node is addressed by a dense index in the range [0, v_size).
+    The locations of the nodes are kept in a |V|x3 array, NaN marks a node without a location.
+    The snapshot implements the read-only part of GraphInterface, so GraphAlgo can run on it directly,
+    the methods that change the graph do nothing and return False."""
+
+    def __init__(self, graph=None):
+        """A constructor for the class, receives a graph and packs its adjacency into arrays.
+        @:param graph - GraphInterface, the graph to take the snapshot of"""
+        self._mc = 0
+        self._ids = np.empty(0, dtype=np.int64)
+        self._index = {}
+        self._out_indptr = np.zeros(1, dtype=np.int64)
+        self._out_indices = np.empty(0, dtype=np.int64)
+        self._out_weights = np.empty(0, dtype=np.float64)
+        self._in_indptr = np.zeros(1, dtype=np.int64)
+        self._in_indices = np.empty(0, dtype=np.int64)
+        self._in_weights = np.empty(0, dtype=np.float64)
+        self._positions = np.empty((0, 3), dtype=np.float64)
+        self._nodes = None
+        if graph is not None:
+            nodes = graph.get_all_v()
+            self._mc = graph.get_mc()
+            self._ids = np.fromiter(nodes.keys(), dtype=np.int64, count=len(nodes))
+            self._index = {key: i for i, key in enumerate(nodes)}
+            self._positions = np.full((len(nodes), 3), np.nan)
+            for i, node in enumerate(nodes.values()):
+                location = node.get_location()
+                if location is not None:
+                    # a 2D location lies on the plane z=0
+                    self._positions[i] = tuple(location[:3]) + (0,) * (3 - len(location))
+            self._out_indptr, self._out_indices, self._out_weights = self._pack(nodes, graph.all_out_edges_of_node)
+            self._in_indptr, self._in_indices, self._in_weights = self._pack(nodes, graph.all_in_edges_of_node)
+
+    @classmethod
+    def from_arrays(cls, mc: int, ids: np.ndarray, out_arrays: tuple, in_arrays: tuple,
+                    positions: np.ndarray) -> "CSRGraph":
+        """This method creates a snapshot directly from its arrays without copying them,
+        the arrays may be memory-mapped.
+        @:param mc - int, the MC of the snapshot
+        @:param ids - the node IDs ordered by their dense index
+        @:param out_arrays - (indptr, indices, weights) of the out-adjacency
+        @:param in_arrays - (indptr, indices, weights) of the in-adjacency
+        @:param positions - |V|x3 array of the node locations, NaN for a node without a location
+        @:return CSRGraph - the snapshot"""
+        frozen = cls()
+        frozen._mc = mc
+        frozen._ids = ids
+        frozen._index = None
+        frozen._out_indptr, frozen._out_indices, frozen._out_weights = out_arrays
+        frozen._in_indptr, frozen._in_indices, frozen._in_weights = in_arrays
+        frozen._positions = positions
+        return frozen
+
+    def _pack(self, nodes: dict, edges_of) -> tuple:
+        """This method packs the adjacency returned by edges_of for every node into CSR arrays.
+        @:param nodes - dict, the nodes of the graph in their dense order
+        @:param edges_of - a method which returns the dictionary of edges (other_node_id, weight) of a node
+        @:return (indptr, indices, weights) - the CSR arrays"""
+        index = self._index
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        indices = array('q')
+        weights = array('d')
+        for i, key in enumerate(nodes):
+            edges = edges_of(key)
+            indices.extend(index[dest] for dest in edges)
+            weights.extend(edges.values())
+            indptr[i + 1] = len(indices)
+        return indptr, np.frombuffer(indices, dtype=np.int64), np.frombuffer(weights, dtype=np.float64)
+
+    def get_mc(self) -> int:
+        """This method returns the version (MC) of the graph this snapshot was taken from.
+        @:return The MC of the graph at the time of the snapshot"""
+        return self._mc
+
+    def is_fresh(self, graph) -> bool:
+        """This method returns True iff the graph was not changed since this snapshot was taken.
+        @:param graph - GraphInterface, the graph this snapshot was taken from
+        @:return True iff the MC of the graph equals the MC of this snapshot"""
+        return graph is not None and graph.get_mc() == self._mc
+
+    def v_size(self) -> int:
+        """This method returns the number of vertices in this snapshot
+        @:return The number of vertices"""
+        return len(self._ids)
+
+    def e_size(self) -> int:
+        """This method returns the number of edges in this snapshot
+        @:return The number of edges"""
+        return len(self._out_indices)
+
+    def index_of(self, key: int):
+        """This method returns the dense index of a node.
+        The ID to index map of a snapshot created from arrays is built on the first call, unless the IDs
+        are exactly 0..|V|-1.
+        @:param key - The node ID
+        @:return The dense index of the node, None if the node is not in this snapshot"""
+        if self._index is None:
+            if np.array_equal(self._ids, np.arange(len(self._ids))):
+                self._index = range(len(self._ids))
+            else:
+                self._index = {key: i for i, key in enumerate(self._ids.tolist())}
+        if isinstance(self._index, range):
+            return key if isinstance(key, int) and key in self._index else None
+        return self._index.get(key)
+
+    def key_of(self, i: int) -> int:
+        """This method returns the node ID stored in a dense index.
+        @:param i - The dense index
+        @:return The node ID"""
+        return int(self._ids[i])
+
+    def get_ids(self) -> np.ndarray:
+        """This method returns the array of node IDs, ordered by their dense index.
+        @:return np.ndarray of the node IDs"""
+        return self._ids
+
+    def out_edges(self, i: int):
+        """This method returns the edges going out of the node in dense index i.
+        @:param i - The dense index of the node
+        @:return An iterable of pairs (dense index of the destination, weight)"""
+        start = self._out_indptr[i]
+        end = self._out_indptr[i + 1]
+        return zip(self._out_indices[start:end].tolist(), self._out_weights[start:end].tolist())
+
+    def in_edges(self, i: int):
+        """This method returns the edges coming into the node in dense index i.
+        @:param i - The dense index of the node
+        @:return An iterable of pairs (dense index of the source, weight)"""
+        start = self._in_indptr[i]
+        end = self._in_indptr[i + 1]
+        return zip(self._in_indices[start:end].tolist(), self._in_weights[start:end].tolist())
+
+    def get_positions(self) -> np.ndarray:
+        """This method returns the locations of the nodes, ordered by their dense index.
+        @:return np.ndarray of shape |V|x3, NaN marks a node without a location"""
+        return self._positions
+
+    def out_arrays(self) -> tuple:
+        """This method returns the CSR arrays of the out-adjacency.
+        @:return (indptr, indices, weights)"""
+        return self._out_indptr, self._out_indices, self._out_weights
+
+    def in_arrays(self) -> tuple:
+        """This method returns the CSR arrays of the in-adjacency.
+        @:return (indptr, indices, weights)"""
+        return self._in_indptr, self._in_indices, self._in_weights
+
+    def freeze(self) -> "CSRGraph":
+        """This method returns this snapshot, which is always frozen.
+        @:return CSRGraph - this snapshot"""
+        return self
+
+    def get_frozen(self) -> "CSRGraph":
+        """This method returns this snapshot, which is always fresh.
+        @:return CSRGraph - this snapshot"""
+        return self
+
+    def get_lock(self):
+        """A snapshot never changes, so it has no lock.
+        @:return None"""
+        return None
+
+    def get_all_v(self) -> dict:
+        """This method returns a dictionary of all the nodes in the snapshot, each node is
+        represented using a pair (node_id, node_data). The NodeData objects are created on the first call.
+        @:return A dictionary representing the nodes in the snapshot"""
+        if self._nodes is None:
+            nodes = {}
+            for key, location in zip(self._ids.tolist(), self._positions.tolist()):
+                nodes[key] = nd(key, location=None if location[0] != location[0] else tuple(location))
+            self._nodes = nodes
+        return self._nodes
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        """This method returns a dictionary of all the nodes connected to (into) node_id ,
+        each node is represented using a pair (other_node_id, weight)
+        @:return a dictionary of all the edges connected into node_id"""
+        i = self.index_of(id1)
+        if i is None:
+            return {}
+        return {self.key_of(j): w for j, w in self.in_edges(i)}
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        """This method returns a dictionary of all the nodes connected from (out of) node_id ,
+        each node is represented using a pair (other_node_id, weight)
+        @:return a dictionary of all the edges connected out of node_id"""
+        i = self.index_of(id1)
+        if i is None:
+            return {}
+        return {self.key_of(j): w for j, w in self.out_edges(i)}
+
+    def add_edge(self, id1: int, id2: int, weight: float) -> bool:
+        """A snapshot is read-only, this method does nothing.
+        @:return False"""
+        return False
+
+    def add_node(self, node_id: int, pos: tuple = None) -> bool:
+        """A snapshot is read-only, this method does nothing.
+        @:return False"""
+        return False
+
+    def remove_node(self, node_id: int) -> bool:
+        """A snapshot is read-only, this method does nothing.
+        @:return False"""
+        return False
+
+    def remove_edge(self, node_id1: int, node_id2: int) -> bool:
+        """A snapshot is read-only, this method does nothing.
+        @:return False"""
+        return False
+
+    def __repr__(self) -> str:
+        """ This method returns a string representing this snapshot.
+        @:return a str representing this snapshot"""
+        return "CSRGraph: |V|=" + str(self.v_size()) + " , |E|=" + str(self.e_size()) + " , MC=" + str(self._mc)
@@ -1,6 +1,44 @@
+import functools
+import itertools
 import json
+import numpy as np
 from GraphInterface import GraphInterface as gi
 from NodeData import NodeData as nd
+from CSRGraph import CSRGraph
+from GraphView import GraphView
+from Instrumentation import Instrumentation
+from ReadWriteLock import ReadWriteLock
+from SpatialIndex import SpatialIndex
+
+
+def _integral(ids: np.ndarray) -> np.ndarray:
+    """This function checks which entries of a NumPy array of node IDs are integers, float ids like 1.5
+    must not be truncated into other nodes.
+    @:param ids - np.ndarray of node IDs
+    @:return np.ndarray - a boolean per entry"""
+    if ids.dtype.kind in "iub":
+        return np.ones(ids.shape, dtype=bool)
+    if ids.dtype.kind != "f":
+        raise ValueError("node IDs must be integers, not " + str(ids.dtype))
+    return np.isfinite(ids) & (ids == np.floor(ids))
+
+
+def _mutation(method):
+    """A decorator for the methods of DiGraph that change the graph, the method runs while holding
+    the write lock of the graph, and is measured while an Instrumentation is installed."""
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        active = Instrumentation.active
+        self._lock.acquire_write()
+        try:
+            if active is None:
+                return method(self, *args, **kwargs)
+            return active.measure(name, method, (self,) + args, kwargs)
+        finally:
+            self._lock.release_write()
+    return locked
 
 
 class DiGraph(gi):
@@ -13,6 +51,10 @@ class DiGraph(gi):
         self._edges_out = {}
         self._mc = 0
         self._edge_size = 0
+        self._frozen = None
+        self._lock = ReadWriteLock()
+        self._listeners = []
+        self._spatial = None
 
     def v_size(self) -> int:
         """
@@ -40,9 +82,8 @@ class DiGraph(gi):
         each node is represented using a pair (other_node_id, weight)
         @:return a dictionary of all the edges connected into node_id
          """
-        if self._nodes.get(id1) is None:
-            temp = {}
-            return temp
+        if id1 not in self._nodes:
+            return {}
         return self._edges_in[id1]
 
     def all_out_edges_of_node(self, id1: int) -> dict:
@@ -50,7 +91,7 @@ class DiGraph(gi):
         each node is represented using a pair (other_node_id, weight)
         @:return a dictionary of all the edges connected out of node_id
          """
-        if self._nodes.get(id1) is None:
+        if id1 not in self._nodes:
             temp = {}
             return temp
         return self._edges_out[id1]
@@ -63,6 +104,72 @@ class DiGraph(gi):
         """
         return self._mc
 
+    def freeze(self) -> CSRGraph:
+        """
+        This method returns a frozen CSR snapshot of this graph, the snapshot is cached and rebuilt
+        only when the MC of this graph changed since it was taken.
+        @:return CSRGraph - a read-only snapshot of this graph
+        """
+        with self._lock.reading():
+            if self._frozen is None or self._frozen.get_mc() != self._mc:
+                self._frozen = CSRGraph(self)
+            return self._frozen
+
+    def subgraph(self, node_ids) -> GraphView:
+        """
+        This method returns a read-only view of the subgraph induced by a set of nodes, without copying.
+        The view shares the adjacency of this graph and filters it lazily, so it follows later changes.
+        @:param node_ids - an iterable of node IDs, IDs which are not in the graph are ignored
+        @:return GraphView - the view, GraphAlgo accepts it like any graph
+        """
+        return GraphView(self, node_ids)
+
+    def reverse_view(self) -> GraphView:
+        """
+        This method returns a read-only view of this graph with all the edges reversed, without copying.
+        @:return GraphView - the view, GraphAlgo accepts it like any graph
+        """
+        return GraphView(self, reverse=True)
+
+    def get_lock(self) -> ReadWriteLock:
+        """
+        This method returns the read/write lock of this graph. The methods that change the graph hold the
+        write lock, algorithms hold the read lock so they can run in parallel with each other.
+        @:return ReadWriteLock - the lock of this graph
+        """
+        return self._lock
+
+    def add_listener(self, listener) -> None:
+        """
+        This method registers a listener which is notified of every change of this graph.
+        @:param listener - GraphListener
+        """
+        with self._lock.writing():
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener) -> bool:
+        """
+        This method unregisters a listener registered by add_listener.
+        @:param listener - GraphListener
+        @:return True if the listener was removed, False if it was not registered
+        """
+        with self._lock.writing():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+                return True
+            return False
+
+    def get_frozen(self):
+        """
+        This method returns the snapshot taken by freeze() iff it is still fresh.
+        A stale snapshot is dropped, so its arrays can be released.
+        @:return CSRGraph - the fresh snapshot of this graph, None if there is no such snapshot
+        """
+        if self._frozen is not None and self._frozen.get_mc() != self._mc:
+            self._frozen = None
+        return self._frozen
+
+    @_mutation
     def add_edge(self, id1: int, id2: int, weight: float) -> bool:
         """
         This method adds an edge to the graph.
@@ -71,22 +178,12 @@ class DiGraph(gi):
         @:param weight - The weight of the edge
         @:return True if the edge was added successfully, False o.w.
         """
-        if id1 == id2:
-            return False
-        if weight > 0:
-            if self._nodes.get(id1) is None or self._nodes.get(id2) is None:
-                return False
-            if self._edges_out.get(id1).get(id2) is not None:
-                return False
-            else:
-                self._edges_out[id1][id2] = weight
-                self._edges_in[id2][id1] = weight
-                self._mc += 1
-                self._edge_size += 1
-                return True
-        else:
-            return False
+        if self._insert_edge(id1, id2, weight):
+            self._mc += 1
+            return True
+        return False
 
+    @_mutation
     def add_node(self, node_id: int, pos: tuple = None) -> bool:
         """
         This method adds a node to the graph.
@@ -94,14 +191,172 @@ class DiGraph(gi):
         @:param pos - The position of the node
         @:return True if the node was added successfully, False o.w.
         """
-        if self._nodes.get(node_id) is None:
-            self._nodes[node_id] = nd(node_id, location=pos)
-            self._edges_out[node_id] = {}
-            self._edges_in[node_id] = {}
+        if self._insert_node(node_id, pos):
             self._mc += 1
             return True
         return False
 
+    @_mutation
+    def add_nodes_from(self, nodes) -> list:
+        """
+        This method adds a batch of nodes to the graph, the MC is increased once for the whole batch.
+        If a row raises, the rows before it stay added and the MC is still increased.
+        @:param nodes - an iterable of node IDs or of pairs (node_id, pos), or a NumPy array of node IDs
+        @:return list - the indices of the rows that were rejected (the node already exists, or a NumPy id
+        which is not an integer)
+        """
+        if isinstance(nodes, np.ndarray):
+            integral = _integral(nodes)
+            rejected = np.flatnonzero(~integral).tolist()
+            rows = np.flatnonzero(integral)
+            nodes = nodes[rows].astype(np.int64).tolist()
+        else:
+            rows = itertools.count()
+            rejected = []
+        added = 0
+        try:
+            for row, node in zip(rows, nodes):
+                if isinstance(node, tuple):
+                    inserted = self._insert_node(node[0], node[1])
+                else:
+                    inserted = self._insert_node(node)
+                if inserted:
+                    added += 1
+                else:
+                    rejected.append(int(row))
+        finally:
+            if added > 0:
+                self._mc += 1
+        rejected.sort()
+        return rejected
+
+    @_mutation
+    def add_edges_from(self, edges) -> list:
+        """
+        This method adds a batch of edges to the graph, the MC is increased once for the whole batch.
+        The edges keep the rules of add_edge: no self loops, positive weights, existing nodes and no duplicates.
+        If a row raises, the rows before it stay added and the MC is still increased.
+        @:param edges - an iterable of triplets (src, dest, weight) or a NumPy array of shape (n, 3)
+        @:return list - the indices of the rows that were rejected (including NumPy ids which are not integers)
+        """
+        if isinstance(edges, np.ndarray):
+            if len(edges) == 0:
+                return []
+            integral = _integral(edges[:, :2]).all(axis=1)
+            sources = np.where(integral, edges[:, 0], 0).astype(np.int64)
+            dests = np.where(integral, edges[:, 1], 0).astype(np.int64)
+            weights = edges[:, 2].astype(np.float64)
+            valid = integral & (sources != dests) & (weights > 0)
+            rejected = np.flatnonzero(~valid).tolist()
+            rows = np.flatnonzero(valid)
+            edges = zip(sources[rows].tolist(), dests[rows].tolist(), weights[rows].tolist())
+        else:
+            rows = itertools.count()
+            rejected = []
+        added = 0
+        try:
+            for row, (id1, id2, weight) in zip(rows, edges):
+                if self._insert_edge(id1, id2, weight):
+                    added += 1
+                else:
+                    rejected.append(int(row))
+        finally:
+            if added > 0:
+                self._mc += 1
+        rejected.sort()
+        return rejected
+
+    @_mutation
+    def remove_edges_from(self, edges) -> list:
+        """
+        This method removes a batch of edges from the graph, the MC is increased once for the whole batch.
+        @:param edges - an iterable of pairs (src, dest) or a NumPy array of shape (n, 2), extra columns are ignored
+        @:return list - the indices of the rows that were rejected (no such edge)
+        """
+        if isinstance(edges, np.ndarray):
+            integral = _integral(edges[:, :2]).all(axis=1)
+            ids = np.where(integral[:, None], edges[:, :2], 0).astype(np.int64).tolist()
+            edges = [edge if ok else (None, None) for edge, ok in zip(ids, integral.tolist())]
+        rejected = []
+        removed = 0
+        try:
+            for row, edge in enumerate(edges):
+                edges_out = self._edges_out.get(edge[0])
+                if edges_out is None or edge[1] not in edges_out:
+                    rejected.append(row)
+                    continue
+                weight = edges_out.pop(edge[1])
+                del self._edges_in[edge[1]][edge[0]]
+                self._edge_size -= 1
+                removed += 1
+                for listener in self._listeners:
+                    listener.edge_removed(edge[0], edge[1], weight)
+        finally:
+            if removed > 0:
+                self._mc += 1
+        return rejected
+
+    def _insert_edge(self, id1: int, id2: int, weight: float) -> bool:
+        """
+        This method adds an edge to the graph without changing the MC, used by the bulk loaders.
+        @:param id1 - The start node of the edge
+        @:param id2 - The end node of the edge
+        @:param weight - The weight of the edge
+        @:return True if the edge was added successfully, False o.w.
+        """
+        if id1 == id2 or not weight > 0:
+            return False
+        edges_out = self._edges_out.get(id1)
+        if edges_out is None or id2 not in self._nodes or id2 in edges_out:
+            return False
+        edges_out[id2] = weight
+        self._edges_in[id2][id1] = weight
+        self._edge_size += 1
+        for listener in self._listeners:
+            listener.edge_added(id1, id2, weight)
+        return True
+
+    def _insert_node(self, node_id: int, pos: tuple = None) -> bool:
+        """
+        This method adds a node to the graph without changing the MC, used by the bulk loaders.
+        @:param node_id - The node ID
+        @:param pos - The position of the node
+        @:return True if the node was added successfully, False o.w.
+        """
+        if node_id in self._nodes:
+            return False
+        node = nd(node_id, location=pos)
+        node._owner = self
+        self._nodes[node_id] = node
+        self._edges_out[node_id] = {}
+        self._edges_in[node_id] = {}
+        for listener in self._listeners:
+            listener.node_added(node_id)
+        return True
+
+    @_mutation
+    def update_edge_weight(self, id1: int, id2: int, weight: float) -> bool:
+        """
+        This method changes the weight of an existing edge.
+        @:param id1 - The start node of the edge
+        @:param id2 - The end node of the edge
+        @:param weight - The new weight of the edge, must be positive
+        @:return True if the edge exists and now has the given weight, False o.w.
+        """
+        edges_out = self._edges_out.get(id1)
+        if edges_out is None or id2 not in edges_out or not weight > 0:
+            return False
+        old_weight = edges_out[id2]
+        if old_weight == weight:
+            return True
+        edges_out[id2] = weight
+        self._edges_in[id2][id1] = weight
+        self._mc += 1
+        for listener in self._listeners:
+            listener.edge_weight_changed(id1, id2, old_weight, weight)
+        return True
+
+    @_mutation
     def remove_node(self, node_id: int) -> bool:
         """
         This method removes a node from the graph.
@@ -109,27 +364,114 @@ class DiGraph(gi):
         @:param node_id - The node ID
         @:return True if the node was removed successfully, False o.w.
         """
-        if self._nodes.get(node_id) is not None:
-            if self._edges_out.get(node_id) is not None:
-                keys_out = list(self._edges_out[node_id].keys())
-                for k in keys_out:
-                    self._edges_out[node_id].pop(k)
-                    self._edges_in[k].pop(node_id)
-                    self._edge_size-=1
-                self._edges_out.pop(node_id)
-            if self._edges_in.get(node_id) is not None:
-                keys_in = list(self._edges_in[node_id].keys())
-                for k in keys_in:
-                    self._edges_out[k].pop(node_id)
-                    self._edges_in[node_id].pop(k)
-                    self._edge_size-=1
-                self._edges_in.pop(node_id)
-                self._nodes.pop(node_id)
-                self._mc += 1
-            return True
-        else:
+        if self._delete_node(node_id) is None:
             return False
+        self._mc += 1
+        return True
+
+    @_mutation
+    def remove_nodes_from(self, nodes) -> int:
+        """
+        This method removes a batch of nodes and all their edges from the graph, the MC is increased once
+        for the whole batch. Node IDs which are not in the graph are skipped.
+        Without listeners the adjacency maps of the removed nodes are dropped whole, and the maps of the
+        remaining nodes are visited once per edge, skipping the edges between two removed nodes.
+        @:param nodes - an iterable of node IDs
+        @:return int - the number of edges that were removed
+        """
+        removed = 0
+        if self._listeners:
+            found = False
+            try:
+                for node_id in nodes:
+                    edges = self._delete_node(node_id)
+                    if edges is not None:
+                        removed += edges
+                        found = True
+            finally:
+                if found:
+                    self._mc += 1
+            return removed
+        doomed = {node_id for node_id in nodes if node_id in self._nodes}
+        for node_id in doomed:
+            self._nodes.pop(node_id)._owner = None
+            edges_out = self._edges_out.pop(node_id)
+            removed += len(edges_out)
+            for dest in edges_out:
+                if dest not in doomed:
+                    del self._edges_in[dest][node_id]
+            for src in self._edges_in.pop(node_id):
+                if src not in doomed:
+                    del self._edges_out[src][node_id]
+                    removed += 1
+        if doomed:
+            self._edge_size -= removed
+            self._mc += 1
+        return removed
+
+    def _delete_node(self, node_id: int):
+        """
+        This method removes a node and its edges without changing the MC, the listeners are told about the
+        removal, then about every edge (while the rest of the graph is still in place) and then about the node.
+        @:param node_id - The node ID
+        @:return int - the number of edges that were removed, None if the node is not in the graph
+        """
+        if node_id not in self._nodes:
+            return None
+        edges_out = self._edges_out[node_id]
+        edges_in = self._edges_in[node_id]
+        removed = len(edges_out) + len(edges_in)
+        listeners = self._listeners
+        for listener in listeners:
+            listener.node_removing(node_id)
+        while edges_out:
+            dest, weight = edges_out.popitem()
+            del self._edges_in[dest][node_id]
+            self._edge_size -= 1
+            for listener in listeners:
+                listener.edge_removed(node_id, dest, weight)
+        while edges_in:
+            src, weight = edges_in.popitem()
+            del self._edges_out[src][node_id]
+            self._edge_size -= 1
+            for listener in listeners:
+                listener.edge_removed(src, node_id, weight)
+        del self._edges_out[node_id]
+        del self._edges_in[node_id]
+        self._nodes.pop(node_id)._owner = None
+        for listener in listeners:
+            listener.node_removed(node_id)
+        return removed
 
+    @_mutation
+    def _move_node(self, node_id: int, location: tuple) -> None:
+        """
+        This method changes the location of a node of this graph, called by NodeData.set_location.
+        The MC is increased, so the snapshots and the layouts built from the old locations are refreshed.
+        @:param node_id - The node ID
+        @:param location - The new location of the node
+        """
+        node = self._nodes[node_id]
+        old_location = node.get_location()
+        node._location = location
+        self._mc += 1
+        for listener in self._listeners:
+            listener.node_moved(node_id, old_location, location)
+
+    def spatial_index(self, build: bool = True) -> SpatialIndex:
+        """
+        This method returns the spatial index of the locations of the nodes, it is built on the first call
+        and kept up to date by the changes of the graph from then on.
+        @:param build - False to only return the index if it was already built
+        @:return SpatialIndex - the index of this graph, None if it was not built and build is False
+        """
+        if self._spatial is None and build:
+            with self._lock.writing():
+                if self._spatial is None:
+                    self._spatial = SpatialIndex(self)
+        return self._spatial
+
+    @_mutation
     def remove_edge(self, node_id1: int, node_id2: int) -> bool:
         """
         This method removes an edge from the graph.
@@ -137,21 +479,43 @@ class DiGraph(gi):
         @:param node_id2 - The end node of the edge
         @:return True if the edge was removed successfully, False o.w.
         """
-        if self._nodes.get(node_id1) is None or self._nodes.get(node_id2) is None:
+        if node_id1 not in self._nodes or node_id2 not in self._nodes:
             return False
-        if self._edges_out[node_id1].get(node_id2) is None:
+        if node_id2 not in self._edges_out[node_id1]:
             return False
         else:
-            self._edges_out[node_id1].pop(node_id2)
+            weight = self._edges_out[node_id1].pop(node_id2)
             self._edges_in[node_id2].pop(node_id1)
             self._mc += 1
             self._edge_size -= 1
+            for listener in self._listeners:
+                listener.edge_removed(node_id1, node_id2, weight)
             return True
 
+    def __getstate__(self) -> dict:
+        """This method returns the state of this graph for pickling, without the lock, the snapshot and the listeners.
+        @:return dict - the state of this graph"""
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        state["_frozen"] = None
+        state["_listeners"] = []
+        state["_spatial"] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        """This method restores the state of an unpickled graph, with a new lock.
+        @:param state - dict, the state returned by __getstate__"""
+        self.__dict__.update(state)
+        self._lock = ReadWriteLock()
+        for node in self._nodes.values():
+            node._owner = self
+
     def __str__(self) -> str:
         """ This method returns a string representing this graph.
         @:return a str representing this graph"""
-        return json.dumps(self, default=lambda o: o.__dict__, indent=4)
+        graph_dict = {"_nodes": self._nodes, "_edges_in": self._edges_in, "_edges_out": self._edges_out,
+                      "_mc": self._mc, "_edge_size": self._edge_size}
+        return json.dumps(graph_dict, cls=nd.NodeDataEncoder, indent=4)
 
     def __repr__(self) -> str:
         """ This method returns a string representing this graph.
@@ -171,13 +535,13 @@ class DiGraph(gi):
         if len(other_nodes) != len(self._nodes):
             return False
         for k, v in self._nodes.items():
-            if other_nodes.get(k) is None:
+            if k not in other_nodes:
                 return False
             elif other_nodes[k] != self._nodes[k]:
                 return False
             else:
                 for dest, weight in self._edges_out[k].items():
-                    if other.all_out_edges_of_node(k).get(dest) is None:
+                    if dest not in other.all_out_edges_of_node(k):
                         return False
                     elif other.all_out_edges_of_node(k)[dest] != weight:
                         return False
@@ -0,0 +1,106 @@
+import heapq
+import numpy as np
+from Instrumentation import Instrumentation
+
+
+def dijkstra(edges_of, src, size: int = None, targets=None, counters: dict = None, limit: int = None) -> tuple:
+    """This function runs Dijkstra's algorithm from src using a binary heap, stale heap entries are skipped.
+    The nodes are either the dense indices of a snapshot, whose distances and predecessors are kept in lists,
+    or any hashable node ids, which are kept in dictionaries.
+    @:param edges_of - a function which returns an iterable of pairs (neighbour, weight) of a node
+    @:param src - The start node
+    @:param size - int, the number of nodes if they are the dense indices 0..size-1, None for node ids
+    @:param targets - an iterable of nodes, the search stops as soon as they are all settled,
+    None to settle every reachable node
+    @:param counters - dict, if given the work of the search is added to it (see count_search)
+    @:param limit - int, if given the search stops as soon as this many of the targets are settled
+    @:return (dist, pred) - the distance (a float) of every node and its predecessor on the shortest path:
+    lists if size is given (inf and -1 for an unreached node, pred -1 for src), o.w. dicts of the reached nodes
+    only (pred None for src)"""
+    inf = float('inf')
+    dense = size is not None
+    if dense:
+        dist = [inf] * size
+        pred = [-1] * size
+        dist[src] = 0.0
+        get = None
+    else:
+        dist = {src: 0.0}
+        pred = {src: None}
+        get = dist.get
+    heap = [(dist[src], src)]
+    remaining = None if targets is None else set(targets)
+    enough = 0 if remaining is None or limit is None else max(0, len(remaining) - limit)
+    pops = stale = 0
+    while heap:
+        d, u = heapq.heappop(heap)
+        pops += 1
+        if d > dist[u]:
+            stale += 1
+            continue
+        if remaining is not None:
+            remaining.discard(u)
+            if len(remaining) <= enough:
+                break
+        for v, w in edges_of(u):
+            new_dist = d + w
+            if new_dist < (dist[v] if dense else get(v, inf)):
+                dist[v] = new_dist
+                pred[v] = u
+                heapq.heappush(heap, (new_dist, v))
+    if counters is not None:
+        reached = size - dist.count(inf) if dense else len(dist)
+        count_search(counters, pops, stale, len(heap), reached)
+    return dist, pred
+
+
+def path_to(pred, src, dst, key_of=None) -> list:
+    """This function rebuilds a shortest path from the predecessors of a search.
+    @:param pred - the predecessor of every reached node, as computed by dijkstra
+    @:param src - The start node of the search
+    @:param dst - The end node of the path, it must have been reached
+    @:param key_of - a function which maps the nodes to node ids, None to keep the nodes
+    @:return list - the nodes of the path from src to dst"""
+    path = [dst]
+    while dst != src:
+        dst = pred[dst]
+        path.append(dst)
+    path.reverse()
+    return path if key_of is None else [key_of(node) for node in path]
+
+
+def count_search(counters: dict, pops: int, stale: int, left: int, reached: int) -> None:
+    """This function adds the work of a heap based search to the counters of an instrumented call.
+    @:param counters - dict, the counters
+    @:param pops - the number of entries popped from the heap
+    @:param stale - the number of popped entries whose node was already settled with a shorter distance
+    @:param left - the number of entries left in the heap
+    @:param reached - the number of nodes which got a distance (and had to be initialized)"""
+    Instrumentation.add(counters, heap_pushes=pops + left, heap_pops=pops, stale_pops=stale,
+                        nodes_settled=pops - stale, nodes_reached=reached)
+
+
+def adjacency_lists(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+                    component: np.ndarray = None, index_of: np.ndarray = None) -> list:
+    """This function builds adjacency lists from CSR arrays, which are much faster to scan in a search
+    than slices of the arrays. If component is given only the edges inside an SCC are kept: a shortest
+    path between two nodes of an SCC never leaves it, so these edges are enough to measure the distances
+    inside every SCC.
+    @:param indptr - np.ndarray, the CSR index pointers
+    @:param indices - np.ndarray, the dense index of the neighbour of every edge
+    @:param weights - np.ndarray, the weight of every edge
+    @:param component - np.ndarray, the SCC of every dense index, None to keep all the edges
+    @:param index_of - np.ndarray, the index the neighbours are given by (e.g. their index inside their SCC),
+    None for their dense index
+    @:return list - for every dense index, the list of pairs (index of the neighbour, weight)"""
+    n = len(indptr) - 1
+    if component is not None:
+        sources = np.repeat(np.arange(n), np.diff(indptr))
+        keep = component[sources] == component[indices]
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(sources[keep], minlength=n))))
+        indices, weights = indices[keep], weights[keep]
+    if index_of is not None:
+        indices = index_of[indices]
+    indptr = indptr.tolist()
+    pairs = list(zip(indices.tolist(), weights.tolist()))
+    return [pairs[indptr[i]:indptr[i + 1]] for i in range(n)]
@@ -0,0 +1,80 @@
+import numpy as np
+from Dijkstra import dijkstra
+
+ECCENTRICITY_TOLERANCE = 1e-9
+_EXACT_LIMIT = 16
+
+
+def _distances(adjacency: list, src: int) -> np.ndarray:
+    """This function computes the distances from a local index over the adjacency lists of an SCC.
+    @:param adjacency - list, the pairs (local index of the neighbour, weight) of every local index
+    @:param src - the local index of the source
+    @:return np.ndarray - the distance to every local index"""
+    return np.array(dijkstra(adjacency.__getitem__, src, len(adjacency))[0])
+
+
+def bound_eccentricities(out_adjacency: list, in_adjacency: list, center: bool) -> (np.ndarray, np.ndarray, int):
+    """This function bounds the eccentricities of the nodes of a single SCC in the style of Takes and Kosters.
+    The nodes are numbered 0..k-1 inside the SCC, so every search costs the size of the SCC, not of the graph.
+    Every probe of a node w runs Dijkstra from w over the out edges, which gives its exact eccentricity e(w),
+    and over the in edges, and tightens the bounds of every other node v by the triangle inequality:
+    max(d(v,w), e(w) - d(w,v)) <= e(v) <= d(v,w) + e(w). The node f farthest from w is usually on the
+    periphery, so Dijkstra from f over the in edges raises the lower bounds as well: d(v,f) <= e(v), this
+    search is dropped as soon as it does not raise any open bound.
+    Nodes whose bounds meet are resolved without a search of their own.
+    The next probe alternates between the open node with the smallest lower bound and the one with
+    the largest upper bound. If center is True only the smallest eccentricity is looked for, so the probes
+    always take the smallest lower bound and nodes whose lower bound reaches the best eccentricity are dropped.
+    When the eccentricities are too close for the bounds to meet (e.g. in random graphs) the probes resolve
+    fewer nodes than the searches they cost. Once the searches outnumber the resolved nodes by more than
+    max(_EXACT_LIMIT, sqrt(k)) for an SCC of k nodes (and right away for tiny SCCs), the open nodes get a single
+    Dijkstra over the out edges each, so the bounds never cost much more than a Dijkstra per node.
+    @:param out_adjacency - list, the pairs (local index of the neighbour, weight) of the out edges of every node
+    @:param in_adjacency - list, the pairs (local index of the neighbour, weight) of the in edges of every node
+    @:param center - if True stop as soon as a node of the smallest eccentricity is resolved
+    @:return (lower, upper, probes) - the bounds of every node (equal, up to float rounding, for the resolved
+    nodes) and the number of probed nodes"""
+    n = len(out_adjacency)
+    lower = np.zeros(n)
+    upper = np.full(n, np.inf)
+    best = np.inf
+    probes = 0
+    candidate = int(np.argmax([len(out_edges) + len(in_edges)
+                               for out_edges, in_edges in zip(out_adjacency, in_adjacency)]))
+    take_upper = False
+    exact = n <= _EXACT_LIMIT
+    use_far = True
+    open_nodes = np.ones(n, dtype=bool)
+    open_count = n
+    searches = 0
+    slack = max(_EXACT_LIMIT, np.sqrt(n))
+    while True:
+        forward = _distances(out_adjacency, candidate)
+        ecc = forward.max()
+        probes += 1
+        searches += 1
+        np.maximum(lower, ecc - forward, out=lower)
+        if not exact:
+            backward = _distances(in_adjacency, candidate)
+            np.maximum(lower, backward, out=lower)
+            np.minimum(upper, backward + ecc, out=upper)
+            searches += 1
+            if use_far:
+                far = _distances(in_adjacency, int(np.argmax(forward)))
+                searches += 1
+                use_far = bool((far > lower)[open_nodes].any())
+                np.maximum(lower, far, out=lower)
+        lower[candidate] = upper[candidate] = ecc
+        open_nodes = np.isinf(upper) | (upper - lower > ECCENTRICITY_TOLERANCE * upper)
+        if center:
+            best = min(best, upper[~open_nodes].min())
+            open_nodes &= lower < best
+        open_count = int(open_nodes.sum())
+        if open_count == 0:
+            return lower, upper, probes
+        exact = exact or searches - (n - open_count) > slack
+        if take_upper:
+            candidate = int(np.argmax(np.where(open_nodes, upper, -np.inf)))
+        else:
+            candidate = int(np.argmin(np.where(open_nodes, lower, np.inf)))
+        take_upper = not take_upper and not center and not exact
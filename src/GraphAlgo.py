@@ -1,12 +1,89 @@
-import json
+import contextlib
+import functools
+import itertools
+import heapq
+import math
+import os
+import tempfile
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 from typing import List
+from CSRGraph import CSRGraph
 from DiGraph import DiGraph as dg
+from Dijkstra import adjacency_lists, count_search, dijkstra, path_to
+from Eccentricity import ECCENTRICITY_TOLERANCE, bound_eccentricities
 from GraphAlgoInterface import GraphAlgoInterface as ga
+from GraphFiles import JSON_BATCH, JSON_LAYOUTS, JSON_NDJSON_KEYS, JSON_SUFFIXES, compression_module, \
+    detect_compression, json_parts, open_json, read_binary, write_binary
 from GraphInterface import GraphInterface as gi
+from GraphLayout import force_layout, grid_layout, normalize_positions, spectral_layout, undirected_edges
+from IncrementalSCC import IncrementalSCC
+from Instrumentation import Instrumentation, instrumented
+from JsonStream import JsonStream
 from NodeData import NodeData as nd
+from PathCache import PathCache
+from ShortestPathTree import ShortestPathTree
+from Tarjan import tarjan
+from Tour import chain_distances, greedy_tour, improve_tour
 import numpy as np
-from queue import PriorityQueue as pq
+
+_TSP_NEIGHBOURS = 16
+
+
+def _single_source_arrays(frozen: CSRGraph, src: int) -> (np.ndarray, np.ndarray):
+    """This function runs Dijkstra's algorithm from a dense index over a CSR snapshot.
+    @:param frozen - CSRGraph, the snapshot
+    @:param src - the dense index of the source
+    @:return (dist, pred) - the distance and the dense index of the predecessor of every node
+    (inf and -1 for an unreachable node)"""
+    dist, pred = dijkstra(frozen.out_edges, src, frozen.v_size())
+    return np.array(dist, dtype=np.float64), np.array(pred, dtype=np.int64)
+
+
+_worker_graph = None
+
+
+def _init_worker(file_name: str) -> None:
+    """This function memory-maps the shared snapshot once in every worker process of the pool.
+    @:param file_name - str, the path of the binary snapshot"""
+    global _worker_graph
+    _worker_graph = read_binary(file_name, True)
+
+
+def _worker_sources(sources: list) -> (list, np.ndarray, np.ndarray):
+    """This function runs single source shortest paths in a worker process over the shared snapshot.
+    @:param sources - list of the dense indices of the sources
+    @:return (sources, dist, pred) - the sources and the matching rows of the distance/predecessor matrices"""
+    rows = [_single_source_arrays(_worker_graph, src) for src in sources]
+    return sources, np.stack([row[0] for row in rows]), np.stack([row[1] for row in rows])
+
+
+def _query(method):
+    """A decorator for the methods of GraphAlgo that read the graph, the method runs while holding
+    the read lock of the graph, so queries run in parallel with each other but not with mutations.
+    The method is measured while an Instrumentation is installed."""
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        active = Instrumentation.active
+        lock = None if self._graph is None else self._graph.get_lock()
+        if lock is not None:
+            lock.acquire_read()
+        try:
+            if active is None:
+                return method(self, *args, **kwargs)
+            return active.measure(name, method, (self,) + args, kwargs)
+        finally:
+            if lock is not None:
+                lock.release_read()
+    return locked
 
 
 class GraphAlgo(ga):
@@ -18,154 +95,913 @@ class GraphAlgo(ga):
 
     def __init__(self,graph:dg=None):
         """A constructor for the class, receives a DiGraph and initializes this graph.
+        Read-only graphs are accepted as well: a CSRGraph snapshot or a GraphView (DiGraph.subgraph/reverse_view).
         @:param graph - DiGraph"""
         self._graph = graph
+        self._astar_cache = None
+        self._scc_cache = None
+        self._cache = None
+        self._scc_tracker = None
+        self._trees = {}
+        self._layout_cache = None
+        self._adjacency_cache = None
 
     def get_graph(self) -> gi:
         """This method returns the underlying graph of this class.
         @:return graph - DiGarph, the graph of this class"""
         return self._graph
 
+    def enable_cache(self, max_entries: int = 1024, max_bytes: int = 64 << 20) -> PathCache:
+        """This method enables an LRU cache of the shortest_path results, the cache is invalidated
+        automatically whenever the MC of the graph changes.
+        @:param max_entries - int, the maximal number of cached paths and trees
+        @:param max_bytes - int, the maximal estimated size of the cache in bytes
+        @:return PathCache - the new cache, its counters are available by get_stats()"""
+        self._cache = PathCache(max_entries, max_bytes)
+        return self._cache
+
+    def disable_cache(self) -> None:
+        """This method disables the cache of the shortest_path results and drops its entries."""
+        self._cache = None
+
+    def get_cache(self):
+        """This method returns the cache of the shortest_path results.
+        @:return PathCache - the cache, None if it is disabled"""
+        return self._cache
+
+    @instrumented
     def load_from_json(self, file_name: str) -> bool:
         """This method receives a str representing a path to a JSON file and loads the  JSON object
-        to this graph
+        to this graph. Files compressed with gzip, bz2, lzma (or zstd where Python has it) and
+        NDJSON files written by save_to_json are recognized by their content.
         @:param file_name - a str representing a path to a JSON file
         @:return True iff the graph was loaded successfully"""
         new_graph = dg()
         try:
-            with open(file_name, "r") as f:
-                new_dict = json.load(f)
-                for i in new_dict["Nodes"]:
-                    key = -1
-                    pos = None
-                    for k, v in i.items():
-                        if k == "pos":
-                            pos = v
-                        elif k=="id":
-                            key = v
-                    if pos is not None:
-                        tup_from_string = tuple(pos.split(","))
-                        new_tuple=(float(tup_from_string[0]),float(tup_from_string[1]),float(tup_from_string[2]))
-                        new_graph.add_node(key,new_tuple)
-                        pos=None
-                    else:
-                        new_graph.add_node(key,None)
-                for i in new_dict["Edges"]:
-                    src = -1
-                    weight = -1
-                    dest = -1
-                    for k, v in i.items():
-                        if k == "src":
-                            src = v
-                        elif k == "dest":
-                            dest = v
-                        else:
-                            weight = v
-                    new_graph.add_edge(src, dest, weight)
+            with open_json(file_name, "r", detect_compression(file_name)) as f:
+                stream = JsonStream(f)
+                if stream.at_end():
+                    return False
+                ndjson = stream.first_key() in JSON_NDJSON_KEYS
+                if ndjson:
+                    items = (("Edges" if "src" in item else "Nodes", item) for item in stream.values())
+                else:
+                    items = stream.items()
+                self._stream_graph(items, new_graph)
+                if not ndjson and not {"Nodes", "Edges"} <= set(stream.get_keys()):
+                    return False
             self._graph = new_graph
+            counters = Instrumentation.counters()
+            if counters is not None:
+                Instrumentation.add(counters, json_chars=stream.get_chars_read(), nodes=new_graph.v_size(),
+                                    edges=new_graph.e_size())
             return True
         except Exception as e:
             return False
 
-    def save_to_json(self, file_name: str) -> bool:
+    @staticmethod
+    def _stream_graph(items, new_graph: dg) -> None:
+        """This method inserts a stream of JSON nodes and edges into a new graph, in batches of add_nodes_from
+        and add_edges_from. Edges which arrive before the nodes are kept in compact arrays until the nodes
+        are inserted.
+        @:param items - an iterable of pairs ("Nodes" or "Edges", JSON object)
+        @:param new_graph - DiGraph, the graph to insert into"""
+        nodes_seen = False
+        nodes = []
+        edges = []
+        pending_src = array('q')
+        pending_dest = array('q')
+        pending_weight = array('d')
+        for section, item in items:
+            if section == "Nodes":
+                nodes_seen = True
+                pos = item.get("pos")
+                if pos is not None:
+                    x, y, z = pos.split(",")
+                    pos = (float(x), float(y), float(z))
+                nodes.append((item.get("id", -1), pos))
+                if len(nodes) == JSON_BATCH:
+                    new_graph.add_nodes_from(nodes)
+                    nodes.clear()
+            elif section == "Edges":
+                if nodes_seen:
+                    if nodes:
+                        new_graph.add_nodes_from(nodes)
+                        nodes.clear()
+                    edges.append((item.get("src", -1), item.get("dest", -1), item.get("w", -1)))
+                    if len(edges) == JSON_BATCH:
+                        new_graph.add_edges_from(edges)
+                        edges.clear()
+                else:
+                    pending_src.append(item.get("src", -1))
+                    pending_dest.append(item.get("dest", -1))
+                    pending_weight.append(item.get("w", -1))
+        new_graph.add_nodes_from(nodes)
+        new_graph.add_edges_from(edges)
+        new_graph.add_edges_from(zip(pending_src, pending_dest, pending_weight))
+
+    @_query
+    def save_to_json(self, file_name: str, indent: int = 4, layout: str = "json", compression: str = "infer") -> bool:
         """This method receives a str representing a path to save a file and saves the underlying
         graph of this graph as a JSON object.
+        The file is written in batches from a generator, the whole document is never built in memory.
         @:param file_name - str representing a path
+        @:param indent - int, the indent of the "json" layout, None for compact separators
+        @:param layout - "json" for {"Edges": [...], "Nodes": [...]}, "ndjson" for one node or edge per line
+        (an empty graph is written as {"Edges":[],"Nodes":[]})
+        @:param compression - "gzip", "bz2", "lzma", "zstd" (only where Python has compression.zstd), None for
+        a plain file, or "infer" to pick it from the suffix of file_name (.gz, .bz2, .xz, .lzma, .zst)
         @:return True iff the graph was saved successfully"""
+        if layout not in JSON_LAYOUTS:
+            raise ValueError("unknown layout: " + str(layout))
+        if compression == "infer":
+            compression = JSON_SUFFIXES.get(os.path.splitext(file_name)[1].lower())
+        if compression is not None:
+            compression_module(compression)
         if self._graph is None:
             return False
-        Nodes=[]
-        Edges=[]
-        for node in self._graph.get_all_v().values():
-            if node.get_location() is not None:
-                Nodes.append({"pos":""+str(node.get_location()[0])+","+str(node.get_location()[1])+","+str(node.get_location()[2]),"id":node.get_key()})
-            else:
-                Nodes.append({"id":node.get_key()})
-            for dest,edges in self._graph.all_out_edges_of_node(node.get_key()).items():
-                Edges.append({"src":node.get_key(),"w":edges,"dest":dest})
-        graph_to_json={"Edges":Edges,"Nodes":Nodes}
+        parts = json_parts(self._graph, indent, layout)
+        try:
+            with open_json(file_name, "w", compression) as f:
+                for batch in iter(lambda: "".join(itertools.islice(parts, JSON_BATCH)), ""):
+                    f.write(batch)
+                return True
+        except Exception as e:
+            return False
+
+    @instrumented
+    def save_binary(self, file_name: str) -> bool:
+        """This method saves the CSR snapshot of the underlying graph in a compact binary format:
+        a versioned header followed by the id table, the CSR arrays of the out- and in- edges
+        and the |V|x3 array of the locations, all little-endian 8 byte values.
+        @:param file_name - str representing a path
+        @:return True iff the graph was saved successfully"""
+        if self._graph is None:
+            return False
+        try:
+            write_binary(self._graph.freeze(), file_name)
+            return True
+        except Exception as e:
+            return False
+
+    @instrumented
+    def load_binary(self, file_name: str, mmap: bool = True) -> bool:
+        """This method loads a graph saved by save_binary.
+        With mmap the arrays are memory-mapped without copying, and the graph of this class becomes a
+        read-only CSRGraph, so several processes share one page-cached copy of the file.
+        Otherwise a regular DiGraph is built from the arrays.
+        @:param file_name - a str representing a path to a binary graph file
+        @:param mmap - if True the file is memory-mapped, o.w. it is read into a new DiGraph
+        @:return True iff the graph was loaded successfully"""
         try:
-            with open(file_name,"w") as f:
-                json.dump(graph_to_json,default=lambda o:o.__dict__,indent=4,fp=f)
+            frozen = read_binary(file_name, mmap)
+            if mmap:
+                self._graph = frozen
                 return True
+            new_graph = dg()
+            ids = frozen.get_ids()
+            new_graph.add_nodes_from((key, None if location[0] != location[0] else tuple(location))
+                                     for key, location in zip(ids.tolist(), frozen.get_positions().tolist()))
+            indptr, indices, weights = frozen.out_arrays()
+            sources = np.repeat(ids, np.diff(indptr))
+            new_graph.add_edges_from(zip(sources.tolist(), ids[indices].tolist(), weights.tolist()))
+            self._graph = new_graph
+            return True
         except Exception as e:
             return False
 
+    @instrumented
+    def single_source(self, src: int) -> (np.ndarray, np.ndarray):
+        """
+        Computes the shortest paths from src to all the nodes of the graph using Dijkstra's Algorithm.
+        The arrays are ordered by the dense index of the frozen snapshot of the graph, see get_graph().freeze().get_ids().
+        @:param src - The start node id
+        @:return (dist, pred) - the distance to every node (inf if unreachable) and the dense index of its
+        predecessor on the shortest path (-1 for src and for unreachable nodes)
+        """
+        if self._graph is None:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+        frozen = self._graph.freeze()
+        i = frozen.index_of(src)
+        if i is None:
+            return np.full(frozen.v_size(), np.inf), np.full(frozen.v_size(), -1, dtype=np.int64)
+        dist, pred = _single_source_arrays(frozen, i)
+        counters = Instrumentation.counters()
+        if counters is not None:
+            Instrumentation.add(counters, nodes_reached=int(np.isfinite(dist).sum()))
+        return dist, pred
+
+    @instrumented
+    def all_pairs_shortest_paths(self, dense: bool = True, workers: int = None, chunk_size: int = 16):
+        """
+        Computes the shortest paths between all the pairs of nodes, fanning the sources out across a process pool.
+        The workers share a read-only binary snapshot of the graph which every process memory-maps,
+        instead of pickling the graph for every task.
+        Rows and columns are ordered by the dense index of the frozen snapshot, see get_graph().freeze().get_ids().
+        @:param dense - if True the |V|x|V| distance and predecessor matrices are returned,
+        o.w. a generator of (src, dist, pred) per source, which keeps only a few rows in memory at once
+        @:param workers - the number of processes, None for the number of CPUs, 1 or less to run in this process
+        @:param chunk_size - the number of sources computed by a single task
+        @:return (dist, pred) matrices if dense, o.w. a generator of (src_id, dist, pred)
+        """
+        rows = self._all_pairs_rows(workers, chunk_size)
+        if not dense:
+            return rows
+        n = 0 if self._graph is None else self._graph.freeze().v_size()
+        dist = np.empty((n, n), dtype=np.float64)
+        pred = np.empty((n, n), dtype=np.int64)
+        for i, (src, dist_row, pred_row) in enumerate(rows):
+            dist[i] = dist_row
+            pred[i] = pred_row
+        return dist, pred
+
+    def _all_pairs_rows(self, workers: int, chunk_size: int):
+        """This method generates the single source shortest paths of every node in the dense order.
+        At most two tasks per worker are in flight, so the memory of the results stays bounded.
+        @:param workers - the number of processes, None for the number of CPUs, 1 or less to run in this process
+        @:param chunk_size - the number of sources computed by a single task
+        @:return a generator of (src_id, dist, pred)"""
+        if self._graph is None:
+            return
+        frozen = self._graph.freeze()
+        n = frozen.v_size()
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or n <= chunk_size:
+            for i in range(n):
+                dist, pred = _single_source_arrays(frozen, i)
+                yield frozen.key_of(i), dist, pred
+            return
+        fd, file_name = tempfile.mkstemp(suffix=".bin")
+        os.close(fd)
+        try:
+            write_binary(frozen, file_name)
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(file_name,)) as executor:
+                chunks = (list(range(start, min(start + chunk_size, n))) for start in range(0, n, chunk_size))
+                pending = deque(executor.submit(_worker_sources, chunk) for chunk in itertools.islice(chunks, 2 * workers))
+                while pending:
+                    sources, dist, pred = pending.popleft().result()
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        pending.append(executor.submit(_worker_sources, chunk))
+                    for k, i in enumerate(sources):
+                        yield frozen.key_of(i), dist[k], pred[k]
+        finally:
+            os.remove(file_name)
 
-    def shortest_path(self, id1: int, id2: int)-> (float, list):
+    @_query
+    def shortest_path(self, id1: int, id2: int, method: str = "dijkstra")-> (float, list):
         """
-        Returns the shortest path from node id1 to node id2 using Dijkstra's Algorithm
+        Returns the shortest path from node id1 to node id2.
         @:param id1 - The start node id
         @:param id2 - The end node id
-        @:return The distance of the path, a list of the nodes ids that the path goes through
+        @:param method - "dijkstra", "astar" (Dijkstra guided by an admissible Euclidean lower bound built
+        from the nodes locations, falls back to "dijkstra" if no such bound exists) or "bidirectional"
+        (Dijkstra from id1 over the out edges and from id2 over the in edges at the same time).
+        If the shortest path tree of id1 is maintained (see shortest_path_tree) the query is answered from it.
+        When the cache is enabled (see enable_cache) a miss computes the full shortest path tree of id1,
+        so later queries from id1 are answered from the cache regardless of the method.
+        @:return The distance of the path (a float, whether or not the graph is frozen), a list of the nodes ids
+        that the path goes through
         """
+        if method not in ("dijkstra", "astar", "bidirectional"):
+            raise ValueError("unknown shortest path method: " + str(method))
         if self._graph is None:
             return float('inf'), []
-        all_nodes=self._graph.get_all_v()
-        if all_nodes.get(id1) is None or all_nodes.get(id1) is None:
+        frozen = self._graph.get_frozen()
+        if frozen is not None:
+            src = frozen.index_of(id1)
+            dst = frozen.index_of(id2)
+            out_edges = self._adjacency(frozen).__getitem__
+            in_edges = self._adjacency(frozen, True).__getitem__ if method == "bidirectional" else None
+            key_of = frozen.key_of
+        else:
+            all_nodes = self._graph.get_all_v()
+            src = id1 if id1 in all_nodes else None
+            dst = id2 if id2 in all_nodes else None
+            out_edges, in_edges, key_of = self._edges_of(), self._edges_of(True), None
+        if src is None or dst is None:
+            return float('inf'), []
+        if src == dst:
+            return 0.0, [id1]
+        counters = Instrumentation.counters()
+        if counters is not None:
+            out_edges, in_edges = self._counted(out_edges, counters), self._counted(in_edges, counters)
+        tree = self._trees.get(id1)
+        if tree is not None and tree.get_graph() is self._graph:
+            if counters is not None:
+                Instrumentation.add(counters, tree_hits=1)
+            path = tree.path(id2)
+            return (tree.distance(id2), path) if path else (float('inf'), [])
+        cache = self._cache
+        if cache is not None:
+            cached = cache.get_path(self._graph, id1, id2)
+            if cached is not None:
+                if counters is not None:
+                    Instrumentation.add(counters, cache_hits=1)
+                return cached
+            distances, prev = dijkstra(out_edges, src, counters=counters)
+            return cache.put_tree_path(self._graph, id1, frozen, distances, prev, id2)
+        scale = self._astar_scale() if method == "astar" else None
+        if method == "bidirectional":
+            dist, path = self._bidirectional_dijkstra(out_edges, in_edges, src, dst, counters)
+        elif scale is not None:
+            all_nodes = self._graph.get_all_v()
+            target = all_nodes[id2].get_location()
+            if key_of is None:
+                heuristic = lambda u: scale * math.dist(all_nodes[u].get_location(), target)
+            else:
+                heuristic = lambda u: scale * math.dist(all_nodes[key_of(u)].get_location(), target)
+            dist, path = self._astar(out_edges, src, dst, heuristic, counters)
+        else:
+            distances, prev = dijkstra(out_edges, src, targets=(dst,), counters=counters)
+            if dst not in distances:
+                return float('inf'), []
+            dist, path = distances[dst], path_to(prev, src, dst)
+        if key_of is not None:
+            path = [key_of(i) for i in path]
+        if counters is not None:
+            Instrumentation.add(counters, path_length=len(path))
+        return dist, path
+
+    @_query
+    def shortest_paths(self, id1: int, targets) -> dict:
+        """
+        Returns the shortest paths from node id1 to several nodes, found by a single Dijkstra from id1
+        which ends as soon as all the targets are settled.
+        Like shortest_path, the targets are answered from the shortest path tree of id1 if it is maintained,
+        and from the cache if it is enabled, the search runs only for the remaining targets.
+        @:param id1 - The start node id
+        @:param targets - an iterable of the end node ids
+        @:return dict - (distance, path) of every target, (inf, []) if it is unreachable or not in the graph
+        """
+        result = {target: (float('inf'), []) for target in targets}
+        if self._graph is None or not result:
+            return result
+        counters = Instrumentation.counters()
+        if counters is not None:
+            Instrumentation.add(counters, targets=len(result))
+        tree = self._trees.get(id1)
+        if tree is not None and tree.get_graph() is self._graph:
+            if counters is not None:
+                Instrumentation.add(counters, tree_hits=1)
+            for target in result:
+                path = tree.path(target)
+                if path:
+                    result[target] = (tree.distance(target), path)
+            return result
+        remaining = list(result)
+        cache = self._cache
+        if cache is not None:
+            remaining = []
+            for target in result:
+                cached = cache.get_path(self._graph, id1, target)
+                if cached is None:
+                    remaining.append(target)
+                else:
+                    result[target] = cached
+            if counters is not None:
+                Instrumentation.add(counters, cache_hits=len(result) - len(remaining))
+            if not remaining:
+                return result
+        out_edges, index_of, key_of = self._search_edges()
+        src = index_of(id1)
+        nodes = {target: index_of(target) for target in remaining}
+        if src is None:
+            return result
+        if counters is not None:
+            out_edges = self._counted(out_edges, counters)
+        dist, pred = dijkstra(out_edges, src, targets={node for node in nodes.values() if node is not None},
+                              counters=counters)
+        for target, node in nodes.items():
+            if node in dist:
+                result[target] = (dist[node], path_to(pred, src, node, key_of))
+                if cache is not None:
+                    cache.put_path(self._graph, id1, target, *result[target])
+        return result
+
+    @instrumented
+    def shortest_path_tree(self, src: int):
+        """
+        Returns the single source shortest path tree of src, which is maintained under changes of the graph
+        (add_edge, remove_edge, update_edge_weight, ...) by repairing only the affected part of the tree.
+        While the tree is maintained, shortest_path queries from src are answered from it.
+        The graph must be a DiGraph, a read-only graph (a GraphView or a loaded CSRGraph) raises ValueError.
+        @:param src - The source node id
+        @:return ShortestPathTree - the tree, None if there is no graph
+        """
+        if self._graph is None:
+            return None
+        tree = self._trees.get(src)
+        if tree is None or tree.get_graph() is not self._graph:
+            self.release_shortest_path_tree(src)
+            tree = self._trees[src] = ShortestPathTree(self._graph, src)
+        return tree
+
+    def release_shortest_path_tree(self, src: int) -> None:
+        """
+        Stops maintaining the shortest path tree of src.
+        @:param src - The source node id
+        """
+        tree = self._trees.pop(src, None)
+        if tree is not None:
+            tree.close()
+
+    def within_distance(self, src: int, radius: float):
+        """
+        Finds the nodes whose distance from src is at most radius, nearest first.
+        The search is a Dijkstra over the adjacency of the graph which advances only as far as the results are
+        consumed, and stops at the first node farther than radius.
+        The graph must not be changed while the results are consumed.
+        While an Instrumentation is installed the search is recorded once the results are exhausted or closed.
+        @:param src - The start node id
+        @:param radius - float, the largest distance
+        @:return a generator of pairs (node_id, distance) of the nodes other than src, by increasing distance,
+        empty if src is not in the graph
+        """
+        if radius < 0:
+            raise ValueError("radius must not be negative: " + str(radius))
+        return self._nearest(src, radius, None, None, "GraphAlgo.within_distance")
+
+    def k_nearest(self, src: int, k: int, predicate=None):
+        """
+        Finds the k nodes nearest to src, optionally only among the nodes accepted by predicate.
+        The search is a Dijkstra over the adjacency of the graph which advances only as far as the results are
+        consumed, and stops as soon as k nodes were found. predicate sees only the nodes the search reached.
+        The graph must not be changed while the results are consumed.
+        While an Instrumentation is installed the search is recorded once the results are exhausted or closed.
+        @:param src - The start node id
+        @:param k - int, the number of nodes
+        @:param predicate - a function which receives a NodeData and returns True iff the node may be returned,
+        None to accept every node
+        @:return a generator of at most k pairs (node_id, distance) of the nodes other than src,
+        by increasing distance, empty if src is not in the graph
+        """
+        if k < 0:
+            raise ValueError("k must not be negative: " + str(k))
+        return self._nearest(src, float('inf'), k, predicate, "GraphAlgo.k_nearest")
+
+    def _nearest(self, src: int, radius: float, k, predicate, name: str):
+        """This method generates the nodes reached by Dijkstra's algorithm from src, by increasing distance.
+        Every node is settled only when the one before it was consumed, and the read lock of the graph is held
+        only while a node is settled, not while the caller handles it.
+        While an Instrumentation is installed the search is recorded under name once the generator is exhausted
+        or closed, with the time spent settling the nodes (not handling them) and the work of the search.
+        @:param src - The start node id
+        @:param radius - float, the search stops at the first node farther than radius
+        @:param k - int, the search stops after k nodes, None for no limit
+        @:param predicate - a function of a NodeData, only the nodes it accepts are generated, None for all
+        @:param name - the name the search is recorded under, e.g. "GraphAlgo.k_nearest"
+        @:return a generator of pairs (node_id, distance)"""
+        graph = self._graph
+        if graph is None or k == 0:
+            return
+        active = Instrumentation.active
+        lock = graph.get_lock()
+        reading = contextlib.nullcontext if lock is None else lock.reading
+        edges_of = graph.all_out_edges_of_node
+        dist = {src: 0}
+        heap = [(0, src)]
+        found = pops = stale = relaxed = 0
+        seconds = 0.0
+        try:
+            with reading():
+                mc = graph.get_mc()
+                nodes = graph.get_all_v()
+                if src not in nodes:
+                    return
+            while heap:
+                start = time.perf_counter()
+                try:
+                    with reading():
+                        if graph.get_mc() != mc:
+                            raise RuntimeError("the graph changed during the iteration")
+                        d, u = heapq.heappop(heap)
+                        pops += 1
+                        if d > dist[u]:
+                            stale += 1
+                            continue
+                        if d > radius:
+                            return
+                        edges = edges_of(u)
+                        relaxed += len(edges)
+                        for v, w in edges.items():
+                            new_dist = d + w
+                            if new_dist < dist.get(v, float('inf')):
+                                dist[v] = new_dist
+                                heapq.heappush(heap, (new_dist, v))
+                finally:
+                    seconds += time.perf_counter() - start
+                if u != src and (predicate is None or predicate(nodes[u])):
+                    found += 1
+                    yield u, d
+                    if found == k:
+                        return
+        finally:
+            if active is not None:
+                counters = {}
+                count_search(counters, pops, stale, len(heap), len(dist) if pops else 0)
+                Instrumentation.add(counters, edges_relaxed=relaxed, results=found)
+                active.record(name, seconds, counters)
+
+    @_query
+    def tsp(self, node_list: list) -> (float, list):
+        """
+        Finds a short route which visits all the nodes of node_list, in any order.
+        The distances between the stops are computed by a single Dijkstra per stop, which ends as soon as the
+        16 stops nearest to it (_TSP_NEIGHBOURS) are settled, a short route mostly goes from a stop to a near one.
+        The distance to a farther stop is bounded from above by the shortest chain of these distances.
+        A nearest neighbour route over the matrix of these distances is then improved by 2-opt moves (reversing
+        a part of the route) and Or-opt moves (moving up to 3 consecutive stops elsewhere) until no move
+        shortens it. Every leg of the route between stops which are not near each other gets a search of its
+        own, which can only shorten it, and the other legs are expanded from the predecessors of the searches.
+        The route may start at any stop and does not return to its start.
+        @:param node_list - list of the node ids to visit, a node which appears more than once is visited once
+        @:return (distance, path) - the length of the route and all the nodes it goes through,
+        (inf, []) if there is no such route or one of the nodes is not in the graph
+        """
+        if self._graph is None or not node_list:
             return float('inf'), []
-        if id1 == id2:
-            return 0,[id1]
-        for k,v in all_nodes.items():
-            v.set_weight(float('inf'));
-        first_node=all_nodes[id1]
-        first_node.set_weight(0)
-        queue=pq()
-        queue.put((first_node.get_weight(),first_node))
-        while not queue.empty():
-            first_node=queue.get()[1]
-            for dest,weight in self._graph.all_out_edges_of_node(first_node.get_key()).items():
-                if all_nodes[dest].get_weight()> first_node.get_weight()+weight:
-                    all_nodes[dest].set_weight(first_node.get_weight()+weight)
-                    queue.put((all_nodes[dest].get_weight(),all_nodes[dest]))
-        dest_node=all_nodes[id2]
-        dist = dest_node.get_weight()
-        if dist == float('inf'):
+        stops = list(dict.fromkeys(node_list))
+        out_edges, index_of, key_of = self._search_edges()
+        sources = [index_of(key) for key in stops]
+        if None in sources:
             return float('inf'), []
-        path= [dest_node.get_key()]
-        while dest_node.get_weight() != 0:
-            edges_into_node=self._graph.all_in_edges_of_node(dest_node.get_key())
-            for k,v in edges_into_node.items():
-                if dest_node.get_weight() == all_nodes[k].get_weight()+v:
-                    dest_node=all_nodes[k]
-                    path.insert(0,dest_node.get_key())
-                    break
-        return dist,path
+        if len(stops) == 1:
+            return 0.0, stops
+        counters = Instrumentation.counters()
+        if counters is not None:
+            out_edges = self._counted(out_edges, counters)
+        near = min(_TSP_NEIGHBOURS, len(stops) - 1)
+        known = np.empty((len(stops), len(stops)))
+        preds = []
+        for i, src in enumerate(sources):
+            row, pred = dijkstra(out_edges, src, targets=sources, counters=counters, limit=near + 1)
+            known[i] = [row.get(dst, float('inf')) for dst in sources]
+            # the stops which were not settled are farther than the radius of the search
+            known[i, known[i] > np.partition(known[i], near)[near]] = np.nan
+            preds.append(pred)
+        exact = ~np.isnan(known)
+        # index 0 is a stop at distance 0 from and to all the others, it marks the free start and end of the route
+        dist = np.zeros((len(stops) + 1, len(stops) + 1))
+        tour = None
+        moves = 0
+        while True:
+            dist[1:, 1:] = chain_distances(np.where(exact, known, np.inf))
+            finite = np.isfinite(dist)
+            matrix = np.where(finite, dist, dist[finite].max() * len(dist) + 1)
+            tour, count = improve_tour(matrix, greedy_tour(matrix) if tour is None else tour)
+            moves += count
+            legs = [(a - 1, b - 1) for a, b in zip(tour[1:], tour[2:])]
+            unbounded = {a for a, b in legs if not finite[a + 1, b + 1] and not exact[a, b]}
+            if not unbounded:
+                break
+            for a in unbounded:
+                row, preds[a] = dijkstra(out_edges, sources[a], targets=sources, counters=counters)
+                known[a] = [row.get(dst, float('inf')) for dst in sources]
+                exact[a] = True
+        if counters is not None:
+            Instrumentation.add(counters, stops=len(stops), tour_moves=moves,
+                                legs_searched=sum(1 for a, b in legs if not exact[a, b]))
+        total = 0.0
+        path = [stops[legs[0][0]]]
+        for a, b in legs:
+            src, dst = sources[a], sources[b]
+            pred = preds[a]
+            if not exact[a, b]:
+                row, pred = dijkstra(out_edges, src, targets=(dst,), counters=counters)
+                known[a, b] = row.get(dst, float('inf'))
+            total += known[a, b]
+            if total == float('inf'):
+                return float('inf'), []
+            path.extend(path_to(pred, src, dst, key_of)[1:])
+        return float(total), path
+
+    def _search_edges(self):
+        """This method returns the out edges the searches run over: the adjacency lists of the snapshot if it is
+        fresh, o.w. the dictionaries of the graph, so a search never rebuilds the snapshot after a mutation.
+        @:return (out_edges, index_of, key_of) - a method which returns the pairs (neighbour, weight) of a node,
+        a method which maps a node id to a node (None if it is not in the graph) and one which maps it back
+        (None if the nodes are the node ids)"""
+        frozen = self._graph.get_frozen()
+        if frozen is not None:
+            return self._adjacency(frozen).__getitem__, frozen.index_of, frozen.key_of
+        all_nodes = self._graph.get_all_v()
+        return self._edges_of(), lambda key: key if key in all_nodes else None, None
+
+    def _adjacency(self, frozen: CSRGraph, reverse: bool = False) -> list:
+        """This method returns the adjacency lists of a CSR snapshot of the underlying graph, which are much
+        faster to scan than the slices of its arrays. They are built once per snapshot, the in edges only when
+        they are first needed.
+        @:param frozen - CSRGraph, the snapshot
+        @:param reverse - if True the lists of the edges coming into every node, o.w. of the edges going out of it
+        @:return list - for every dense index, the list of pairs (dense index of the neighbour, weight)"""
+        cache = self._adjacency_cache
+        if cache is None or cache[0] is not frozen:
+            cache = self._adjacency_cache = (frozen, [None, None])
+        lists = cache[1]
+        if lists[reverse] is None:
+            lists[reverse] = adjacency_lists(*(frozen.in_arrays() if reverse else frozen.out_arrays()))
+        return lists[reverse]
+
+    @_query
+    def eccentricities(self) -> dict:
+        """
+        Computes the eccentricity of every node: the largest distance from it to a node of its SCC.
+        (Every other node is unreachable from it or cannot reach back, so the eccentricity over the whole graph
+        is infinite unless the graph is strongly connected.)
+        Most nodes are resolved by the distance bounds of a few probed nodes instead of a Dijkstra of their own.
+        @:return dict - the eccentricity of every node id, 0 for a node which is alone in its SCC
+        """
+        if self._graph is None:
+            return {}
+        frozen, out_adjacency, in_adjacency, members = self._scc_adjacency()
+        result = dict.fromkeys(frozen.get_ids().tolist(), 0.0)
+        probes = 0
+        for scc in members:
+            if len(scc) > 1:
+                nodes = scc.tolist()
+                lower, upper, count = bound_eccentricities([out_adjacency[i] for i in nodes],
+                                                           [in_adjacency[i] for i in nodes], False)
+                probes += count
+                for i, ecc in zip(scc.tolist(), upper.tolist()):
+                    result[frozen.key_of(i)] = ecc
+        counters = Instrumentation.counters()
+        if counters is not None:
+            Instrumentation.add(counters, probes=probes, nodes_resolved=len(result))
+        return result
 
+    @_query
+    def center_point(self) -> (int, float):
+        """
+        Finds the center of the graph: the node whose largest distance to the other nodes is the smallest.
+        That distance is infinite from every node of a graph that is not strongly connected, so the center
+        is looked for within the largest SCC, which is the whole graph when it is strongly connected.
+        Nodes are discarded by the distance bounds of a few probed nodes instead of a Dijkstra of their own.
+        @:return (node_id, eccentricity) - the center and its largest distance to the nodes of its SCC,
+        (None, inf) if the graph is empty
+        """
+        if self._graph is None or self._graph.v_size() == 0:
+            return None, float('inf')
+        frozen, out_adjacency, in_adjacency, members = self._scc_adjacency()
+        scc = max(members, key=len)
+        if len(scc) == 1:
+            return frozen.key_of(int(scc[0])), 0.0
+        nodes = scc.tolist()
+        lower, upper, probes = bound_eccentricities([out_adjacency[i] for i in nodes],
+                                                    [in_adjacency[i] for i in nodes], True)
+        resolved = upper - lower <= ECCENTRICITY_TOLERANCE * upper
+        best = int(np.argmin(np.where(resolved, upper, np.inf)))
+        counters = Instrumentation.counters()
+        if counters is not None:
+            Instrumentation.add(counters, probes=probes, nodes_resolved=int(resolved.sum()))
+        return frozen.key_of(int(scc[best])), float(upper[best])
+
+    def _scc_adjacency(self) -> (CSRGraph, list, list, list):
+        """This method returns the edges inside the SCCs of the CSR snapshot of the underlying graph.
+        @:return (frozen, out_adjacency, in_adjacency, members) - the snapshot, the out and in adjacency lists
+        of every dense index (see Dijkstra.adjacency_lists) whose neighbours are given by their index inside
+        their SCC, and an array of the dense indices of every SCC, ordered as in connected_components()"""
+        frozen = self._graph.freeze()
+        scc_of, components = self._scc()
+        component = np.array([scc_of[key] for key in frozen.get_ids().tolist()], dtype=np.int64)
+        order = np.argsort(component, kind="stable")
+        sizes = np.bincount(component, minlength=len(components))
+        starts = np.cumsum(sizes) - sizes
+        local = np.empty(len(order), dtype=np.int64)
+        local[order] = np.arange(len(order)) - np.repeat(starts, sizes)
+        out_adjacency = adjacency_lists(*frozen.out_arrays(), component, local)
+        in_adjacency = adjacency_lists(*frozen.in_arrays(), component, local)
+        members = np.split(order, np.cumsum(sizes)[:-1])
+        return frozen, out_adjacency, in_adjacency, members
+
+    @_query
     def connected_component(self, id1: int)-> list:
         """
         Finds the Strongly Connected Component(SCC) that node id1 is a part of in this graph.
         @:param id1 - The node id
-        @:return The list of nodes in the SCC
+        @:return The list of nodes in the SCC, starting with id1
         """
-        if self._graph is None:
-            return []
-        all_nodes=self._graph.get_all_v()
-        if all_nodes.get(id1) is None:
+        scc_id = self.scc_id(id1)
+        if scc_id == -1:
             return []
-        for node in all_nodes.values():
-            node.set_tag(-1)
-            node.set_weight(-1)
-        component_out=[all_nodes[id1]]
-        while len(component_out) != 0:
-            first_node=component_out.pop(0)
-            for dest,weight in self._graph.all_out_edges_of_node(first_node.get_key()).items():
-                if all_nodes[dest].get_tag() == -1:
-                    all_nodes[dest].set_tag(0)
-                    component_out.append(all_nodes[dest])
-        component_in=[all_nodes[id1]]
-        while len(component_in) != 0:
-            first_node=component_in.pop(0)
-            for dest,weight in self._graph.all_in_edges_of_node(first_node.get_key()).items():
-                if all_nodes[dest].get_weight() == -1:
-                    all_nodes[dest].set_weight(0)
-                    component_in.append(all_nodes[dest])
-        component_list=[all_nodes[id1].get_key()]
-        for j in all_nodes.values():
-            if j.get_tag() == 0 and j.get_weight()==0 and j.get_key() != id1:
-                component_list.append(j.get_key())
-        return component_list
+        tracker = self._tracker()
+        members = self._scc()[1][scc_id] if tracker is None else tracker.get_members(scc_id)
+        return [id1] + [key for key in members if key != id1]
+
+    @_query
+    def scc_id(self, node_id: int) -> int:
+        """
+        Returns the index of the SCC that node_id is a part of in the list returned by connected_components().
+        The SCCs are computed once and cached until the MC of the graph changes.
+        If the SCCs are tracked (see track_components) the id of the SCC in the tracker is returned instead.
+        @:param node_id - The node id
+        @:return int - the index of the SCC of the node, -1 if the node is not in the graph
+        """
+        if self._graph is None:
+            return -1
+        tracker = self._tracker()
+        if tracker is not None:
+            return tracker.component_of(node_id)
+        return self._scc()[0].get(node_id, -1)
+
+    @instrumented
+    def track_components(self):
+        """
+        Starts maintaining the SCCs of the graph incrementally under its changes, instead of recomputing
+        them after every change. While tracked, connected_component, connected_components and scc_id
+        are answered by the tracker.
+        The graph must be a DiGraph, a read-only graph (a GraphView or a loaded CSRGraph) raises ValueError.
+        @:return IncrementalSCC - the tracker
+        """
+        if self._graph is None:
+            return None
+        if self._tracker() is None:
+            self.untrack_components()
+            self._scc_tracker = IncrementalSCC(self._graph)
+        return self._scc_tracker
+
+    def untrack_components(self) -> None:
+        """
+        Stops maintaining the SCCs of the graph incrementally.
+        """
+        if self._scc_tracker is not None:
+            self._scc_tracker.close()
+            self._scc_tracker = None
+
+    def _tracker(self):
+        """This method returns the SCC tracker iff it tracks the current graph.
+        @:return IncrementalSCC - the tracker, None if the SCCs of the graph are not tracked"""
+        tracker = self._scc_tracker
+        if tracker is not None and tracker.get_graph() is self._graph:
+            return tracker
+        return None
+
+    def _scc(self) -> (dict, list):
+        """This method returns the SCCs of the underlying graph, computing them only if the graph changed
+        since they were last computed. The SCCs are ordered by the first node of each SCC in the graph, and
+        the nodes of each SCC are ordered as in the graph.
+        @:return (scc_of, components) - a dictionary of the SCC index of every node, and the list of all SCC"""
+        graph = self._graph
+        cache = self._scc_cache
+        if cache is not None and cache[0] is graph and cache[1] == graph.get_mc():
+            return cache[2], cache[3]
+        frozen = graph.get_frozen()
+        if frozen is not None:
+            nodes = range(frozen.v_size())
+            edges_of = frozen.out_edges
+            keys = frozen.get_ids().tolist()
+        else:
+            nodes = list(graph.get_all_v().keys())
+            edges_of = self._edges_of()
+            keys = nodes
+        counters = Instrumentation.counters()
+        if counters is not None:
+            edges_of = self._counted(edges_of, counters, "edges_scanned")
+        component = tarjan(nodes, edges_of, counters)
+        scc_of = {}
+        components = []
+        order = {}
+        for handle, key in zip(nodes, keys):
+            scc_id = order.get(component[handle])
+            if scc_id is None:
+                scc_id = order[component[handle]] = len(components)
+                components.append([])
+            scc_of[key] = scc_id
+            components[scc_id].append(key)
+        self._scc_cache = (graph, graph.get_mc(), scc_of, components)
+        return scc_of, components
+
+    def _edges_of(self, reverse: bool = False):
+        """This method returns a method which iterates over the edges of a node of the underlying graph.
+        @:param reverse - if True the edges coming into the node are returned, o.w. the edges going out of it
+        @:return a method which returns an iterable of pairs (neighbour, weight) of a node"""
+        edges_of = self._graph.all_in_edges_of_node if reverse else self._graph.all_out_edges_of_node
+        return lambda key: edges_of(key).items()
+
+    @staticmethod
+    def _astar(edges_of, src, dst, heuristic, counters: dict = None) -> (float, list):
+        """This method runs the A* algorithm from src to dst.
+        @:param edges_of - a method which returns an iterable of pairs (neighbour, weight) of a node
+        @:param src - The start node
+        @:param dst - The end node
+        @:param heuristic - a consistent lower bound on the distance from a node to dst
+        @:param counters - dict, if given the work of the search is added to it (see Dijkstra.count_search)
+        @:return The distance of the path, a list of the nodes that the path goes through"""
+        dist = {src: 0.0}
+        prev = {src: None}
+        bound = {}
+        heap = [(heuristic(src), 0.0, src)]
+        pops = stale = 0
+        while heap:
+            f, d, u = heapq.heappop(heap)
+            pops += 1
+            if d > dist[u]:
+                stale += 1
+                continue
+            if u == dst:
+                if counters is not None:
+                    count_search(counters, pops, stale, len(heap), len(dist))
+                return d, path_to(prev, src, dst)
+            for v, w in edges_of(u):
+                new_dist = d + w
+                if new_dist < dist.get(v, float('inf')):
+                    dist[v] = new_dist
+                    prev[v] = u
+                    h = bound.get(v)
+                    if h is None:
+                        h = bound[v] = heuristic(v)
+                    heapq.heappush(heap, (new_dist + h, new_dist, v))
+        if counters is not None:
+            count_search(counters, pops, stale, 0, len(dist))
+        return float('inf'), []
 
+    @staticmethod
+    def _bidirectional_dijkstra(out_edges, in_edges, src, dst, counters: dict = None) -> (float, list):
+        """This method runs Dijkstra's algorithm from src over the out edges and from dst over the in edges,
+        alternating between the two searches until the sum of their frontiers passes the best meeting point.
+        @:param out_edges - a method which returns an iterable of pairs (neighbour, weight) going out of a node
+        @:param in_edges - a method which returns an iterable of pairs (neighbour, weight) coming into a node
+        @:param src - The start node
+        @:param dst - The end node
+        @:param counters - dict, if given the work of both searches is added to it (see Dijkstra.count_search)
+        @:return The distance of the path, a list of the nodes that the path goes through"""
+        dist = ({src: 0.0}, {dst: 0.0})
+        prev = ({src: None}, {dst: None})
+        heaps = ([(0.0, src)], [(0.0, dst)])
+        edges = (out_edges, in_edges)
+        best = float('inf')
+        meet = None
+        pops = stale = 0
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            this_dist, other_dist = dist[side], dist[1 - side]
+            d, u = heapq.heappop(heaps[side])
+            pops += 1
+            if d > this_dist[u]:
+                stale += 1
+                continue
+            for v, w in edges[side](u):
+                new_dist = d + w
+                if new_dist < this_dist.get(v, float('inf')):
+                    this_dist[v] = new_dist
+                    prev[side][v] = u
+                    heapq.heappush(heaps[side], (new_dist, v))
+                if v in other_dist and new_dist + other_dist[v] < best:
+                    best = new_dist + other_dist[v]
+                    meet = v
+        if counters is not None:
+            count_search(counters, pops, stale, len(heaps[0]) + len(heaps[1]), len(dist[0]) + len(dist[1]))
+        if meet is None:
+            return float('inf'), []
+        path = path_to(prev[0], src, meet)
+        path.extend(reversed(path_to(prev[1], dst, meet)[:-1]))
+        return best, path
+
+    @staticmethod
+    def _counted(edges_of, counters: dict, name: str = "edges_relaxed"):
+        """This method wraps a method which returns the edges of a node so the edges are counted.
+        @:param edges_of - a method which returns an iterable of pairs (neighbour, weight) of a node
+        @:param counters - dict, the counters of an instrumented call
+        @:param name - the name of the counter
+        @:return a method which returns the same edges as a list"""
+        def counted(key):
+            edges = list(edges_of(key))
+            counters[name] = counters.get(name, 0) + len(edges)
+            return edges
+        return counted
+
+    def _astar_scale(self):
+        """This method returns the largest factor c such that every edge weight is at least c times the
+        Euclidean distance between the locations of its nodes, so c times the distance to the target is an
+        admissible and consistent A* bound. The factor is cached by the MC of the graph.
+        @:return float - the factor, None if a node has no location or no edge gives a bound"""
+        graph = self._graph
+        if self._astar_cache is not None and self._astar_cache[0] is graph \
+                and self._astar_cache[1] == graph.get_mc():
+            return self._astar_cache[2]
+        all_nodes = graph.get_all_v()
+        scale = float('inf')
+        for key, node in all_nodes.items():
+            location = node.get_location()
+            if location is None:
+                scale = None
+                break
+            for dest, weight in graph.all_out_edges_of_node(key).items():
+                dest_location = all_nodes[dest].get_location()
+                if dest_location is None:
+                    continue
+                length = math.dist(location, dest_location)
+                if length > 0 and weight / length < scale:
+                    scale = weight / length
+        if scale == float('inf') or scale == 0:
+            scale = None
+        self._astar_cache = (graph, graph.get_mc(), scale)
+        return scale
+
+    @_query
     def connected_components(self)-> list:
         """
         Finds all the Strongly Connected Component(SCC) in this graph.
@@ -173,24 +1009,18 @@ class GraphAlgo(ga):
         """
         if self._graph is None:
             return []
-        all_nodes=self._graph.get_all_v()
-        all_componentes=[]
-        keys_list= list(all_nodes.keys())
-        index=0
-        while len(keys_list) != 0:
-            rand_key = keys_list.pop(0)
-            all_componentes.append(self.connected_component(rand_key))
-            for j in all_componentes[index]:
-                for k in keys_list:
-                    if k == j:
-                        keys_list.remove(k)
-            index+=1
-        return all_componentes
+        tracker = self._tracker()
+        if tracker is not None:
+            return tracker.components()
+        return [list(component) for component in self._scc()[1]]
 
     def graph_width(self,v_dict:dict):
         """"This method returns a list containing the smallest x value of a node in the graph
         and the highest x value of a node in this graph.
         @:return list - containing the highest and lowest x value of the nodes in this graph"""
+        bounds = self._spatial_bounds(v_dict)
+        if bounds is not None:
+            return [bounds[0], bounds[2]]
         min_val=float('inf')
         max_val=-1
         for k,v in v_dict.items():
@@ -207,6 +1037,9 @@ class GraphAlgo(ga):
         """"This method returns a list containing the smallest y value of a node in the graph
         and the highest y value of a node in this graph.
         @:return list - containing the highest and lowest y value of the nodes in this graph"""
+        bounds = self._spatial_bounds(v_dict)
+        if bounds is not None:
+            return [bounds[1], bounds[3]]
         min_val=float('inf')
         max_val=-1
         for k,v in v_dict.items():
@@ -219,46 +1052,127 @@ class GraphAlgo(ga):
         height=[min_val,max_val]
         return height
 
-    def plot_graph(self):
+    def _spatial_bounds(self, v_dict: dict):
+        """
+        This method returns the cached bounds of the spatial index of the graph, when v_dict holds the nodes
+        of the graph itself and the index was already built (see DiGraph.spatial_index).
+        @:param v_dict - dict, the nodes which are measured
+        @:return tuple - (min_x, min_y, max_x, max_y), (inf, inf, -1, -1) if no node has a location,
+        None if the bounds have to be computed from v_dict
+        """
+        graph = self._graph
+        if graph is None or not hasattr(graph, "spatial_index") or v_dict is not graph.get_all_v():
+            return None
+        index = graph.spatial_index(build=False)
+        if index is None:
+            return None
+        bounds = index.get_bounds()
+        return (float('inf'), float('inf'), -1, -1) if bounds is None else bounds
+
+    @_query
+    def layout(self, method: str = "force", seed: int = 0, iterations: int = 50) -> np.ndarray:
         """
-        Plots the graph.
+        Computes positions for the nodes of the graph which have no location, without changing the graph.
+        The nodes which have a location keep it, the others are laid out within their bounding box
+        (or within [0, 100] x [0, 100] if no node has a location).
+        The result is cached by the MC of the graph, so repeated calls (and renders) are free.
+        @:param method - "force" for a force-directed layout (Fruchterman-Reingold, its repulsion approximated
+        by a coarse grid on large graphs, started from the spectral layout), "spectral" for the spectral layout
+        alone (O(|E|) per iteration) or "grid" to place the nodes on a square grid
+        @:param seed - the seed of the random start of the layout, the same seed gives the same positions
+        @:param iterations - the number of iterations of the force-directed layout
+        @:return np.ndarray of shape |V|x2, a read-only array of the (x, y) of the nodes in the order of get_all_v()
+        """
+        if method not in ("force", "spectral", "grid"):
+            raise ValueError("unknown layout method: " + str(method))
+        if self._graph is None:
+            return np.zeros((0, 2))
+        graph = self._graph
+        key = (method, seed, iterations)
+        cache = self._layout_cache
+        if cache is not None and cache[0] is graph and cache[1] == graph.get_mc() and cache[2] == key:
+            return cache[3]
+        frozen = graph.freeze()
+        n = frozen.v_size()
+        known = np.array(frozen.get_positions()[:, :2], dtype=np.float64)
+        located = ~np.isnan(known).any(axis=1)
+        if located.all():
+            result = known
+        else:
+            if located.any():
+                low = known[located].min(axis=0)
+                span = (known[located].max(axis=0) - low).max()
+                span = span if span > 0 else 1.0
+            else:
+                low = np.zeros(2)
+                span = 100.0
+            sources, dests = undirected_edges(frozen)
+            if method == "grid":
+                positions = grid_layout(n)
+            else:
+                positions = spectral_layout(n, sources, dests, np.random.default_rng(seed))
+            positions[located] = (known[located] - low) / span
+            if method == "force":
+                positions = force_layout(positions, located, sources, dests, iterations)
+                if not located.any():
+                    positions = normalize_positions(positions)
+            result = positions * span + low
+            result[located] = known[located]
+        result.setflags(write=False)
+        self._layout_cache = (graph, graph.get_mc(), key, result)
+        return result
+
+    @instrumented
+    def plot_graph(self, save_to: str = None, labels: bool = None, max_edges: int = 200000,
+                   label_limit: int = 500) -> None:
+        """
+        Plots the graph with a single scatter of the nodes and a single LineCollection of the edges.
         If the nodes have a position, the nodes will be placed there.
-        Otherwise, they will be placed in a random but elegant manner.
+        Otherwise, they will be placed by layout(), without changing the graph.
+        The positions and the edges are collected under the read lock of the graph, which is released before
+        the figure is drawn, so a shown window does not block the mutations.
+        @:param save_to - a path to save the plot to (the format is taken from its suffix, e.g. PNG or SVG),
+        the figure is then rendered headless with the Agg backend instead of being shown
+        @:param labels - if True the node ids are drawn, if None they are drawn only up to label_limit nodes
+        @:param max_edges - above this number of edges a uniform sample of max_edges edges is drawn
+        @:param label_limit - the number of nodes up to which labels are drawn by default
         """
         if self._graph is None:
             return
-        fig,ax=plt.subplots()
-        all_nodes=self._graph.get_all_v()
-        x_axis=[]
-        y_axis=[]
-        keys=[]
-        edges_by_src={}
-        width_range=self.graph_width(all_nodes)
-        if width_range[0] == float('inf'):
-            width_range=[0,100]
-        height_range=self.graph_height(all_nodes)
-        if height_range[0] == float('inf'):
-            height_range=[0,100]
-        width=width_range[1]-width_range[0]
-        height=height_range[1]-height_range[0]
-        for node in all_nodes.values():
-            if node.get_location() is None:
-                np.warnings.filterwarnings('ignore', category=np.VisibleDeprecationWarning)
-                node.set_location((width_range[0]+width*np.random.uniform(low=0.01,high=0.1,size=1),height_range[0]+height*np.random.uniform(low=0.01,high=0.1,size=1),0))
-        for key,node in all_nodes.items():
-            x_val=node.get_location()[0]/width
-            y_val=node.get_location()[1]/height
-            x_axis.append(x_val)
-            y_axis.append(y_val)
-            keys.append(key)
-            ax.scatter(x_val,y_val,color='blue',zorder=2)
-           # ax.annotate(key,(x_val,y_val))
-            ax.text(x_val+1*0.0001/width,y_val+0.15*0.0001/height,s=str(key),zorder=3)
-            for dest,weight in self._graph.all_out_edges_of_node(key).items():
-                x_val_dest=all_nodes[dest].get_location()[0]/width
-                y_val_dest=all_nodes[dest].get_location()[1]/height
-                edges_by_src[key]= [[x_val,y_val],[x_val_dest,y_val_dest]]
-                ax.plot([x_val,x_val_dest],[y_val,y_val_dest],color='red',zorder=1)
-        plt.axis('off')
-        plt.show()
-
+        lock = self._graph.get_lock()
+        reading = contextlib.nullcontext if lock is None else lock.reading
+        with reading():
+            keys = list(self._graph.get_all_v())
+            frozen = self._graph.freeze()
+            positions = self.layout()
+            indptr, indices, weights = frozen.out_arrays()
+        span = positions.max(axis=0) - positions.min(axis=0) if len(positions) else np.ones(2)
+        span[span == 0] = 1
+        positions = positions / span
+        sources = np.repeat(np.arange(frozen.v_size()), np.diff(indptr))
+        dests = np.asarray(indices)
+        if len(dests) > max_edges:
+            sample = np.random.default_rng(0).choice(len(dests), size=max_edges, replace=False)
+            sources = sources[sample]
+            dests = dests[sample]
+        counters = Instrumentation.counters()
+        if counters is not None:
+            Instrumentation.add(counters, nodes_drawn=len(positions), edges_drawn=len(dests))
+        if save_to is None:
+            fig, ax = plt.subplots()
+        else:
+            fig = Figure()
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot()
+        ax.add_collection(LineCollection(np.stack([positions[sources], positions[dests]], axis=1), colors='red',
+                                         linewidths=0.5 if len(dests) > 10000 else 1.5, zorder=1))
+        ax.autoscale_view()
+        ax.scatter(positions[:, 0], positions[:, 1], color='blue', s=4 if len(positions) > 10000 else 20, zorder=2)
+        if labels or (labels is None and len(positions) <= label_limit):
+            for key, (x, y) in zip(keys, positions.tolist()):
+                ax.text(x, y, s=str(key), zorder=3)
+        ax.axis('off')
+        if save_to is None:
+            plt.show()
+        else:
+            fig.savefig(save_to)
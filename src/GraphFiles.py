@@ -0,0 +1,170 @@
+import bz2
+import gzip
+import json
+import struct
+import numpy as np
+from CSRGraph import CSRGraph
+try:
+    import lzma
+except ImportError:
+    lzma = None
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+_BINARY_MAGIC = b"DWGRAPH\0"
+_BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct("<8sIIQQQ")
+_BINARY_HEADER_SIZE = 64
+_BINARY_DTYPES = ["<i8", "<i8", "<i8", "<f8", "<i8", "<i8", "<f8", "<f8"]
+
+
+JSON_LAYOUTS = ("json", "ndjson")
+JSON_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "lzma", ".lzma": "lzma", ".zst": "zstd"}
+_JSON_MAGIC = [(b"\x1f\x8b", "gzip"), (b"BZh", "bz2"), (b"\xfd7zXZ\x00", "lzma"), (b"\x28\xb5\x2f\xfd", "zstd")]
+JSON_NDJSON_KEYS = ("id", "pos", "src", "dest", "w")
+JSON_BATCH = 4096
+
+
+def compression_module(compression: str):
+    """This function returns the stdlib module of a compression format.
+    @:param compression - str, one of "gzip", "bz2", "lzma" or "zstd"
+    @:return the module, with an open function like gzip.open"""
+    modules = {"gzip": gzip, "bz2": bz2, "lzma": lzma, "zstd": zstd}
+    if compression not in modules:
+        raise ValueError("unknown compression: " + str(compression))
+    if modules[compression] is None:
+        raise ValueError(compression + " compression is not available in this Python")
+    return modules[compression]
+
+
+def open_json(file_name: str, mode: str, compression: str = None):
+    """This function opens a JSON file in text mode, through a compression format if one is given.
+    @:param file_name - str representing a path
+    @:param mode - "r" or "w"
+    @:param compression - str, the compression format, None for a plain file
+    @:return a file object"""
+    if compression is None:
+        return open(file_name, mode)
+    module = compression_module(compression)
+    if module is gzip:
+        # level 6 is nearly as small as the default 9 and several times faster to write
+        return gzip.open(file_name, mode + "t", compresslevel=6, encoding="utf-8")
+    return module.open(file_name, mode + "t", encoding="utf-8")
+
+
+def detect_compression(file_name: str):
+    """This function detects the compression format of a file from its first bytes.
+    @:param file_name - str representing a path
+    @:return str - the compression format, None for a plain file"""
+    with open(file_name, "rb") as f:
+        head = f.read(6)
+    for magic, compression in _JSON_MAGIC:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def _json_number(value) -> str:
+    """This function formats a number the way json.dump does.
+    @:param value - int or float
+    @:return str - the JSON text of the number"""
+    text = repr(value)
+    return text if text[-1].isdigit() else json.dumps(value)
+
+
+def json_parts(graph, indent, layout: str):
+    """This function generates the text of a graph file piece by piece, so that the whole document
+    is never held in memory. With layout "json" and an indent of 4 the text is exactly what
+    json.dump(..., indent=4) writes for {"Edges": [...], "Nodes": [...]}.
+    @:param graph - GraphInterface, the graph to write
+    @:param indent - int, the indent of the "json" layout, None for compact separators
+    @:param layout - "json" for a single object, "ndjson" for one node or edge per line (nodes first)
+    @:return a generator of str"""
+    nodes = graph.get_all_v()
+    if layout == "ndjson" and not nodes:
+        # an empty file is not a graph, so an empty graph is written as an object with empty arrays
+        yield '{"Edges":[],"Nodes":[]}\n'
+        return
+    if layout == "ndjson":
+        for node in nodes.values():
+            key = _json_number(node.get_key())
+            location = node.get_location()
+            if location is None:
+                yield '{"id":' + key + '}\n'
+            else:
+                pos = str(location[0]) + "," + str(location[1]) + "," + str(location[2])
+                yield '{"pos":"' + pos + '","id":' + key + '}\n'
+        for node in nodes.values():
+            src = _json_number(node.get_key())
+            for dest, weight in graph.all_out_edges_of_node(node.get_key()).items():
+                yield '{"src":' + src + ',"w":' + _json_number(weight) + ',"dest":' + _json_number(dest) + '}\n'
+        return
+    if indent is None:
+        nl, i1, colon = "", "", ":"
+    else:
+        nl, i1, colon = "\n", " " * indent, ": "
+    i2 = i1 * 2
+    i3 = i1 * 3
+    edge_format = (i2 + "{" + nl + i3 + '"src"' + colon + "%s," + nl + i3 + '"w"' + colon + "%s," + nl
+                   + i3 + '"dest"' + colon + "%s" + nl + i2 + "}")
+    pos_format = i2 + "{" + nl + i3 + '"pos"' + colon + '"%s",' + nl + i3 + '"id"' + colon + "%s" + nl + i2 + "}"
+    id_format = i2 + "{" + nl + i3 + '"id"' + colon + "%s" + nl + i2 + "}"
+    yield "{" + nl + i1 + '"Edges"' + colon + "["
+    separator = nl
+    for node in nodes.values():
+        src = _json_number(node.get_key())
+        for dest, weight in graph.all_out_edges_of_node(node.get_key()).items():
+            yield separator + edge_format % (src, _json_number(weight), _json_number(dest))
+            separator = "," + nl
+    yield ("]" if separator == nl else nl + i1 + "]") + "," + nl + i1 + '"Nodes"' + colon + "["
+    separator = nl
+    for node in nodes.values():
+        key = _json_number(node.get_key())
+        location = node.get_location()
+        if location is None:
+            yield separator + id_format % key
+        else:
+            pos = str(location[0]) + "," + str(location[1]) + "," + str(location[2])
+            yield separator + pos_format % (pos, key)
+        separator = "," + nl
+    yield ("]" if separator == nl else nl + i1 + "]") + nl + "}"
+
+
+def write_binary(frozen: CSRGraph, file_name: str) -> None:
+    """This function writes a CSR snapshot to a file in the binary format of GraphAlgo.save_binary.
+    @:param frozen - CSRGraph, the snapshot to write
+    @:param file_name - str representing a path"""
+    with open(file_name, "wb") as f:
+        f.write(_BINARY_HEADER.pack(_BINARY_MAGIC, _BINARY_VERSION, 0, frozen.v_size(), frozen.e_size(),
+                                    frozen.get_mc()))
+        f.write(bytes(_BINARY_HEADER_SIZE - _BINARY_HEADER.size))
+        arrays = [frozen.get_ids()] + list(frozen.out_arrays()) + list(frozen.in_arrays())
+        arrays.append(frozen.get_positions())
+        for arr, dtype in zip(arrays, _BINARY_DTYPES):
+            np.ascontiguousarray(arr, dtype=dtype).tofile(f)
+
+
+def read_binary(file_name: str, mmap: bool) -> CSRGraph:
+    """This function reads a CSR snapshot from a file written by write_binary.
+    @:param file_name - str representing a path
+    @:param mmap - if True the arrays are memory-mapped, o.w. they are read into memory
+    @:return CSRGraph - the snapshot"""
+    with open(file_name, "rb") as f:
+        magic, version, flags, v_size, e_size, mc = _BINARY_HEADER.unpack(f.read(_BINARY_HEADER.size))
+    if magic != _BINARY_MAGIC or version != _BINARY_VERSION:
+        raise ValueError("not a binary graph file: " + file_name)
+    shapes = [(v_size,), (v_size + 1,), (e_size,), (e_size,), (v_size + 1,), (e_size,), (e_size,), (v_size, 3)]
+    arrays = []
+    offset = _BINARY_HEADER_SIZE
+    for shape, dtype in zip(shapes, _BINARY_DTYPES):
+        count = int(np.prod(shape))
+        if count == 0:
+            arrays.append(np.zeros(shape, dtype=dtype))
+        elif mmap:
+            arrays.append(np.memmap(file_name, dtype=dtype, mode="r", offset=offset, shape=shape))
+        else:
+            arrays.append(np.fromfile(file_name, dtype=dtype, count=count, offset=offset).reshape(shape))
+        offset += count * 8
+    return CSRGraph.from_arrays(mc, arrays[0], tuple(arrays[1:4]), tuple(arrays[4:7]), arrays[7])
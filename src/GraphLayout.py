@@ -0,0 +1,131 @@
+import math
+import numpy as np
+from CSRGraph import CSRGraph
+
+_LAYOUT_EXACT_LIMIT = 1000
+_LAYOUT_GRID_CELLS = 32
+_LAYOUT_GRAVITY = 0.1
+
+
+def undirected_edges(frozen: CSRGraph) -> (np.ndarray, np.ndarray):
+    """This function returns the edges of a CSR snapshot without their direction or weight.
+    @:param frozen - CSRGraph, the snapshot
+    @:return (sources, dests) - the dense indices of the ends of every edge, without self loops"""
+    indptr, indices, weights = frozen.out_arrays()
+    sources = np.repeat(np.arange(frozen.v_size()), np.diff(indptr))
+    dests = np.asarray(indices, dtype=np.int64)
+    keep = sources != dests
+    return sources[keep], dests[keep]
+
+
+def grid_layout(n: int) -> np.ndarray:
+    """This function places n nodes on a square grid in the unit square, ordered by their dense index.
+    @:param n - the number of nodes
+    @:return np.ndarray of shape nx2"""
+    side = max(1, math.ceil(math.sqrt(n)))
+    cells = np.arange(n)
+    return np.column_stack([cells % side, cells // side]).astype(np.float64) / max(1, side - 1)
+
+
+def spectral_layout(n: int, sources: np.ndarray, dests: np.ndarray, rng, iterations: int = 100) -> np.ndarray:
+    """This function approximates the two leading non trivial eigenvectors of the random walk matrix of the
+    undirected graph by power iteration (Koren's degree-normalized spectral drawing), O(|E|) per iteration.
+    @:param n - the number of nodes
+    @:param sources - the start dense index of every edge
+    @:param dests - the end dense index of every edge
+    @:param rng - numpy Generator of the random start vectors
+    @:param iterations - the number of power iterations
+    @:return np.ndarray of shape nx2, the ranks of the coordinates scaled into the unit square, so the nodes
+    are spread evenly instead of the few nodes of a small component stretching the drawing"""
+    degree = np.bincount(sources, minlength=n) + np.bincount(dests, minlength=n)
+    safe_degree = np.maximum(degree, 1).astype(np.float64)
+    x = rng.random((n, 2))
+    for _ in range(iterations):
+        neighbours = np.empty_like(x)
+        for col in range(2):
+            neighbours[:, col] = np.bincount(sources, weights=x[dests, col], minlength=n) \
+                + np.bincount(dests, weights=x[sources, col], minlength=n)
+        x = np.where(degree[:, None] > 0, 0.5 * (x + neighbours / safe_degree[:, None]), x)
+        x -= (x * safe_degree[:, None]).sum(axis=0) / safe_degree.sum()
+        first = x[:, 0] / max(np.linalg.norm(x[:, 0]), 1e-300)
+        x[:, 1] -= first * (first * x[:, 1] * safe_degree).sum() / max((first * first * safe_degree).sum(), 1e-300)
+        x /= np.maximum(np.linalg.norm(x, axis=0), 1e-300)
+    ranks = np.empty_like(x)
+    for col in range(2):
+        ranks[np.argsort(x[:, col], kind="stable"), col] = np.arange(n) / max(1, n - 1)
+    return ranks
+
+
+def normalize_positions(positions: np.ndarray) -> np.ndarray:
+    """This function scales positions into the unit square, keeping their aspect ratio.
+    @:param positions - np.ndarray of shape nx2
+    @:return np.ndarray of shape nx2"""
+    if len(positions) == 0:
+        return positions
+    low = positions.min(axis=0)
+    span = (positions.max(axis=0) - low).max()
+    return (positions - low) / (span if span > 0 else 1)
+
+
+def _repulsion(positions: np.ndarray, k: float) -> np.ndarray:
+    """This function computes the repulsive forces of Fruchterman and Reingold between all the nodes.
+    Up to _LAYOUT_EXACT_LIMIT nodes the forces are exact. Above it the nodes are binned into a coarse grid:
+    every node is pushed by the centers of mass of the other cells (computed once per cell), and away from
+    the center of mass of its own cell, which costs O(|V| + cells^2) per call.
+    @:param positions - np.ndarray of shape nx2
+    @:param k - the optimal distance between nodes
+    @:return np.ndarray of shape nx2, the repulsive force on every node"""
+    n = len(positions)
+    if n <= _LAYOUT_EXACT_LIMIT:
+        dx = positions[:, 0, None] - positions[None, :, 0]
+        dy = positions[:, 1, None] - positions[None, :, 1]
+        scale = k * k / np.maximum(dx * dx + dy * dy, 1e-9)
+        return np.column_stack([(dx * scale).sum(axis=1), (dy * scale).sum(axis=1)])
+    low = positions.min(axis=0)
+    span = np.maximum(positions.max(axis=0) - low, 1e-9)
+    cell_of = np.minimum(((positions - low) / span * _LAYOUT_GRID_CELLS).astype(np.int64), _LAYOUT_GRID_CELLS - 1)
+    cell = cell_of[:, 0] * _LAYOUT_GRID_CELLS + cell_of[:, 1]
+    occupied, cell = np.unique(cell, return_inverse=True)
+    mass = np.bincount(cell).astype(np.float64)
+    centers = np.column_stack([np.bincount(cell, weights=positions[:, col]) for col in range(2)]) / mass[:, None]
+    delta = centers[:, None, :] - centers[None, :, :]
+    dist2 = (delta ** 2).sum(axis=2)
+    np.fill_diagonal(dist2, np.inf)
+    far = (delta * (k * k * mass / np.maximum(dist2, 1e-9))[:, :, None]).sum(axis=1)
+    delta = positions - centers[cell]
+    dist2 = np.maximum((delta ** 2).sum(axis=1), 1e-9)
+    return far[cell] + delta * (k * k * (mass[cell] - 1) / dist2)[:, None]
+
+
+def force_layout(start: np.ndarray, pinned: np.ndarray, sources: np.ndarray, dests: np.ndarray,
+                 iterations: int) -> np.ndarray:
+    """This function runs the force-directed layout of Fruchterman and Reingold around the unit square,
+    with a weak gravity towards its center which keeps unconnected nodes close.
+    Every iteration is vectorized over all the nodes and edges.
+    @:param start - np.ndarray of shape nx2, the initial positions
+    @:param pinned - np.ndarray of n booleans, the nodes which keep their initial position
+    @:param sources - the start dense index of every edge
+    @:param dests - the end dense index of every edge
+    @:param iterations - the number of iterations
+    @:return np.ndarray of shape nx2"""
+    positions = start.copy()
+    n = len(positions)
+    if n < 2 or pinned.all():
+        return positions
+    k = math.sqrt(1.0 / n)
+    temperature = 0.1
+    for step in range(iterations):
+        force = _repulsion(positions, k)
+        delta = positions[sources] - positions[dests]
+        dist = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 1e-9)
+        pull = delta * (dist / k)[:, None]
+        for col in range(2):
+            force[:, col] -= np.bincount(sources, weights=pull[:, col], minlength=n)
+            force[:, col] += np.bincount(dests, weights=pull[:, col], minlength=n)
+        force -= _LAYOUT_GRAVITY * (positions - 0.5) / k
+        length = np.maximum(np.sqrt((force ** 2).sum(axis=1)), 1e-9)
+        cooled = temperature * (1 - step / iterations)
+        move = force * (np.minimum(length, cooled) / length)[:, None]
+        move[pinned] = 0
+        positions += move
+    return positions
@@ -0,0 +1,56 @@
+class GraphListener:
+    """This class represents a listener of the changes of a DiGraph, registered by DiGraph.add_listener.
+    The methods are called after the change was applied, while the graph still holds its write lock.
+    Removing a node is reported by node_removing, then by the removal of each of its edges and then by the
+    removal of the node."""
+
+    def node_added(self, node_id: int) -> None:
+        """
+        Called after a node was added to the graph.
+        @param node_id: The node ID
+        """
+
+    def node_removing(self, node_id: int) -> None:
+        """
+        Called before the edges of a node are removed, as the first step of the removal of the node.
+        @param node_id: The node ID
+        """
+
+    def node_removed(self, node_id: int) -> None:
+        """
+        Called after a node (with no edges left) was removed from the graph.
+        @param node_id: The node ID
+        """
+
+    def node_moved(self, node_id: int, old_location: tuple, location: tuple) -> None:
+        """
+        Called after the location of a node was changed by NodeData.set_location.
+        @param node_id: The node ID
+        @param old_location: The previous location of the node
+        @param location: The new location of the node
+        """
+
+    def edge_added(self, id1: int, id2: int, weight: float) -> None:
+        """
+        Called after an edge was added to the graph.
+        @param id1: The start node of the edge
+        @param id2: The end node of the edge
+        @param weight: The weight of the edge
+        """
+
+    def edge_removed(self, id1: int, id2: int, weight: float) -> None:
+        """
+        Called after an edge was removed from the graph.
+        @param id1: The start node of the edge
+        @param id2: The end node of the edge
+        @param weight: The weight the edge had
+        """
+
+    def edge_weight_changed(self, id1: int, id2: int, old_weight: float, weight: float) -> None:
+        """
+        Called after the weight of an edge was changed.
+        @param id1: The start node of the edge
+        @param id2: The end node of the edge
+        @param old_weight: The previous weight of the edge
+        @param weight: The new weight of the edge
+        """
@@ -0,0 +1,180 @@
+from CSRGraph import CSRGraph
+from GraphInterface import GraphInterface as gi
+
+
+class GraphView(gi):
+    """This class represents a read-only view of a graph: the subgraph induced by a set of nodes, the graph
+    with all its edges reversed, or both. The view copies nothing, it shares the nodes and the adjacency
+    dictionaries of its parent and filters them on every query, so it always shows the current state of the
+    parent (a node of the set which is added to the parent later shows up in the view).
+    The view has the MC and the lock of its parent, so GraphAlgo runs on it directly. The dictionaries it
+    returns must not be changed, the methods that change the graph do nothing and return False."""
+
+    def __init__(self, graph, nodes=None, reverse: bool = False):
+        """A constructor for the class.
+        @:param graph - GraphInterface, the parent graph
+        @:param nodes - an iterable of the node IDs of the view, None for all the nodes of the parent
+        @:param reverse - if True every edge src -> dest of the parent is the edge dest -> src of the view"""
+        self._graph = graph
+        self._keys = None if nodes is None else dict.fromkeys(nodes)
+        self._reverse = reverse
+        self._cache_mc = -1
+        self._nodes = None
+        self._edge_size = 0
+        self._frozen = None
+
+    def get_parent(self):
+        """This method returns the graph this view is taken from.
+        @:return GraphInterface - the parent graph"""
+        return self._graph
+
+    def is_reversed(self) -> bool:
+        """This method returns whether the edges of the view are reversed.
+        @:return True iff the edges are reversed"""
+        return self._reverse
+
+    def subgraph(self, node_ids) -> "GraphView":
+        """This method returns the view of the subgraph of this view induced by a set of nodes.
+        @:param node_ids - an iterable of node IDs
+        @:return GraphView - the view"""
+        if self._keys is not None:
+            node_ids = [key for key in node_ids if key in self._keys]
+        return GraphView(self._graph, node_ids, self._reverse)
+
+    def reverse_view(self):
+        """This method returns the view of this view with all the edges reversed.
+        @:return GraphInterface - the view, or the parent itself if that is what the view shows"""
+        if self._keys is None and self._reverse:
+            return self._graph
+        return GraphView(self._graph, self._keys, not self._reverse)
+
+    def _refresh(self) -> None:
+        """This method rebuilds the nodes of the view and counts its edges when the parent changed."""
+        mc = self._graph.get_mc()
+        if self._cache_mc == mc:
+            return
+        parent_nodes = self._graph.get_all_v()
+        if self._keys is None:
+            self._nodes = parent_nodes
+            self._edge_size = self._graph.e_size()
+        else:
+            self._nodes = {key: parent_nodes[key] for key in self._keys if key in parent_nodes}
+            self._edge_size = sum(len(self.all_out_edges_of_node(key)) for key in self._nodes)
+        self._cache_mc = mc
+
+    def v_size(self) -> int:
+        """
+        A method that returns the number of vertices in this view
+        @:return: The number of vertices in this view
+        """
+        self._refresh()
+        return len(self._nodes)
+
+    def e_size(self) -> int:
+        """
+        A method that returns the number of edges in this view
+        @:return The number of edges in this view
+        """
+        self._refresh()
+        return self._edge_size
+
+    def get_all_v(self) -> dict:
+        """This method returns a dictionary of all the nodes in the view, each node is
+        represented using a pair (node_id, node_data)
+        @return A dictionary representing the nodes in the view
+        """
+        self._refresh()
+        return self._nodes
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        """This method returns a dictionary of all the nodes connected to (into) node_id ,
+        each node is represented using a pair (other_node_id, weight)
+        @:return a dictionary of all the edges connected into node_id
+        """
+        return self._edges(id1, not self._reverse)
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        """This method returns a dictionary of all the nodes connected from (out of) node_id ,
+        each node is represented using a pair (other_node_id, weight)
+        @:return a dictionary of all the edges connected out of node_id
+        """
+        return self._edges(id1, self._reverse)
+
+    def _edges(self, id1: int, incoming: bool) -> dict:
+        """This method returns the edges of a node in the parent, filtered by the nodes of the view.
+        @:param id1 - The node ID
+        @:param incoming - if True the edges coming into the node in the parent, o.w. the edges going out of it
+        @:return dict - the edges (other_node_id, weight), the dictionary of the parent itself if nothing is filtered"""
+        keys = self._keys
+        if keys is not None and id1 not in keys:
+            return {}
+        edges = self._graph.all_in_edges_of_node(id1) if incoming else self._graph.all_out_edges_of_node(id1)
+        if keys is None:
+            return edges
+        return {key: w for key, w in edges.items() if key in keys}
+
+    def get_mc(self) -> int:
+        """
+        This method returns the version of the view, which is the version of its parent
+        @:return The MC of the parent graph.
+        """
+        return self._graph.get_mc()
+
+    def get_lock(self):
+        """
+        This method returns the lock of the parent graph, queries on the view hold it for reading.
+        @:return ReadWriteLock - the lock of the parent, None if it has no lock
+        """
+        return self._graph.get_lock()
+
+    def freeze(self) -> CSRGraph:
+        """
+        This method returns a frozen CSR snapshot of this view, the snapshot is cached and rebuilt
+        only when the MC of the parent changed since it was taken.
+        @:return CSRGraph - a read-only snapshot of this view
+        """
+        lock = self.get_lock()
+        if lock is not None:
+            lock.acquire_read()
+        try:
+            if self._frozen is None or self._frozen.get_mc() != self.get_mc():
+                self._frozen = CSRGraph(self)
+            return self._frozen
+        finally:
+            if lock is not None:
+                lock.release_read()
+
+    def get_frozen(self):
+        """
+        This method returns the snapshot taken by freeze() iff it is still fresh.
+        @:return CSRGraph - the fresh snapshot of this view, None if there is no such snapshot
+        """
+        if self._frozen is not None and self._frozen.get_mc() != self.get_mc():
+            self._frozen = None
+        return self._frozen
+
+    def add_edge(self, id1: int, id2: int, weight: float) -> bool:
+        """A view is read-only, this method does nothing.
+        @:return False"""
+        return False
+
+    def add_node(self, node_id: int, pos: tuple = None) -> bool:
+        """A view is read-only, this method does nothing.
+        @:return False"""
+        return False
+
+    def remove_node(self, node_id: int) -> bool:
+        """A view is read-only, this method does nothing.
+        @:return False"""
+        return False
+
+    def remove_edge(self, node_id1: int, node_id2: int) -> bool:
+        """A view is read-only, this method does nothing.
+        @:return False"""
+        return False
+
+    def __repr__(self) -> str:
+        """ This method returns a string representing this view.
+        @:return a str representing this view"""
+        return "GraphView: |V|=" + str(self.v_size()) + " , |E|=" + str(self.e_size()) + " , MC=" + str(self.get_mc()) \
+            + (" , reversed" if self._reverse else "")
@@ -0,0 +1,230 @@
+from GraphListener import GraphListener
+from Tarjan import tarjan
+
+
+class IncrementalSCC(GraphListener):
+    """This class represents the Strongly Connected Components (SCC) of a DiGraph, maintained under
+    changes of the graph instead of being recomputed from scratch.
+    The class keeps the condensation of the graph (the DAG of the SCCs, with the number of edges between
+    every two SCCs). An edge which closes a cycle in the condensation merges the SCCs along that cycle,
+    and removing an edge inside an SCC re-runs Tarjan's algorithm on that SCC only. Removing a node re-runs it
+    once for the SCC of the node, instead of once for every edge of the node.
+    Every SCC has an integer id which stays the same as long as the SCC is not merged or split."""
+
+    def __init__(self, graph):
+        """A constructor for the class, computes the SCCs of the graph and registers as its listener.
+        @:param graph - DiGraph, the graph to track, a read-only graph (GraphView, CSRGraph) raises ValueError"""
+        if not hasattr(graph, "add_listener"):
+            raise ValueError("a read-only graph cannot be tracked: " + type(graph).__name__)
+        self._graph = graph
+        self._comp_of = {}
+        self._members = {}
+        self._cond_out = {}
+        self._cond_in = {}
+        self._next_id = 0
+        self._removing = None
+        with graph.get_lock().writing():
+            nodes = list(graph.get_all_v().keys())
+            component = tarjan(nodes, lambda key: graph.all_out_edges_of_node(key).items())
+            ids = {}
+            for key in nodes:
+                comp_id = ids.get(component[key])
+                if comp_id is None:
+                    comp_id = ids[component[key]] = self._new_component()
+                self._comp_of[key] = comp_id
+                self._members[comp_id].add(key)
+            for key in nodes:
+                for dest in graph.all_out_edges_of_node(key):
+                    self._link(self._comp_of[key], self._comp_of[dest])
+            graph.add_listener(self)
+
+    def get_graph(self):
+        """This method returns the tracked graph.
+        @:return DiGraph - the graph"""
+        return self._graph
+
+    def close(self) -> None:
+        """This method stops tracking the graph."""
+        self._graph.remove_listener(self)
+
+    def component_of(self, node_id: int) -> int:
+        """This method returns the id of the SCC of a node in O(1).
+        @:param node_id - The node ID
+        @:return int - the id of the SCC, -1 if the node is not in the graph"""
+        return self._comp_of.get(node_id, -1)
+
+    def get_members(self, comp_id: int) -> set:
+        """This method returns the nodes of an SCC in O(1), the set must not be changed by the caller.
+        @:param comp_id - int, the id of the SCC
+        @:return set - the nodes of the SCC, an empty set if there is no such SCC"""
+        return self._members.get(comp_id, set())
+
+    def get_components(self) -> dict:
+        """This method returns all the SCCs in O(1), the dictionary must not be changed by the caller.
+        @:return dict - the nodes of every SCC by its id"""
+        return self._members
+
+    def components(self) -> list:
+        """This method returns all the SCCs as lists.
+        @:return list - the list of all SCC"""
+        return [list(members) for members in self._members.values()]
+
+    def node_added(self, node_id: int) -> None:
+        """A new node is a new SCC of its own."""
+        comp_id = self._new_component()
+        self._comp_of[node_id] = comp_id
+        self._members[comp_id].add(node_id)
+
+    def node_removing(self, node_id: int) -> None:
+        """The edges of the node inside its SCC are removed without splitting the SCC, see node_removed."""
+        self._removing = node_id
+
+    def node_removed(self, node_id: int) -> None:
+        """The rest of the SCC of a removed node is split once, after all the edges of the node were removed."""
+        self._removing = None
+        comp_id = self._comp_of.pop(node_id)
+        members = self._members[comp_id]
+        members.discard(node_id)
+        if members:
+            self._split(comp_id)
+        else:
+            self._drop_component(comp_id)
+
+    def edge_added(self, id1: int, id2: int, weight: float) -> None:
+        """An edge between two SCCs merges all the SCCs that are reachable from the SCC of id2 and reach
+        the SCC of id1, if there are any."""
+        src = self._comp_of[id1]
+        dest = self._comp_of[id2]
+        if src == dest or not self._link(src, dest):
+            return
+        reachable = self._search(dest, self._cond_out)
+        if src not in reachable:
+            return
+        merged = self._search(src, self._cond_in, reachable)
+        self._merge(merged)
+
+    def edge_removed(self, id1: int, id2: int, weight: float) -> None:
+        """Removing an edge inside an SCC may split that SCC, only that SCC is checked again."""
+        src = self._comp_of[id1]
+        dest = self._comp_of[id2]
+        if src != dest:
+            self._unlink(src, dest)
+        elif self._removing != id1 and self._removing != id2:
+            self._split(src)
+
+    def _new_component(self) -> int:
+        """This method creates a new empty SCC.
+        @:return int - the id of the new SCC"""
+        comp_id = self._next_id
+        self._next_id += 1
+        self._members[comp_id] = set()
+        self._cond_out[comp_id] = {}
+        self._cond_in[comp_id] = {}
+        return comp_id
+
+    def _drop_component(self, comp_id: int) -> None:
+        """This method removes an SCC and its condensation edges.
+        @:param comp_id - int, the id of the SCC"""
+        for dest in self._cond_out.pop(comp_id):
+            del self._cond_in[dest][comp_id]
+        for src in self._cond_in.pop(comp_id):
+            del self._cond_out[src][comp_id]
+        del self._members[comp_id]
+
+    def _link(self, src: int, dest: int, count: int = 1) -> bool:
+        """This method adds edges to the condensation.
+        @:param src - int, the id of the start SCC
+        @:param dest - int, the id of the end SCC
+        @:param count - int, the number of edges
+        @:return True iff there were no edges from src to dest before"""
+        if src == dest:
+            return False
+        old = self._cond_out[src].get(dest, 0)
+        self._cond_out[src][dest] = old + count
+        self._cond_in[dest][src] = old + count
+        return old == 0
+
+    def _unlink(self, src: int, dest: int) -> None:
+        """This method removes a single edge from the condensation.
+        @:param src - int, the id of the start SCC
+        @:param dest - int, the id of the end SCC"""
+        count = self._cond_out[src][dest] - 1
+        if count == 0:
+            del self._cond_out[src][dest]
+            del self._cond_in[dest][src]
+        else:
+            self._cond_out[src][dest] = count
+            self._cond_in[dest][src] = count
+
+    @staticmethod
+    def _search(start: int, adjacency: dict, allowed: set = None) -> set:
+        """This method returns the SCCs reachable from start in the condensation.
+        @:param start - int, the id of the first SCC
+        @:param adjacency - dict, the condensation edges to follow (out or in)
+        @:param allowed - set, if given the search does not leave these SCCs
+        @:return set - the ids of the reached SCCs (including start)"""
+        seen = {start}
+        stack = [start]
+        while stack:
+            comp_id = stack.pop()
+            for other in adjacency[comp_id]:
+                if other not in seen and (allowed is None or other in allowed):
+                    seen.add(other)
+                    stack.append(other)
+        return seen
+
+    def _merge(self, merged: set) -> None:
+        """This method merges SCCs into the largest of them.
+        @:param merged - set, the ids of the SCCs to merge"""
+        target = max(merged, key=lambda comp_id: len(self._members[comp_id]))
+        for comp_id in merged:
+            if comp_id == target:
+                continue
+            for key in self._members[comp_id]:
+                self._comp_of[key] = target
+            self._members[target] |= self._members[comp_id]
+            cond_out = dict(self._cond_out[comp_id])
+            cond_in = dict(self._cond_in[comp_id])
+            self._drop_component(comp_id)
+            for dest, count in cond_out.items():
+                if dest not in merged:
+                    self._link(target, dest, count)
+            for src, count in cond_in.items():
+                if src not in merged:
+                    self._link(src, target, count)
+        for dest in [dest for dest in self._cond_out[target] if dest in merged]:
+            del self._cond_out[target][dest]
+            del self._cond_in[dest][target]
+        for src in [src for src in self._cond_in[target] if src in merged]:
+            del self._cond_in[target][src]
+            del self._cond_out[src][target]
+
+    def _split(self, comp_id: int) -> None:
+        """This method runs Tarjan's algorithm on the nodes of a single SCC and splits it if needed,
+        the largest part keeps the id of the SCC.
+        @:param comp_id - int, the id of the SCC"""
+        members = self._members[comp_id]
+        graph = self._graph
+        edges_of = lambda key: ((dest, w) for dest, w in graph.all_out_edges_of_node(key).items() if dest in members)
+        component = tarjan(list(members), edges_of)
+        parts = {}
+        for key in members:
+            parts.setdefault(component[key], set()).add(key)
+        if len(parts) == 1:
+            return
+        self._drop_component(comp_id)
+        parts = sorted(parts.values(), key=len, reverse=True)
+        self._members[comp_id] = set()
+        self._cond_out[comp_id] = {}
+        self._cond_in[comp_id] = {}
+        for i, part in enumerate(parts):
+            part_id = comp_id if i == 0 else self._new_component()
+            self._members[part_id] = part
+            for key in part:
+                self._comp_of[key] = part_id
+        for key in members:
+            for dest in graph.all_out_edges_of_node(key):
+                self._link(self._comp_of[key], self._comp_of[dest])
+            for src in graph.all_in_edges_of_node(key):
+                if src not in members:
+                    self._link(self._comp_of[src], self._comp_of[key])
@@ -0,0 +1,160 @@
+import bisect
+import functools
+import threading
+import time
+
+_BOUNDS = [1e-6 * 2 ** i for i in range(25)]
+
+
+class Instrumentation:
+    """This class represents a registry of per-call timings and counters of the public methods of GraphAlgo
+    and the mutations of DiGraph. While an instance is installed (see install), every call is timed and the
+    algorithms add their work counters to it (nodes settled, edges relaxed, heap pushes, stale pops, DFS stack
+    sizes, JSON characters parsed...). Every call is kept in a histogram of its method, and is also passed to
+    the callback, if one was given.
+    When no instance is installed the only cost is a single check of Instrumentation.active per call."""
+
+    active = None
+
+    def __init__(self, callback=None, histograms: bool = True):
+        """A constructor for the class.
+        @:param callback - a function called with (name, seconds, counters) after every measured call
+        @:param histograms - if False only the callback receives the calls"""
+        self._callback = callback
+        self._histograms = histograms
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def install(self):
+        """This method makes this instance the one which receives all the measured calls.
+        @:return Instrumentation - this instance"""
+        Instrumentation.active = self
+        return self
+
+    def uninstall(self) -> None:
+        """This method stops measuring the calls, if this instance is the installed one."""
+        if Instrumentation.active is self:
+            Instrumentation.active = None
+
+    def __enter__(self):
+        """Installs this instance for the duration of a with block."""
+        return self.install()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Uninstalls this instance at the end of a with block."""
+        self.uninstall()
+
+    @staticmethod
+    def counters():
+        """This method returns the counters of the innermost measured call of the current thread,
+        the algorithms add their work to it.
+        @:return dict - the counters by name, None if no call is being measured"""
+        active = Instrumentation.active
+        if active is None:
+            return None
+        stack = getattr(active._local, "stack", None)
+        return stack[-1] if stack else None
+
+    @staticmethod
+    def add(counters: dict, **values) -> None:
+        """This method adds values to counters.
+        @:param counters - dict, the counters returned by counters()
+        @:param values - the amount to add to every counter by its name"""
+        for name, value in values.items():
+            counters[name] = counters.get(name, 0) + value
+
+    def measure(self, name: str, method, args: tuple, kwargs: dict):
+        """This method calls a method and records its time and counters under name.
+        The counters of a measured call made inside another one are added to the outer call as well.
+        @:param name - the name of the method, e.g. "GraphAlgo.shortest_path"
+        @:param method - the method to call
+        @:param args - the positional arguments of the call
+        @:param kwargs - the keyword arguments of the call
+        @:return whatever the method returns"""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        counters = {}
+        stack.append(counters)
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                self.add(stack[-1], **counters)
+            self.record(name, seconds, counters)
+
+    def record(self, name: str, seconds: float, counters: dict) -> None:
+        """This method adds a single call to the histogram of its method and passes it to the callback.
+        @:param name - the name of the method
+        @:param seconds - the duration of the call
+        @:param counters - dict, the counters of the call"""
+        if self._histograms:
+            with self._lock:
+                stats = self._stats.get(name)
+                if stats is None:
+                    stats = self._stats[name] = {"calls": 0, "seconds": 0.0, "min": seconds, "max": seconds,
+                                                 "buckets": [0] * (len(_BOUNDS) + 1), "counters": {}}
+                stats["calls"] += 1
+                stats["seconds"] += seconds
+                stats["min"] = min(stats["min"], seconds)
+                stats["max"] = max(stats["max"], seconds)
+                stats["buckets"][bisect.bisect_left(_BOUNDS, seconds)] += 1
+                self.add(stats["counters"], **counters)
+        if self._callback is not None:
+            self._callback(name, seconds, counters)
+
+    def get_stats(self) -> dict:
+        """This method returns the histograms of all the measured methods.
+        @:return dict - by the name of the method: calls, total/min/max/mean seconds, the p50/p95/p99 upper
+        bounds from the histogram, the histogram as a list of (upper bound in seconds, calls) and the sum of
+        every counter"""
+        with self._lock:
+            result = {}
+            for name, stats in self._stats.items():
+                buckets = stats["buckets"]
+                histogram = [(_BOUNDS[i] if i < len(_BOUNDS) else float('inf'), count)
+                             for i, count in enumerate(buckets) if count]
+                summary = {"calls": stats["calls"], "seconds": stats["seconds"], "min": stats["min"],
+                           "max": stats["max"], "mean": stats["seconds"] / stats["calls"],
+                           "histogram": histogram, "counters": dict(stats["counters"])}
+                for q in (50, 95, 99):
+                    summary["p" + str(q)] = self._percentile(buckets, stats["calls"] * q / 100, stats["max"])
+                result[name] = summary
+            return result
+
+    def clear(self) -> None:
+        """This method drops all the recorded calls."""
+        with self._lock:
+            self._stats.clear()
+
+    @staticmethod
+    def _percentile(buckets: list, rank: float, maximum: float) -> float:
+        """This method returns the upper bound of the histogram bucket of a rank.
+        @:param buckets - list of the number of calls in every bucket
+        @:param rank - the number of calls which are at most the percentile
+        @:param maximum - the longest call, which bounds the last bucket
+        @:return float - the upper bound in seconds"""
+        seen = 0
+        for i, count in enumerate(buckets):
+            seen += count
+            if seen >= rank:
+                return min(_BOUNDS[i], maximum) if i < len(_BOUNDS) else maximum
+        return maximum
+
+
+def instrumented(method):
+    """A decorator for the public methods which are not wrapped by a lock decorator, the method is measured
+    while an Instrumentation is installed."""
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    def measured(*args, **kwargs):
+        active = Instrumentation.active
+        if active is None:
+            return method(*args, **kwargs)
+        return active.measure(name, method, args, kwargs)
+    return measured
@@ -0,0 +1,143 @@
+import json
+import re
+
+_FIRST_KEY = re.compile(r'\{\s*("(?:[^"\\]|\\.)*")\s*:')
+
+
+class JsonStream:
+    """This class represents an incremental reader of a JSON document whose top level is an object of arrays,
+    such as the graph files {"Edges": [...], "Nodes": [...]}, or of a sequence of JSON values such as
+    newline-delimited JSON (NDJSON) files.
+    The elements are decoded one by one from a bounded buffer, so the whole document
+    is never held in memory at once."""
+
+    def __init__(self, f, chunk_size: int = 1 << 16):
+        """A constructor for the class.
+        @:param f - a file object opened in text mode
+        @:param chunk_size - int, the number of characters read from the file at once"""
+        self._file = f
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._chars_read = 0
+        self._keys = []
+        self._decoder = json.JSONDecoder()
+
+    def get_chars_read(self) -> int:
+        """This method returns the number of characters read from the file so far.
+        @:return int - the number of characters read"""
+        return self._chars_read
+
+    def get_keys(self) -> list:
+        """This method returns the keys of the top level object which were read by items() so far.
+        @:return list - the keys in the order of the document"""
+        return self._keys
+
+    def first_key(self):
+        """This method returns the first key of the top level object without consuming anything.
+        Only the first few KB of the file are looked at.
+        @:return str - the first key, None if the document does not start with an object with a key"""
+        if self._peek() != "{":
+            return None
+        while True:
+            match = _FIRST_KEY.match(self._buffer, self._pos)
+            if match is not None:
+                return json.loads(match.group(1))
+            if len(self._buffer) - self._pos > 4096 or not self._fill():
+                return None
+
+    def at_end(self) -> bool:
+        """This method returns whether only whitespace is left in the file.
+        @:return True iff there are no more values"""
+        return self._peek() == ""
+
+    def values(self):
+        """This method iterates over a sequence of top level JSON values separated by whitespace,
+        such as the lines of an NDJSON file.
+        @:return a generator of the decoded values"""
+        while self._peek() != "":
+            yield self._decode()
+
+    def items(self):
+        """This method iterates over the elements of every array in the top level object.
+        Top level values which are not arrays are decoded and skipped.
+        @:return a generator of pairs (key, element), key is the name of the array the element belongs to"""
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._decode()
+            self._keys.append(key)
+            self._expect(":")
+            if self._peek() == "[":
+                self._pos += 1
+                if self._peek() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        yield key, self._decode()
+                        if self._peek() == ",":
+                            self._pos += 1
+                        else:
+                            self._expect("]")
+                            break
+            else:
+                self._decode()
+            if self._peek() == ",":
+                self._pos += 1
+            else:
+                self._expect("}")
+                return
+
+    def _fill(self) -> bool:
+        """This method reads the next chunk of the file into the buffer, dropping the consumed prefix.
+        @:return True iff more characters were read"""
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._chars_read += len(chunk)
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """This method skips whitespace and returns the next character without consuming it.
+        @:return str - the next character, "" at the end of the file"""
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str):
+        """This method consumes the next character, which must be char.
+        @:param char - str, the expected character"""
+        if self._peek() != char:
+            raise ValueError("expected '" + char + "' at character " + str(self._chars_read - len(self._buffer)
+                                                                            + self._pos))
+        self._pos += 1
+
+    def _decode(self):
+        """This method decodes the next JSON value, reading more of the file as long as the value is incomplete.
+        @:return the decoded value"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
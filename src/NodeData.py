@@ -3,7 +3,11 @@ from json.encoder import JSONEncoder
 
 
 class NodeData:
-    """This class represents an implementation of a vertex in a directed weighted graph."""
+    """This class represents an implementation of a vertex in a directed weighted graph.
+    The fields are kept in __slots__ instead of a per-instance __dict__, which cuts the memory of every node.
+    A node which belongs to a DiGraph knows its graph, so that moving the node is reported to the graph."""
+
+    __slots__ = ("_key", "_weight", "_location", "_info", "_tag", "_owner")
 
     def __init__(self, key: int = 0, weight: float = -1, location: tuple = None, info: str = "", tag: int = -1):
         """A constructor for the class.
@@ -17,6 +21,7 @@ class NodeData:
         self._location = location
         self._info = info
         self._tag = tag
+        self._owner = None
 
     def set_key(self, key: int):
         """"This method changes the key of the node
@@ -31,7 +36,10 @@ class NodeData:
     def set_location(self, location: tuple):
         """"This method changes the location of the node
         @:param location - tuple representing the pos of a node as a 3D Point """
-        self._location = location
+        if self._owner is None:
+            self._location = location
+        else:
+            self._owner._move_node(self._key, location)
 
     def set_info(self, info: str):
         """"This method changes the info of the node
@@ -90,6 +98,18 @@ class NodeData:
         tag_flag=other.get_tag() == self._tag
         return key_flag and weight_flag and info_flag and location_flag
 
+    def __getstate__(self) -> dict:
+        """This method returns the state of this node for pickling, without the graph it belongs to.
+        @:return dict - the state of this node"""
+        return {field: getattr(self, field) for field in NodeData.__slots__ if field != "_owner"}
+
+    def __setstate__(self, state: dict):
+        """This method restores the state of an unpickled node.
+        @:param state - dict, the state returned by __getstate__"""
+        for field, value in state.items():
+            setattr(self, field, value)
+        self._owner = None
+
     def __lt__(self, other):
         return self._weight-other.get_weight()
 
@@ -98,5 +118,7 @@ class NodeData:
         def default(self, o) -> dict:
             """This method returns the dictionary of an object.
             @:return the dicionary of the object o"""
+            if isinstance(o, NodeData):
+                return {field: getattr(o, field) for field in NodeData.__slots__ if field != "_owner"}
             return o.__dict__
 
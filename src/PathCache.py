@@ -0,0 +1,144 @@
+import sys
+import threading
+from collections import OrderedDict
+from Dijkstra import path_to
+
+
+class PathCache:
+    """This class represents an LRU cache of shortest paths, used by GraphAlgo.shortest_path.
+    The cache holds two kinds of entries: the result of a query keyed by (id1, id2), and the full
+    single source shortest path tree of id1 keyed by (id1, None), which answers every later query from id1.
+    All the entries are tagged with the graph and its MC, the cache is cleared as soon as the MC moves.
+    The size of the cache is bounded both by the number of entries and by an estimate of their size in bytes."""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 << 20):
+        """A constructor for the class.
+        @:param max_entries - int, the maximal number of entries (paths and trees) in the cache
+        @:param max_bytes - int, the maximal estimated size of all the entries in bytes"""
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._graph = None
+        self._mc = -1
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def get_path(self, graph, id1: int, id2: int):
+        """This method returns a cached shortest path, from the cached query or from the cached tree of id1.
+        @:param graph - GraphInterface, the graph the query is asked on
+        @:param id1 - The start node id
+        @:param id2 - The end node id
+        @:return (distance, path) if the path is cached, None o.w."""
+        with self._lock:
+            self._validate(graph)
+            entry = self._entries.get((id1, id2))
+            if entry is not None:
+                self._entries.move_to_end((id1, id2))
+                self._hits += 1
+                dist, path = entry[0]
+                return dist, list(path)
+            entry = self._entries.get((id1, None))
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end((id1, None))
+            self._hits += 1
+        return self._path_from_tree(entry[0], id2)
+
+    def put_tree(self, graph, src: int, frozen, dist: dict, prev: dict) -> None:
+        """This method caches the single source shortest path tree of src.
+        @:param graph - GraphInterface, the graph the tree was computed on
+        @:param src - The source node id
+        @:param frozen - CSRGraph whose dense indices are the nodes of the tree, None if the nodes are node ids
+        @:param dist - dict, the distance of every reached node
+        @:param prev - dict, the predecessor of every reached node"""
+        size = sys.getsizeof(dist) + sys.getsizeof(prev) + 56 * len(dist)
+        root = src if frozen is None else frozen.index_of(src)
+        self._put(graph, (src, None), (frozen, root, dist, prev), size)
+
+    def put_tree_path(self, graph, src: int, frozen, dist: dict, prev: dict, id2: int) -> (float, list):
+        """This method caches the single source shortest path tree of src (see put_tree) and extracts from it
+        the shortest path to id2, so a miss of get_path is answered without caching the path a second time.
+        @:param graph - GraphInterface, the graph the tree was computed on
+        @:param src - The source node id
+        @:param frozen - CSRGraph whose dense indices are the nodes of the tree, None if the nodes are node ids
+        @:param dist - dict, the distance of every reached node
+        @:param prev - dict, the predecessor of every reached node
+        @:param id2 - The end node id
+        @:return The distance of the path, a list of the nodes ids that the path goes through"""
+        self.put_tree(graph, src, frozen, dist, prev)
+        root = src if frozen is None else frozen.index_of(src)
+        return self._path_from_tree((frozen, root, dist, prev), id2)
+
+    def put_path(self, graph, id1: int, id2: int, dist: float, path: list) -> None:
+        """This method caches the result of a shortest path query.
+        @:param graph - GraphInterface, the graph the query was asked on
+        @:param id1 - The start node id
+        @:param id2 - The end node id
+        @:param dist - The distance of the path
+        @:param path - The list of the nodes ids of the path"""
+        size = sys.getsizeof(path) + 28 * len(path) + 64
+        self._put(graph, (id1, id2), (dist, list(path)), size)
+
+    def clear(self) -> None:
+        """This method removes all the entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> dict:
+        """This method returns the counters of the cache.
+        @:return dict - hits, misses, evictions, invalidations, the number of entries and their estimated bytes"""
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "evictions": self._evictions,
+                    "invalidations": self._invalidations, "entries": len(self._entries), "bytes": self._bytes}
+
+    def _put(self, graph, key: tuple, value: tuple, size: int) -> None:
+        """This method adds an entry to the cache and evicts the least recently used entries
+        until the cache is within its bounds. An entry larger than max_bytes is not cached.
+        @:param graph - GraphInterface, the graph the entry belongs to
+        @:param key - tuple, the key of the entry
+        @:param value - tuple, the cached value
+        @:param size - int, the estimated size of the entry in bytes"""
+        if size > self._max_bytes or self._max_entries <= 0:
+            return
+        with self._lock:
+            self._validate(graph)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[1]
+                self._evictions += 1
+
+    def _validate(self, graph) -> None:
+        """This method clears the cache if the graph or its MC changed since the entries were cached,
+        the caller must hold the lock of the cache.
+        @:param graph - GraphInterface, the graph of the current query"""
+        if graph is not self._graph or graph.get_mc() != self._mc:
+            if self._entries:
+                self._invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+            self._graph = graph
+            self._mc = graph.get_mc()
+
+    @staticmethod
+    def _path_from_tree(tree: tuple, id2: int) -> (float, list):
+        """This method extracts the shortest path to id2 from a cached tree.
+        @:param tree - (frozen, src, dist, prev), the nodes of the tree are dense indices of frozen (None if they
+        are node ids) and src is its root
+        @:param id2 - The end node id
+        @:return The distance of the path, a list of the nodes ids that the path goes through"""
+        frozen, src, dist, prev = tree
+        dst = id2 if frozen is None else frozen.index_of(id2)
+        if dst is None or dst not in dist:
+            return float('inf'), []
+        return dist[dst], path_to(prev, src, dst, None if frozen is None else frozen.key_of)
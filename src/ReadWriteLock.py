@@ -0,0 +1,81 @@
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """This class represents a lock which is held either by many readers or by a single writer.
+    Waiting writers are preferred over new readers, so a steady stream of queries cannot starve mutations.
+    A thread may re-acquire the read lock it holds, and the writer may re-acquire both locks,
+    but a reader may not upgrade to the write lock."""
+
+    def __init__(self):
+        """A constructor for the class."""
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    def acquire_read(self):
+        """This method acquires the lock for reading, blocking while a writer holds or waits for the lock."""
+        depth = getattr(self._local, "depth", 0)
+        if depth == 0:
+            self._local.registered = self._writer != threading.get_ident()
+            if self._local.registered:
+                with self._condition:
+                    while self._writer is not None or self._writers_waiting > 0:
+                        self._condition.wait()
+                    self._readers += 1
+        self._local.depth = depth + 1
+
+    def release_read(self):
+        """This method releases the lock acquired by acquire_read."""
+        self._local.depth -= 1
+        if self._local.depth == 0 and self._local.registered:
+            with self._condition:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._condition.notify_all()
+
+    def acquire_write(self):
+        """This method acquires the lock for writing, blocking until there are no readers and no other writer."""
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return
+        if getattr(self._local, "depth", 0) > 0:
+            raise RuntimeError("cannot acquire the write lock while holding the read lock")
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writer is not None or self._readers > 0:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        """This method releases the lock acquired by acquire_write."""
+        with self._condition:
+            self._write_depth -= 1
+            if self._write_depth == 0:
+                self._writer = None
+                self._condition.notify_all()
+
+    @contextmanager
+    def reading(self):
+        """This method returns a context manager which holds the lock for reading."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def writing(self):
+        """This method returns a context manager which holds the lock for writing."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -0,0 +1,159 @@
+import heapq
+from Dijkstra import path_to
+from GraphListener import GraphListener
+
+
+class ShortestPathTree(GraphListener):
+    """This class represents a single source shortest path tree of a DiGraph which is repaired under changes
+    of the graph, in the style of Ramalingam and Reps, instead of being recomputed from scratch.
+    When an edge gets cheaper (or is added) the improvement is propagated from its end node only.
+    When a tree edge gets more expensive (or is removed) only the subtree below it is detached, every
+    detached node takes its best distance through the nodes outside the subtree, and Dijkstra's algorithm
+    continues from there."""
+
+    def __init__(self, graph, src: int):
+        """A constructor for the class, computes the tree and registers as a listener of the graph.
+        @:param graph - DiGraph, the graph, a read-only graph (GraphView, CSRGraph) raises ValueError
+        @:param src - The source node id"""
+        if not hasattr(graph, "add_listener"):
+            raise ValueError("a read-only graph cannot be tracked: " + type(graph).__name__)
+        self._graph = graph
+        self._src = src
+        self._dist = {}
+        self._parent = {}
+        self._children = {}
+        with graph.get_lock().writing():
+            if src in graph.get_all_v():
+                self._dist[src] = 0.0
+                self._parent[src] = None
+                self._propagate([(0.0, src)])
+            graph.add_listener(self)
+
+    def get_graph(self):
+        """This method returns the graph of the tree.
+        @:return DiGraph - the graph"""
+        return self._graph
+
+    def get_src(self) -> int:
+        """This method returns the source of the tree.
+        @:return int - the source node id"""
+        return self._src
+
+    def close(self) -> None:
+        """This method stops maintaining the tree."""
+        self._graph.remove_listener(self)
+
+    def distance(self, node_id: int) -> float:
+        """This method returns the distance from the source to a node.
+        @:param node_id - The node id
+        @:return float - the distance, inf if the node is unreachable"""
+        return self._dist.get(node_id, float('inf'))
+
+    def path(self, node_id: int) -> list:
+        """This method returns the shortest path from the source to a node.
+        @:param node_id - The node id
+        @:return list - the nodes ids of the path, an empty list if the node is unreachable"""
+        if node_id not in self._dist:
+            return []
+        return path_to(self._parent, self._src, node_id)
+
+    def get_distances(self) -> dict:
+        """This method returns the distances of all the reachable nodes, the dictionary must not be changed.
+        @:return dict - the distance of every reachable node"""
+        return self._dist
+
+    def edge_added(self, id1: int, id2: int, weight: float) -> None:
+        """A new edge can only shorten distances."""
+        self._decrease(id1, id2, weight)
+
+    def edge_removed(self, id1: int, id2: int, weight: float) -> None:
+        """Only removing a tree edge changes distances."""
+        if self._parent.get(id2, id2) == id1:
+            self._increase(id2)
+
+    def edge_weight_changed(self, id1: int, id2: int, old_weight: float, weight: float) -> None:
+        """A cheaper edge may shorten distances, a more expensive tree edge may lengthen them."""
+        if weight < old_weight:
+            self._decrease(id1, id2, weight)
+        elif self._parent.get(id2, id2) == id1:
+            self._increase(id2)
+
+    def node_added(self, node_id: int) -> None:
+        """A new node has no edges yet, so only the source (added after the tree, or added back) joins the tree."""
+        if node_id == self._src:
+            self._dist[node_id] = 0.0
+            self._parent[node_id] = None
+
+    def node_removed(self, node_id: int) -> None:
+        """A removed node has no edges left, so it is unreachable unless it is the source."""
+        if node_id == self._src:
+            self._dist.clear()
+            self._parent.clear()
+            self._children.clear()
+
+    def _set_parent(self, node_id: int, parent: int) -> None:
+        """This method moves a node under a new parent in the tree.
+        @:param node_id - The node id
+        @:param parent - The new parent node id"""
+        old = self._parent.get(node_id)
+        if old is not None:
+            self._children[old].discard(node_id)
+        self._parent[node_id] = parent
+        self._children.setdefault(parent, set()).add(node_id)
+
+    def _decrease(self, id1: int, id2: int, weight: float) -> None:
+        """This method propagates the improvement of the edge id1 -> id2.
+        @:param id1 - The start node of the edge
+        @:param id2 - The end node of the edge
+        @:param weight - The weight of the edge"""
+        if id1 not in self._dist:
+            return
+        new_dist = self._dist[id1] + weight
+        if new_dist < self._dist.get(id2, float('inf')):
+            self._dist[id2] = new_dist
+            self._set_parent(id2, id1)
+            self._propagate([(new_dist, id2)])
+
+    def _increase(self, node_id: int) -> None:
+        """This method repairs the subtree of a node whose tree edge got more expensive or was removed.
+        @:param node_id - The root of the subtree"""
+        affected = [node_id]
+        for u in affected:
+            affected.extend(self._children.pop(u, ()))
+        detached = set(affected)
+        parent = self._parent[node_id]
+        if parent is not None:
+            self._children[parent].discard(node_id)
+        for u in affected:
+            del self._dist[u]
+            del self._parent[u]
+        heap = []
+        for u in affected:
+            best = float('inf')
+            best_parent = None
+            for src, weight in self._graph.all_in_edges_of_node(u).items():
+                if src not in detached and src in self._dist and self._dist[src] + weight < best:
+                    best = self._dist[src] + weight
+                    best_parent = src
+            if best_parent is not None:
+                self._dist[u] = best
+                self._set_parent(u, best_parent)
+                heap.append((best, u))
+        heapq.heapify(heap)
+        self._propagate(heap)
+
+    def _propagate(self, heap: list) -> None:
+        """This method runs Dijkstra's algorithm from the nodes in the heap, relaxing only improving edges.
+        @:param heap - list, a heap of (distance, node id)"""
+        dist = self._dist
+        out_edges = self._graph.all_out_edges_of_node
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist.get(u, float('inf')):
+                continue
+            for v, w in out_edges(u).items():
+                new_dist = d + w
+                if new_dist < dist.get(v, float('inf')):
+                    dist[v] = new_dist
+                    self._set_parent(v, u)
+                    heapq.heappush(heap, (new_dist, v))
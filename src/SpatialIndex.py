@@ -0,0 +1,217 @@
+import math
+import numpy as np
+from GraphListener import GraphListener
+
+_NODES_PER_CELL = 2
+
+
+class SpatialIndex(GraphListener):
+    """This class represents a uniform grid over the (x, y) locations of the nodes of a DiGraph, for snapping
+    a point to its nearest node and for bounding box and radius lookups. The z coordinate is ignored.
+    The grid is a listener of the graph, so it is updated by add_node, remove_node and NodeData.set_location,
+    and the size of its cells is chosen again whenever the number of located nodes changed by a factor of 4.
+    A cell holds a couple of nodes on average, so a lookup scans only the few cells around the query,
+    whatever the size of the graph, as long as the nodes are spread evenly.
+    The bounding box of the locations is cached as well."""
+
+    def __init__(self, graph):
+        """A constructor for the class, indexes the located nodes of the graph and registers as its listener.
+        @:param graph - DiGraph, the graph to index"""
+        self._graph = graph
+        self._points = {}
+        self._cells = {}
+        self._cell_size = 1.0
+        self._built_size = 0
+        self._bounds = None
+        with graph.get_lock().writing():
+            for key, node in graph.get_all_v().items():
+                location = node.get_location()
+                if location is not None:
+                    self._points[key] = (float(location[0]), float(location[1]))
+            self._rebuild()
+            graph.add_listener(self)
+
+    def get_graph(self):
+        """This method returns the indexed graph.
+        @:return DiGraph - the graph"""
+        return self._graph
+
+    def close(self) -> None:
+        """This method stops indexing the graph."""
+        self._graph.remove_listener(self)
+
+    def size(self) -> int:
+        """This method returns the number of indexed nodes, which are the nodes with a location.
+        @:return int - the number of indexed nodes"""
+        return len(self._points)
+
+    def get_bounds(self):
+        """This method returns the bounding box of the locations, it is cached and recomputed only after
+        a node on its border was removed or moved.
+        @:return tuple - (min_x, min_y, max_x, max_y), None if no node has a location"""
+        if self._bounds is None and self._points:
+            xy = np.array(list(self._points.values()))
+            low = xy.min(axis=0)
+            high = xy.max(axis=0)
+            self._bounds = (float(low[0]), float(low[1]), float(high[0]), float(high[1]))
+        return self._bounds
+
+    def nearest(self, x: float, y: float) -> (int, float):
+        """This method finds the node nearest to a point.
+        The rings of cells around the cell of the point are scanned outwards, until the nearest node found
+        so far is closer than any cell which was not scanned yet.
+        @:param x - float, the x of the point
+        @:param y - float, the y of the point
+        @:return (node_id, distance) - the nearest node and its distance, (None, inf) if no node has a location"""
+        if not self._points:
+            return None, float('inf')
+        size = self._cell_size
+        min_x, min_y, max_x, max_y = self.get_bounds()
+        cx, cy = self._cell_of(x, y)
+        low_x, low_y = self._cell_of(min_x, min_y)
+        high_x, high_y = self._cell_of(max_x, max_y)
+        # the rings are clipped to the cells of the bounding box, the first ring which can hold a node is
+        # the one which reaches the box, and the last one is the one which covers it
+        box = (low_x, low_y, high_x, high_y)
+        ring = max(low_x - cx, cx - high_x, low_y - cy, cy - high_y, 0)
+        last = max(cx - low_x, high_x - cx, cy - low_y, high_y - cy)
+        best_key = None
+        best = float('inf')
+        cells = self._cells
+        points = self._points
+        while ring <= last:
+            for cell in self._ring(cx, cy, ring, box):
+                for key in cells.get(cell, ()):
+                    px, py = points[key]
+                    distance = math.hypot(px - x, py - y)
+                    if distance < best:
+                        best_key, best = key, distance
+            if best <= ring * size:
+                break
+            ring += 1
+        return best_key, best
+
+    def within_box(self, min_x: float, min_y: float, max_x: float, max_y: float) -> list:
+        """This method finds the nodes located inside a bounding box, borders included.
+        @:param min_x - float, the smallest x of the box
+        @:param min_y - float, the smallest y of the box
+        @:param max_x - float, the largest x of the box
+        @:param max_y - float, the largest y of the box
+        @:return list - the IDs of the nodes in the box"""
+        if min_x > max_x or min_y > max_y or not self._points:
+            return []
+        low_x, low_y = self._cell_of(min_x, min_y)
+        high_x, high_y = self._cell_of(max_x, max_y)
+        if (high_x - low_x + 1) * (high_y - low_y + 1) > len(self._cells):
+            cells = [keys for (cx, cy), keys in self._cells.items()
+                     if low_x <= cx <= high_x and low_y <= cy <= high_y]
+        else:
+            cells = [self._cells[cell] for cell in ((cx, cy) for cx in range(low_x, high_x + 1)
+                                                    for cy in range(low_y, high_y + 1)) if cell in self._cells]
+        points = self._points
+        result = []
+        for keys in cells:
+            for key in keys:
+                px, py = points[key]
+                if min_x <= px <= max_x and min_y <= py <= max_y:
+                    result.append(key)
+        return result
+
+    def within_radius(self, x: float, y: float, radius: float) -> list:
+        """This method finds the nodes located within a distance of a point.
+        @:param x - float, the x of the point
+        @:param y - float, the y of the point
+        @:param radius - float, the largest distance
+        @:return list - pairs (node_id, distance) of the nodes within the radius, nearest first"""
+        points = self._points
+        result = []
+        for key in self.within_box(x - radius, y - radius, x + radius, y + radius):
+            px, py = points[key]
+            distance = math.hypot(px - x, py - y)
+            if distance <= radius:
+                result.append((key, distance))
+        result.sort(key=lambda pair: pair[1])
+        return result
+
+    def node_added(self, node_id: int) -> None:
+        """A new node is indexed if it has a location."""
+        location = self._graph.get_all_v()[node_id].get_location()
+        if location is not None:
+            self._insert(node_id, float(location[0]), float(location[1]))
+
+    def node_removed(self, node_id: int) -> None:
+        """A removed node leaves the index."""
+        self._discard(node_id)
+
+    def node_moved(self, node_id: int, old_location: tuple, location: tuple) -> None:
+        """A moved node is indexed again at its new location."""
+        self._discard(node_id)
+        if location is not None:
+            self._insert(node_id, float(location[0]), float(location[1]))
+
+    def _cell_of(self, x: float, y: float) -> tuple:
+        """This method returns the grid cell of a point.
+        @:return (cx, cy) - the column and the row of the cell"""
+        return math.floor(x / self._cell_size), math.floor(y / self._cell_size)
+
+    @staticmethod
+    def _ring(cx: int, cy: int, ring: int, box: tuple):
+        """This method generates the cells at a Chebyshev distance of exactly ring cells from a cell,
+        which are inside a box of cells.
+        @:param box - (low_x, low_y, high_x, high_y), the first and the last column and row of the box
+        @:return a generator of the cells (cx, cy)"""
+        low_x, low_y, high_x, high_y = box
+        columns = range(max(cx - ring, low_x), min(cx + ring, high_x) + 1)
+        for row in {cy - ring, cy + ring}:
+            if low_y <= row <= high_y:
+                for column in columns:
+                    yield column, row
+        rows = range(max(cy - ring + 1, low_y), min(cy + ring - 1, high_y) + 1)
+        for column in {cx - ring, cx + ring} if ring > 0 else ():
+            if low_x <= column <= high_x:
+                for row in rows:
+                    yield column, row
+
+    def _insert(self, key: int, x: float, y: float) -> None:
+        """This method adds a located node to the grid and to the cached bounds."""
+        self._points[key] = (x, y)
+        self._cells.setdefault(self._cell_of(x, y), set()).add(key)
+        bounds = self._bounds
+        if bounds is not None:
+            self._bounds = (min(bounds[0], x), min(bounds[1], y), max(bounds[2], x), max(bounds[3], y))
+        if len(self._points) > 4 * max(self._built_size, 16):
+            self._rebuild()
+
+    def _discard(self, key: int) -> None:
+        """This method removes a node from the grid, the cached bounds are dropped if it was on their border."""
+        point = self._points.pop(key, None)
+        if point is None:
+            return
+        cell = self._cell_of(*point)
+        keys = self._cells[cell]
+        keys.discard(key)
+        if not keys:
+            del self._cells[cell]
+        bounds = self._bounds
+        if bounds is not None and (point[0] in (bounds[0], bounds[2]) or point[1] in (bounds[1], bounds[3])):
+            self._bounds = None
+        if self._built_size > 16 and 4 * len(self._points) < self._built_size:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """This method chooses the size of the cells for the current locations and fills the grid again."""
+        self._bounds = None
+        self._built_size = len(self._points)
+        bounds = self.get_bounds()
+        if bounds is None:
+            self._cells = {}
+            return
+        width = bounds[2] - bounds[0]
+        height = bounds[3] - bounds[1]
+        n = len(self._points)
+        size = max(math.sqrt(width * height * _NODES_PER_CELL / n), max(width, height) * _NODES_PER_CELL / n)
+        self._cell_size = size if size > 0 else 1.0
+        cells = {}
+        for key, (x, y) in self._points.items():
+            cells.setdefault(self._cell_of(x, y), set()).add(key)
+        self._cells = cells
@@ -0,0 +1,54 @@
+from Instrumentation import Instrumentation
+
+
+def tarjan(nodes, edges_of, counters: dict = None) -> dict:
+    """This function runs an iterative version of Tarjan's algorithm, in O(|V|+|E|) and without recursion.
+    @:param nodes - an iterable of all the nodes of the graph
+    @:param edges_of - a function which returns an iterable of pairs (neighbour, weight) of a node
+    @:param counters - dict, if given the visited nodes, the SCCs and the largest DFS stack are added to it
+    @:return dict - the number of the SCC of every node, SCCs are numbered in reverse topological order"""
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    component = {}
+    count = 0
+    max_stack = 0
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(edges_of(root)))]
+        while work:
+            u, neighbours = work[-1]
+            descended = False
+            for v, w in neighbours:
+                if v not in index:
+                    index[v] = low[v] = len(index)
+                    stack.append(v)
+                    on_stack.add(v)
+                    work.append((v, iter(edges_of(v))))
+                    descended = True
+                    break
+                if v in on_stack and index[v] < low[u]:
+                    low[u] = index[v]
+            if descended:
+                continue
+            work.pop()
+            if work and low[u] < low[work[-1][0]]:
+                low[work[-1][0]] = low[u]
+            if low[u] == index[u]:
+                max_stack = max(max_stack, len(stack))
+                while True:
+                    v = stack.pop()
+                    on_stack.discard(v)
+                    component[v] = count
+                    if v == u:
+                        break
+                count += 1
+    if counters is not None:
+        Instrumentation.add(counters, nodes_visited=len(index), components=count)
+        counters["dfs_max_stack"] = max(counters.get("dfs_max_stack", 0), max_stack)
+    return component
@@ -0,0 +1,71 @@
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from AsyncGraphAlgo import AsyncGraphAlgo
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+
+
+class TestAsyncGraphAlgo(TestCase):
+
+    def setUp(self) -> None:
+        self.graph = DiGraph()
+        for i in range(1, 6):
+            self.graph.add_node(i)
+        for i in range(4):
+            self.graph.add_edge(i + 1, i + 2, i + 1)
+        self.graph_algo = GraphAlgo(self.graph)
+
+    def test_coalesced_shortest_path(self):
+        async def run():
+            async with AsyncGraphAlgo(self.graph_algo, max_in_flight=1) as algo:
+                results = await asyncio.gather(*(algo.shortest_path(src, dst) for src in (1, 2) for dst in range(1, 6)))
+                self.assertEqual(2, algo.get_stats()["searches"])
+                self.assertEqual((float('inf'), []), await algo.shortest_path(2, 1))
+                self.assertEqual(3, algo.get_stats()["searches"])
+                return results
+        results = asyncio.run(run())
+        self.assertEqual([self.graph_algo.shortest_path(src, dst) for src in (1, 2) for dst in range(1, 6)], results)
+
+    def test_call_and_mutate(self):
+        async def run():
+            algo = AsyncGraphAlgo(self.graph_algo)
+            self.assertEqual([3], await algo.call("connected_component", 3))
+            self.assertTrue(await algo.mutate(lambda graph, weight: graph.add_edge(5, 1, weight), 2))
+            self.assertEqual([1, 2, 3, 4, 5], sorted(await algo.call("connected_component", 3)))
+            self.assertEqual((2, [5, 1]), await algo.shortest_path(5, 1))
+            with self.assertRaises(ValueError):
+                await algo.call("shortest_path", 1, 2, "unknown")
+            algo.close()
+        asyncio.run(run())
+        self.assertRaises(ValueError, AsyncGraphAlgo, self.graph_algo, None, 0)
+
+    def test_concurrent_mutations(self):
+        rnd = random.Random(5)
+        for i in range(6, 200):
+            self.graph.add_node(i)
+            self.graph.add_edge(i - 1, i, rnd.randint(1, 9))
+
+        async def run():
+            with ThreadPoolExecutor(8) as executor:
+                algo = AsyncGraphAlgo(self.graph_algo, executor, max_in_flight=8)
+
+                def reweigh(graph):
+                    # the two changes keep the distance from 1 to 199, a query must never see only one of them
+                    total = graph.all_out_edges_of_node(1)[2] + graph.all_out_edges_of_node(2)[3]
+                    weight = rnd.randint(1, total - 1)
+                    graph.update_edge_weight(1, 2, weight)
+                    graph.update_edge_weight(2, 3, total - weight)
+                expected = (await algo.shortest_path(1, 199))[0]
+                tasks = [algo.shortest_path(rnd.randrange(1, 3), 199) for _ in range(100)]
+                tasks += [algo.mutate(reweigh) for _ in range(20)]
+                rnd.shuffle(tasks)
+                results = await asyncio.gather(*tasks)
+                paths = [result for result in results if result is not None]
+                self.assertEqual(100, len(paths))
+                for dist, path in paths:
+                    if path[0] == 1:
+                        self.assertEqual(expected, dist)
+        asyncio.run(run())
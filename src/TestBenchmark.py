@@ -0,0 +1,32 @@
+import contextlib
+import io
+from unittest import TestCase
+
+import Benchmark
+
+
+class TestBenchmark(TestCase):
+
+    def test_generators(self):
+        for name, generator in Benchmark.GENERATORS.items():
+            graph = generator(400, 7)
+            self.assertEqual(400, graph.v_size())
+            self.assertTrue(graph.e_size() > 400)
+            self.assertEqual(str(graph), str(generator(400, 7)))
+            self.assertNotEqual(str(graph), str(generator(400, 8)))
+        self.assertEqual(4 * 19 * 20, Benchmark.grid_graph(400).e_size())
+
+    def test_run_and_compare(self):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            report = Benchmark.run(["grid"], [100], queries=4, mutations=20, plot=False, isolate=False)
+            Benchmark.run(["grid"], [30], queries=1, mutations=1, plot=False, isolate=False, verbose=True)
+        self.assertEqual("grid 30", stderr.getvalue().split(":")[0])
+        case = report["results"][0]
+        self.assertEqual(("grid", 100, 360), (case["generator"], case["nodes"], case["edges"]))
+        self.assertEqual(4, case["timings"]["shortest_path_dijkstra"]["calls"])
+        self.assertNotIn("plot_graph", case["timings"])
+        self.assertEqual([], Benchmark.compare(report, report))
+        slower = {"results": [dict(case, timings={"load_from_json": {"seconds": 1e9}})]}
+        self.assertEqual([], Benchmark.compare(report, slower))
+        self.assertEqual(["load_from_json"], [row[2] for row in Benchmark.compare(slower, report)])
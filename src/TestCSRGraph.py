@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from DiGraph import DiGraph
+from CSRGraph import CSRGraph
+
+
+class TestCSRGraph(TestCase):
+
+    def setUp(self) -> None:
+        self.graph = DiGraph()
+        for i in range(1, 6):
+            self.graph.add_node(i, (i, i, i))
+        for i in range(4):
+            self.graph.add_edge(i + 1, i + 2, i + 1)
+        self.graph.add_edge(5, 1, 2.5)
+
+    def test_sizes(self):
+        frozen = CSRGraph(self.graph)
+        self.assertEqual(5, frozen.v_size())
+        self.assertEqual(5, frozen.e_size())
+        self.assertEqual(self.graph.get_mc(), frozen.get_mc())
+        self.assertEqual(0, CSRGraph(DiGraph()).v_size())
+
+    def test_edges(self):
+        frozen = CSRGraph(self.graph)
+        i = frozen.index_of(5)
+        self.assertEqual(5, frozen.key_of(i))
+        out = [(frozen.key_of(j), w) for j, w in frozen.out_edges(i)]
+        self.assertEqual([(1, 2.5)], out)
+        into = [(frozen.key_of(j), w) for j, w in frozen.in_edges(i)]
+        self.assertEqual([(4, 4.0)], into)
+        self.assertIsNone(frozen.index_of(10))
+
+    def test_freeze(self):
+        frozen = self.graph.freeze()
+        self.assertIs(frozen, self.graph.freeze())
+        self.assertIs(frozen, self.graph.get_frozen())
+        self.assertTrue(frozen.is_fresh(self.graph))
+        self.graph.remove_edge(5, 1)
+        self.assertFalse(frozen.is_fresh(self.graph))
+        self.assertIsNone(self.graph.get_frozen())
+        self.assertEqual(4, self.graph.freeze().e_size())
+
+    def test_2d_positions(self):
+        self.graph.add_node(6, (6, 7))
+        self.graph.add_node(7)
+        frozen = self.graph.freeze()
+        self.assertEqual([6, 7, 0], frozen.get_positions()[frozen.index_of(6)].tolist())
+        self.assertTrue((frozen.get_positions()[frozen.index_of(7)] != frozen.get_positions()[frozen.index_of(7)]).all())
+        self.assertEqual((1, 1, 1), frozen.get_all_v()[1].get_location())
@@ -1,6 +1,11 @@
+import pickle
+import threading
 from unittest import TestCase
 
+import numpy as np
+
 from DiGraph import DiGraph
+from GraphListener import GraphListener
 
 
 class TestDiGraph(TestCase):
@@ -123,3 +128,113 @@ class TestDiGraph(TestCase):
         self.assertIsNone(self.graph.all_out_edges_of_node(1).get(3))
         self.assertFalse(self.graph.remove_edge(1,3))
 
+
+    def test_add_nodes_from(self):
+        mc = self.graph.get_mc()
+        self.assertEqual([1, 3], self.graph.add_nodes_from([6, 1, (7, (7, 7, 7)), (6, None)]))
+        self.assertEqual(mc + 1, self.graph.get_mc())
+        self.assertEqual((7, 7, 7), self.graph.get_all_v()[7].get_location())
+        self.assertEqual([0], self.graph.add_nodes_from([1]))
+        self.assertEqual(mc + 1, self.graph.get_mc())
+        self.assertEqual([1], self.graph.add_nodes_from(np.arange(8, 11)[[0, 0, 1, 2]]))
+        self.assertEqual({int}, {type(key) for key in self.graph.get_all_v()})
+
+    def test_add_edges_from(self):
+        mc = self.graph.get_mc()
+        rejected = self.graph.add_edges_from([(5, 1, 2), (1, 1, 3), (2, 4, -1), (1, 2, 5), (1, 9, 1), (3, 1, 1.5)])
+        self.assertEqual([1, 2, 3, 4], rejected)
+        self.assertEqual(mc + 1, self.graph.get_mc())
+        self.assertEqual(6, self.graph.e_size())
+        self.assertEqual(1.5, self.graph.all_in_edges_of_node(1)[3])
+        rejected = self.graph.add_edges_from(np.array([[1, 3, 1], [2, 2, 1], [4, 1, 0], [2, 1, 2.5], [1, 3, 2]]))
+        self.assertEqual([1, 2, 4], rejected)
+        self.assertEqual(2.5, self.graph.all_out_edges_of_node(2)[1])
+        self.assertEqual(8, self.graph.e_size())
+        self.assertEqual(mc + 2, self.graph.get_mc())
+
+    def test_remove_edges_from(self):
+        mc = self.graph.get_mc()
+        self.assertEqual([1, 3], self.graph.remove_edges_from([(1, 2), (2, 1), (3, 4), (9, 1)]))
+        self.assertEqual(2, self.graph.e_size())
+        self.assertEqual(mc + 1, self.graph.get_mc())
+        self.assertIsNone(self.graph.all_in_edges_of_node(2).get(1))
+        self.assertEqual([1], self.graph.remove_edges_from(np.array([[2, 3, 2], [2, 3, 2]])))
+        self.assertEqual(1, self.graph.e_size())
+
+    def test_bulk_errors(self):
+        mc = self.graph.get_mc()
+        self.graph.freeze()
+        self.assertRaises(ValueError, self.graph.add_edges_from, [(5, 1, 1.0), (1, 3)])
+        self.assertEqual(1.0, self.graph.all_out_edges_of_node(5)[1])
+        self.assertEqual(mc + 1, self.graph.get_mc())
+        self.assertIsNone(self.graph.get_frozen())
+        self.assertRaises(TypeError, self.graph.add_nodes_from, [7, [8, None]])
+        self.assertIn(7, self.graph.get_all_v())
+        self.assertEqual(mc + 2, self.graph.get_mc())
+        self.assertRaises(TypeError, self.graph.remove_edges_from, [(5, 1), 3])
+        self.assertNotIn(1, self.graph.all_out_edges_of_node(5))
+        self.assertEqual((4, mc + 3), (self.graph.e_size(), self.graph.get_mc()))
+        self.assertEqual([0], self.graph.add_edges_from(np.array([[1.5, 3, 1], [1, 3, 1]])))
+        self.assertEqual({2: 1, 3: 1.0}, self.graph.all_out_edges_of_node(1))
+        self.assertEqual([0], self.graph.remove_edges_from(np.array([[1.5, 3], [1, 3]])))
+        self.assertEqual([0, 2], self.graph.add_nodes_from(np.array([9.5, 10, np.nan])))
+        self.assertIn(10, self.graph.get_all_v())
+        self.assertRaises(ValueError, self.graph.add_nodes_from, np.array(["a"]))
+
+    def test_remove_nodes_from(self):
+        self.graph.add_edge(4, 2, 1)
+        self.graph.add_edge(5, 1, 1)
+        mc = self.graph.get_mc()
+        self.assertEqual(4, self.graph.remove_nodes_from([2, 3, 9, 2]))
+        self.assertEqual(mc + 1, self.graph.get_mc())
+        self.assertEqual([1, 4, 5], sorted(self.graph.get_all_v()))
+        self.assertEqual(2, self.graph.e_size())
+        self.assertEqual({}, self.graph.all_out_edges_of_node(1))
+        self.assertEqual({}, self.graph.all_in_edges_of_node(4))
+        self.assertEqual(0, self.graph.remove_nodes_from([7]))
+        self.assertEqual(mc + 1, self.graph.get_mc())
+        self.assertEqual(2, self.graph.remove_nodes_from(iter([5])))
+        self.assertEqual(0, self.graph.e_size())
+
+    def test_remove_nodes_from_listeners(self):
+        events = []
+        listener = GraphListener()
+        listener.edge_removed = lambda id1, id2, weight: events.append((id1, id2))
+        listener.node_removed = lambda node_id: events.append(node_id)
+        self.graph.add_edge(4, 2, 1)
+        self.graph.add_listener(listener)
+        self.assertEqual(4, self.graph.remove_nodes_from([2, 3]))
+        self.assertEqual([(2, 3), (4, 2), (1, 2), 2, (3, 4), 3], events)
+        self.assertEqual(1, self.graph.e_size())
+
+    def test_lock(self):
+        lock = self.graph.get_lock()
+        with lock.reading():
+            with lock.reading():
+                self.assertRaises(RuntimeError, lock.acquire_write)
+        with lock.writing():
+            self.assertTrue(self.graph.add_edge(5, 1, 1))
+            with lock.reading():
+                self.assertEqual(5, self.graph.e_size())
+        events = []
+        lock.acquire_read()
+        writer = threading.Thread(target=lambda: events.append(self.graph.add_node(6)))
+        writer.start()
+        writer.join(0.1)
+        self.assertEqual([], events)
+        lock.release_read()
+        writer.join()
+        self.assertEqual([True], events)
+
+    def test_pickle(self):
+        self.graph.freeze()
+        copy = pickle.loads(pickle.dumps(self.graph))
+        self.assertEqual(self.graph, copy)
+        self.assertTrue(copy.add_node(6))
+        self.assertIsNone(copy.get_frozen())
+
+    def test_str(self):
+        text = str(self.graph)
+        self.assertIn('"_key": 3', text)
+        self.assertIn('"_location": [', text)
+        self.assertFalse(hasattr(self.graph.get_all_v()[1], "__dict__"))
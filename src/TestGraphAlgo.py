@@ -1,4 +1,10 @@
-from unittest import TestCase
+import json
+import os
+import random
+import threading
+from unittest import TestCase, mock
+
+import numpy as np
 
 from DiGraph import DiGraph
 from GraphAlgo import GraphAlgo
@@ -30,6 +36,101 @@ class Test(TestCase):
         self.assertTrue(self.graph_algo.load_from_json("load_test_file.json"))
         self.assertEqual(self.graph_algo.get_graph(), original_graph)
 
+    def test_save_to_json_formats(self):
+        self.graph.add_node(7)
+        self.graph.add_edge(5, 7, 0.5)
+        edges = [{"src": i, "w": i, "dest": i + 1} for i in range(1, 5)] + [{"src": 5, "w": 0.5, "dest": 7}]
+        expected = {"Edges": edges,
+                    "Nodes": [{"pos": ",".join([str(i)] * 3), "id": i} for i in range(1, 6)] + [{"id": 7}]}
+        self.assertTrue(self.graph_algo.save_to_json("load_test_file.json"))
+        with open("load_test_file.json") as f:
+            self.assertEqual(json.dumps(expected, indent=4), f.read())
+        self.assertTrue(self.graph_algo.save_to_json("load_test_file.json", indent=None))
+        with open("load_test_file.json") as f:
+            self.assertEqual(json.dumps(expected, separators=(",", ":")), f.read())
+        self.assertTrue(self.graph_algo.save_to_json("load_test_file.json", layout="ndjson"))
+        with open("load_test_file.json") as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(expected["Nodes"] + expected["Edges"], lines)
+        for name in ("load_test_file.json.gz", "load_test_file.json.bz2", "load_test_file.json.xz"):
+            for layout in ("json", "ndjson"):
+                self.assertTrue(self.graph_algo.save_to_json(name, indent=None, layout=layout))
+                with open(name, "rb") as f:
+                    self.assertNotEqual(b"{", f.read(1))
+                algo = GraphAlgo()
+                self.assertTrue(algo.load_from_json(name))
+                self.assertEqual(self.graph, algo.get_graph())
+            os.remove(name)
+        self.assertTrue(self.graph_algo.save_to_json("load_test_file.json", layout="ndjson", compression="gzip"))
+        self.assertTrue(GraphAlgo().load_from_json("load_test_file.json"))
+        self.assertRaises(ValueError, self.graph_algo.save_to_json, "load_test_file.json", compression="rar")
+        self.assertRaises(ValueError, self.graph_algo.save_to_json, "load_test_file.json", layout="xml")
+        self.graph.add_nodes_from(np.arange(8, 10))
+        self.assertTrue(self.graph_algo.save_to_json("load_test_file.json"))
+        empty = GraphAlgo(DiGraph())
+        self.assertTrue(empty.save_to_json("load_test_file.json", layout="ndjson"))
+        self.assertTrue(empty.load_from_json("load_test_file.json"))
+        self.assertEqual(0, empty.get_graph().v_size())
+        for text in ("", "  \n", '{"foo": 1}', '{"Nodes": [{"id": 1}]}'):
+            with open("load_test_file.json", "w") as f:
+                f.write(text)
+            self.assertFalse(self.graph_algo.load_from_json("load_test_file.json"))
+            self.assertIs(self.graph, self.graph_algo.get_graph())
+
+    def test_save_and_load_binary(self):
+        self.graph.add_node(7)
+        self.graph.add_edge(5, 7, 0.5)
+        self.assertTrue(self.graph_algo.save_binary("load_test_file.bin"))
+        for mmap in (True, False):
+            algo = GraphAlgo()
+            self.assertTrue(algo.load_binary("load_test_file.bin", mmap))
+            loaded = algo.get_graph()
+            self.assertEqual((6, 5), (loaded.v_size(), loaded.e_size()))
+            self.assertEqual((4, 4, 4), loaded.get_all_v()[4].get_location())
+            self.assertIsNone(loaded.get_all_v()[7].get_location())
+            self.assertEqual({4: 4}, loaded.all_in_edges_of_node(5))
+            self.assertEqual({4: 3}, loaded.all_out_edges_of_node(3))
+            self.assertEqual((10.5, [1, 2, 3, 4, 5, 7]), algo.shortest_path(1, 7))
+            self.assertEqual([[1], [2], [3], [4], [5], [7]], algo.connected_components())
+            if not mmap:
+                self.assertEqual(self.graph, loaded)
+            self.assertEqual(not mmap, loaded.add_edge(7, 1, 1))
+        os.remove("load_test_file.bin")
+        self.assertFalse(GraphAlgo().load_binary("load_test_file.bin"))
+        self.assertFalse(GraphAlgo().load_binary("TestGraphAlgo.py"))
+
+    def test_load_from_json_nodes_first(self):
+        with open("load_test_file.json", "w") as f:
+            f.write('{"Nodes": [{"pos": "1,2,3", "id": 0}, {"id": 1}], "Edges": [{"src": 0, "w": 2, "dest": 1},'
+                    ' {"src": 1, "w": -1, "dest": 0}, {"src": 0, "w": 1, "dest": 0}]}')
+        self.assertTrue(self.graph_algo.load_from_json("load_test_file.json"))
+        graph = self.graph_algo.get_graph()
+        self.assertEqual((2, 1), (graph.v_size(), graph.e_size()))
+        self.assertEqual((1.0, 2.0, 3.0), graph.get_all_v()[0].get_location())
+        self.assertIsNone(graph.get_all_v()[1].get_location())
+        self.assertEqual({1: 2}, graph.all_out_edges_of_node(0))
+        self.assertFalse(self.graph_algo.load_from_json("no_such_file.json"))
+        self.assertIs(graph, self.graph_algo.get_graph())
+
+    def test_load_in_batches(self):
+        rnd = random.Random(5)
+        graph = DiGraph()
+        graph.add_nodes_from((i, (i, i % 7, 0)) for i in range(10000))
+        graph.add_edges_from((rnd.randrange(10000), rnd.randrange(10000), rnd.randint(1, 9)) for _ in range(20000))
+        algo = GraphAlgo(graph)
+        for layout in ("json", "ndjson"):
+            self.assertTrue(algo.save_to_json("load_test_file.json", indent=None, layout=layout))
+            loaded = GraphAlgo()
+            self.assertTrue(loaded.load_from_json("load_test_file.json"))
+            self.assertEqual(graph, loaded.get_graph())
+            self.assertGreater(loaded.get_graph().get_mc(), 0)
+        self.assertTrue(algo.save_binary("load_test_file.bin"))
+        loaded = GraphAlgo()
+        self.assertTrue(loaded.load_binary("load_test_file.bin", False))
+        self.assertEqual(graph, loaded.get_graph())
+        self.assertGreater(loaded.get_graph().get_mc(), 0)
+        os.remove("load_test_file.bin")
+
     def test_shortest_path(self):
         test_tuple_1 = (10, [1, 2, 3, 4, 5])
         self.assertEqual(test_tuple_1, self.graph_algo.shortest_path(1, 5))
@@ -39,6 +140,206 @@ class Test(TestCase):
         test_tuple_3 = (20, [5, 1])
         self.assertEqual(test_tuple_3, self.graph_algo.shortest_path(5, 1))
 
+    def test_single_source(self):
+        self.graph.add_edge(1, 4, 2.5)
+        dist, pred = self.graph_algo.single_source(1)
+        self.assertEqual([0, 1, 3, 2.5, 6.5], dist.tolist())
+        self.assertEqual([-1, 0, 1, 0, 3], pred.tolist())
+        dist, pred = self.graph_algo.single_source(5)
+        self.assertEqual([float('inf')] * 4 + [0], dist.tolist())
+        self.assertEqual([-1] * 5, self.graph_algo.single_source(9)[1].tolist())
+
+    def test_all_pairs_shortest_paths(self):
+        rnd = random.Random(3)
+        graph = DiGraph()
+        for i in range(40):
+            graph.add_node(i)
+        for _ in range(160):
+            graph.add_edge(rnd.randrange(40), rnd.randrange(40), rnd.randint(1, 9))
+        algo = GraphAlgo(graph)
+        dist, pred = algo.all_pairs_shortest_paths(workers=1)
+        self.assertEqual((40, 40), dist.shape)
+        for i in (0, 17, 39):
+            for j in (0, 5, 39):
+                self.assertEqual(algo.shortest_path(i, j)[0], dist[i, j])
+        parallel_dist, parallel_pred = algo.all_pairs_shortest_paths(workers=2, chunk_size=8)
+        self.assertTrue((dist == parallel_dist).all())
+        self.assertTrue((pred == parallel_pred).all())
+        rows = algo.all_pairs_shortest_paths(dense=False, workers=2, chunk_size=8)
+        for src, dist_row, pred_row in rows:
+            self.assertTrue((dist[src] == dist_row).all())
+
+    def test_concurrent_queries(self):
+        graph = DiGraph()
+        for i in range(200):
+            graph.add_node(i)
+        for i in range(200):
+            graph.add_edge(i, (i + 1) % 200, 1)
+            graph.add_edge(i, (i + 7) % 200, 5)
+        algo = GraphAlgo(graph)
+        errors = []
+
+        def query():
+            try:
+                for i in range(50):
+                    with graph.get_lock().reading():
+                        dist, path = algo.shortest_path(i, 199 - i)
+                        if dist != sum(graph.all_out_edges_of_node(a)[b] for a, b in zip(path, path[1:])):
+                            errors.append((i, dist, path))
+                    algo.connected_components()
+            except Exception as e:
+                errors.append(e)
+
+        def mutate():
+            for i in range(50):
+                graph.add_edge(i, i + 100, 3)
+                graph.remove_edge(i, (i + 7) % 200)
+
+        threads = [threading.Thread(target=query) for _ in range(4)] + [threading.Thread(target=mutate)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual([], errors)
+        self.assertEqual(-1, graph.get_all_v()[0].get_weight())
+
+    def test_path_cache(self):
+        cache = self.graph_algo.enable_cache(max_entries=2)
+        self.assertEqual((10, [1, 2, 3, 4, 5]), self.graph_algo.shortest_path(1, 5))
+        self.assertEqual((10, [1, 2, 3, 4, 5]), self.graph_algo.shortest_path(1, 5))
+        self.assertEqual((3, [1, 2, 3]), self.graph_algo.shortest_path(1, 3))
+        self.assertEqual((float('inf'), []), self.graph_algo.shortest_path(5, 1))
+        stats = cache.get_stats()
+        self.assertEqual((2, 2, 2), (stats["hits"], stats["misses"], stats["entries"]))
+        self.assertEqual((float('inf'), []), self.graph_algo.shortest_path(3, 1))
+        self.assertEqual(1, cache.get_stats()["evictions"])
+        self.graph.add_edge(5, 1, 20)
+        self.assertEqual((20, [5, 1]), self.graph_algo.shortest_path(5, 1))
+        self.assertEqual(1, cache.get_stats()["invalidations"])
+        self.graph.freeze()
+        self.assertEqual((25, [4, 5, 1, 2]), self.graph_algo.shortest_path(4, 2))
+        self.assertEqual((24, [4, 5, 1]), self.graph_algo.shortest_path(4, 1))
+        self.graph_algo.disable_cache()
+        self.assertIsNone(self.graph_algo.get_cache())
+
+    def test_within_distance_and_k_nearest(self):
+        self.graph.add_edge(1, 3, 2)
+        self.graph.add_edge(5, 1, 1)
+        self.assertEqual([(2, 1), (3, 2), (4, 5)], list(self.graph_algo.within_distance(1, 5)))
+        self.assertEqual([(2, 1), (3, 2), (4, 5), (5, 9)], list(self.graph_algo.within_distance(1, 100)))
+        self.assertEqual([], list(self.graph_algo.within_distance(1, 0.5)))
+        self.assertEqual([(2, 1), (3, 2)], list(self.graph_algo.k_nearest(1, 2)))
+        self.assertEqual([(2, 1), (4, 5)],
+                         list(self.graph_algo.k_nearest(1, 3, lambda node: node.get_key() % 2 == 0)))
+        self.assertEqual([(1, 1), (2, 2)], list(self.graph_algo.k_nearest(5, 2)))
+        self.assertEqual([], list(self.graph_algo.k_nearest(1, 0)))
+        self.assertEqual([], list(self.graph_algo.k_nearest(9, 2)))
+        self.assertRaises(ValueError, self.graph_algo.within_distance, 1, -1)
+        self.assertRaises(ValueError, self.graph_algo.k_nearest, 1, -1)
+        reached = []
+        nearest = self.graph_algo.k_nearest(1, 4, lambda node: reached.append(node.get_key()) or True)
+        self.assertEqual((2, 1), next(nearest))
+        self.assertEqual([2], reached)
+        self.graph.remove_edge(3, 4)
+        self.assertRaises(RuntimeError, next, nearest)
+
+    def test_shortest_paths(self):
+        self.graph.add_node(6)
+        expected = {2: (1, [1, 2]), 5: (10, [1, 2, 3, 4, 5]), 1: (0, [1]), 6: (float('inf'), []),
+                    9: (float('inf'), [])}
+        self.assertEqual(expected, self.graph_algo.shortest_paths(1, [2, 5, 1, 6, 9]))
+        self.assertEqual({3: (float('inf'), [])}, self.graph_algo.shortest_paths(9, [3]))
+        self.assertEqual({}, self.graph_algo.shortest_paths(1, []))
+        self.graph.freeze()
+        self.assertEqual(expected, self.graph_algo.shortest_paths(1, [2, 5, 1, 6, 9]))
+        cache = self.graph_algo.enable_cache()
+        self.assertEqual((3, [1, 2, 3]), self.graph_algo.shortest_path(1, 3))
+        self.assertEqual({3: (3, [1, 2, 3]), 5: (10, [1, 2, 3, 4, 5])}, self.graph_algo.shortest_paths(1, [3, 5]))
+        self.assertEqual(2, cache.get_stats()["hits"])
+        self.graph_algo.shortest_path_tree(1)
+        self.graph.add_edge(1, 5, 4)
+        self.assertEqual({5: (4, [1, 5]), 6: (float('inf'), [])}, self.graph_algo.shortest_paths(1, [5, 6]))
+
+    def test_tsp(self):
+        self.assertEqual((10, [1, 2, 3, 4, 5]), self.graph_algo.tsp([5, 1, 3]))
+        self.assertEqual((0, [3]), self.graph_algo.tsp([3, 3]))
+        self.assertEqual((float('inf'), []), self.graph_algo.tsp([1, 9]))
+        self.assertEqual((float('inf'), []), self.graph_algo.tsp([]))
+        self.graph.add_node(6)
+        self.assertEqual((float('inf'), []), self.graph_algo.tsp([1, 6]))
+        self.graph.add_edge(5, 1, 1)
+        self.assertEqual((2, [5, 1, 2]), self.graph_algo.tsp([2, 5]))
+        rnd = random.Random(4)
+        graph = DiGraph()
+        for i in range(300):
+            graph.add_node(i)
+        for i in range(300):
+            graph.add_edge(i, (i + 1) % 300, rnd.randint(1, 9))
+            for _ in range(3):
+                graph.add_edge(i, rnd.randrange(300), rnd.randint(5, 50))
+        algo = GraphAlgo(graph)
+        stops = rnd.sample(range(300), 40)
+        dist, path = algo.tsp(stops)
+        self.assertEqual(set(stops), set(stops) & set(path))
+        self.assertEqual(dist, sum(graph.all_out_edges_of_node(a)[b] for a, b in zip(path, path[1:])))
+        greedy = [stops[0]]
+        for _ in range(len(stops) - 1):
+            greedy.append(min((key for key in stops if key not in greedy),
+                              key=lambda key: algo.shortest_path(greedy[-1], key)[0]))
+        self.assertTrue(dist <= sum(algo.shortest_path(a, b)[0] for a, b in zip(greedy, greedy[1:])))
+        clusters = DiGraph()
+        for i in range(60):
+            clusters.add_node(i)
+        for i in range(60):
+            clusters.add_edge(i, i - i % 30 + (i + 1) % 30, 1)
+        clusters.add_edge(29, 30, 500)
+        clusters.add_edge(59, 0, 700)
+        algo = GraphAlgo(clusters)
+        self.assertEqual((558, list(range(60))), algo.tsp(list(range(60))))
+        clusters.freeze()
+        self.assertEqual((558, list(range(60))), algo.tsp(list(range(60))))
+
+    def test_eccentricities_and_center_point(self):
+        self.assertEqual({key: 0 for key in range(1, 6)}, self.graph_algo.eccentricities())
+        self.assertEqual((1, 0), self.graph_algo.center_point())
+        self.graph.add_edge(5, 1, 1)
+        self.graph.add_node(6)
+        self.graph.add_node(7)
+        self.graph.add_edge(6, 7, 3)
+        self.graph.add_edge(7, 6, 2)
+        self.graph.add_edge(5, 6, 1)
+        self.assertEqual({1: 10, 2: 10, 3: 9, 4: 8, 5: 7, 6: 3, 7: 2}, self.graph_algo.eccentricities())
+        self.assertEqual((5, 7), self.graph_algo.center_point())
+        self.assertEqual((None, float('inf')), GraphAlgo(DiGraph()).center_point())
+        rnd = random.Random(5)
+        graph = DiGraph()
+        for i in range(60):
+            graph.add_node(i)
+        for _ in range(240):
+            graph.add_edge(rnd.randrange(60), rnd.randrange(60), rnd.randint(1, 9))
+        algo = GraphAlgo(graph)
+        ids = graph.freeze().get_ids().tolist()
+        expected = {}
+        for component in algo.connected_components():
+            for key in component:
+                dist = algo.single_source(key)[0]
+                expected[key] = max(dist[ids.index(other)] for other in component)
+        self.assertEqual(expected, algo.eccentricities())
+        center, eccentricity = algo.center_point()
+        largest = max(algo.connected_components(), key=len)
+        self.assertEqual(min(expected[key] for key in largest), eccentricity)
+        self.assertEqual(expected[center], eccentricity)
+        pairs = DiGraph()
+        for i in range(40):
+            pairs.add_node(i)
+        for i in range(0, 40, 2):
+            pairs.add_edge(i, i + 1, 1)
+            pairs.add_edge(i + 1, i, 2)
+            if i + 2 < 40:
+                pairs.add_edge(i, i + 2, 1)
+        self.assertEqual({i: 1 + i % 2 for i in range(40)}, GraphAlgo(pairs).eccentricities())
+        self.assertEqual(1, GraphAlgo(pairs).center_point()[1])
+
     def test_connected_component(self):
         self.assertEqual([1], self.graph_algo.connected_component(1))
         self.assertEqual([2], self.graph_algo.connected_component(2))
@@ -48,6 +349,61 @@ class Test(TestCase):
         self.graph_algo.get_graph().add_edge(5, 1, 1)
         self.assertEqual([1, 2, 3, 4, 5], self.graph_algo.connected_component(1))
 
+    def test_shortest_path_keeps_nodes(self):
+        self.graph.add_edge(1, 4, 2.5)
+        weights = [node.get_weight() for node in self.graph.get_all_v().values()]
+        self.assertEqual((6.5, [1, 4, 5]), self.graph_algo.shortest_path(1, 5))
+        self.assertEqual((0, [3]), self.graph_algo.shortest_path(3, 3))
+        self.assertEqual((float('inf'), []), self.graph_algo.shortest_path(1, 9))
+        self.assertEqual(weights, [node.get_weight() for node in self.graph.get_all_v().values()])
+        for method in ("dijkstra", "astar", "bidirectional"):
+            self.assertIs(float, type(self.graph_algo.shortest_path(1, 3, method)[0]))
+        self.graph.freeze()
+        for method in ("dijkstra", "astar", "bidirectional"):
+            self.assertEqual((3.0, [1, 2, 3]), self.graph_algo.shortest_path(1, 3, method))
+            self.assertIs(float, type(self.graph_algo.shortest_path(1, 3, method)[0]))
+
+    def test_shortest_path_methods(self):
+        self.graph.add_edge(1, 4, 2.5)
+        for method in ("astar", "bidirectional"):
+            self.assertEqual((6.5, [1, 4, 5]), self.graph_algo.shortest_path(1, 5, method))
+            self.assertEqual((float('inf'), []), self.graph_algo.shortest_path(5, 1, method))
+            self.assertEqual((0, [2]), self.graph_algo.shortest_path(2, 2, method))
+        self.assertRaises(ValueError, self.graph_algo.shortest_path, 1, 5, "bfs")
+        rnd = random.Random(7)
+        grid = DiGraph()
+        for i in range(100):
+            grid.add_node(i, (i % 10, i // 10, 0))
+        for i in range(100):
+            for j in (i + 1, i - 1, i + 10, i - 10):
+                if 0 <= j < 100 and rnd.random() < 0.8:
+                    grid.add_edge(i, j, 1 + rnd.random())
+        grid_algo = GraphAlgo(grid)
+        for k in range(2):
+            for _ in range(30):
+                src, dst = rnd.randrange(100), rnd.randrange(100)
+                expected = grid_algo.shortest_path(src, dst)
+                for method in ("astar", "bidirectional"):
+                    dist, path = grid_algo.shortest_path(src, dst, method)
+                    self.assertAlmostEqual(expected[0], dist)
+                    if path:
+                        self.assertEqual([src, dst], [path[0], path[-1]])
+                        length = sum(grid.all_out_edges_of_node(a)[b] for a, b in zip(path, path[1:]))
+                        self.assertAlmostEqual(dist, length)
+            grid.freeze()
+
+    def test_frozen_algorithms(self):
+        self.graph.add_edge(2, 1, 2)
+        self.graph.freeze()
+        self.assertEqual((10, [1, 2, 3, 4, 5]), self.graph_algo.shortest_path(1, 5))
+        self.assertEqual((2, [2, 1]), self.graph_algo.shortest_path(2, 1))
+        self.assertEqual((float('inf'), []), self.graph_algo.shortest_path(5, 1))
+        self.assertEqual([2, 1], self.graph_algo.connected_component(2))
+        self.assertEqual([[1, 2], [3], [4], [5]], self.graph_algo.connected_components())
+        self.graph.add_edge(5, 1, 20)
+        self.assertIsNone(self.graph.get_frozen())
+        self.assertEqual((20, [5, 1]), self.graph_algo.shortest_path(5, 1))
+
     def test_connected_components(self):
         self.assertEqual([[1], [2], [3], [4], [5]], self.graph_algo.connected_components())
         self.graph_algo.get_graph().add_edge(5, 1, 1)
@@ -56,11 +412,93 @@ class Test(TestCase):
         self.graph_algo.get_graph().add_edge(5, 2, 2)
         self.assertEqual([[1], [2, 3, 4, 5]], self.graph_algo.connected_components())
 
+    def test_scc_id(self):
+        self.assertEqual([0, 1, 2, 3, 4], [self.graph_algo.scc_id(i) for i in range(1, 6)])
+        self.assertEqual(-1, self.graph_algo.scc_id(9))
+        self.assertEqual([], self.graph_algo.connected_component(9))
+        self.graph.add_edge(4, 2, 1)
+        self.assertEqual([0, 1, 1, 1, 2], [self.graph_algo.scc_id(i) for i in range(1, 6)])
+        self.assertEqual([3, 2, 4], self.graph_algo.connected_component(3))
+
+    def test_connected_components_long_cycle(self):
+        cycle = DiGraph()
+        for i in range(20000):
+            cycle.add_node(i)
+        for i in range(20000):
+            cycle.add_edge(i, (i + 1) % 20000, 1)
+        cycle_algo = GraphAlgo(cycle)
+        self.assertEqual([list(range(20000))], cycle_algo.connected_components())
+        cycle.remove_edge(19999, 0)
+        self.assertEqual(20000, len(cycle_algo.connected_components()))
+        cycle.freeze()
+        self.assertEqual([5], cycle_algo.connected_component(5))
+
     def test_graph_width(self):
         self.assertEqual([1, 5], self.graph_algo.graph_height(self.graph.get_all_v()))
 
     def test_graph_height(self):
         self.assertEqual([1, 5], self.graph_algo.graph_height(self.graph.get_all_v()))
 
+    def test_graph_bounds_from_spatial_index(self):
+        self.assertEqual([1, 5], self.graph_algo.graph_width(self.graph.get_all_v()))
+        self.assertIsNone(self.graph.spatial_index(build=False))
+        index = self.graph.spatial_index()
+        self.assertIs(index, self.graph.spatial_index(build=False))
+        self.graph.add_node(6, (-2, 9, 0))
+        self.assertEqual([-2, 5], self.graph_algo.graph_width(self.graph.get_all_v()))
+        self.assertEqual([1, 9], self.graph_algo.graph_height(self.graph.get_all_v()))
+
     def test_plot_graph(self):
         self.graph_algo.plot_graph()
+
+    def test_plot_graph_shows_without_lock(self):
+        def show():
+            writer = threading.Thread(target=self.graph.add_node, args=(6,))
+            writer.start()
+            writer.join(5)
+            self.assertFalse(writer.is_alive())
+        with mock.patch("GraphAlgo.plt.show", show):
+            self.graph_algo.plot_graph()
+        self.assertIn(6, self.graph.get_all_v())
+
+    def test_layout(self):
+        self.assertTrue((self.graph_algo.layout() == [[1, 1], [2, 2], [3, 3], [4, 4], [5, 5]]).all())
+        for key in range(6, 10):
+            self.graph.add_node(key)
+            self.graph.add_edge(key - 1, key, 1)
+        for method in ("force", "spectral", "grid"):
+            positions = self.graph_algo.layout(method=method, seed=3)
+            self.assertEqual((9, 2), positions.shape)
+            self.assertTrue((positions[:5] == [[1, 1], [2, 2], [3, 3], [4, 4], [5, 5]]).all())
+            if method != "force":
+                self.assertTrue(((positions[5:] >= 1) & (positions[5:] <= 5)).all())
+            self.assertIs(positions, self.graph_algo.layout(method=method, seed=3))
+            self.assertTrue((positions == GraphAlgo(self.graph).layout(method=method, seed=3)).all())
+        self.assertTrue(all(self.graph.get_all_v()[key].get_location() is None for key in range(6, 10)))
+        self.graph.add_node(10)
+        self.assertEqual((10, 2), self.graph_algo.layout().shape)
+        self.assertRaises(ValueError, self.graph_algo.layout, method="circle")
+        unplaced = DiGraph()
+        for key in range(300):
+            unplaced.add_node(key)
+            unplaced.add_edge(key, (key * 7 + 1) % 300, 1)
+        positions = GraphAlgo(unplaced).layout()
+        self.assertTrue((positions.max(axis=0) - positions.min(axis=0) > 50).all())
+        self.assertEqual((0, 2), GraphAlgo(DiGraph()).layout().shape)
+
+    def test_plot_graph_save_to(self):
+        self.graph.add_node(6)
+        self.graph.add_edge(5, 6, 1)
+        for name, kwargs in (("plot_test_file.png", {}), ("plot_test_file.svg", {"labels": False, "max_edges": 2})):
+            self.graph_algo.plot_graph(save_to=name, **kwargs)
+            self.assertTrue(os.path.getsize(name) > 0)
+            os.remove(name)
+        self.assertIsNone(self.graph.get_all_v()[6].get_location())
+        flat = DiGraph()
+        flat.add_nodes_from([(1, (0, 0)), (2, (3, 4))])
+        flat.add_edge(1, 2, 1)
+        GraphAlgo(flat).plot_graph(save_to="plot_test_file.png")
+        self.assertEqual((1, [1, 2]), GraphAlgo(flat).tsp([1, 2]))
+        empty_algo = GraphAlgo(DiGraph())
+        empty_algo.plot_graph(save_to="plot_test_file.png")
+        os.remove("plot_test_file.png")
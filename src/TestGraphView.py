@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+
+
+class TestGraphView(TestCase):
+
+    def setUp(self) -> None:
+        self.graph = DiGraph()
+        for i in range(6):
+            self.graph.add_node(i, (i, 0, 0))
+        for i in range(5):
+            self.graph.add_edge(i, i + 1, 1)
+        self.graph.add_edge(3, 1, 1)
+        self.graph.add_edge(0, 5, 10)
+
+    def test_subgraph(self):
+        view = self.graph.subgraph([1, 2, 3, 9])
+        self.assertEqual([1, 2, 3], list(view.get_all_v()))
+        self.assertIs(self.graph.get_all_v()[2], view.get_all_v()[2])
+        self.assertEqual((3, 3), (view.v_size(), view.e_size()))
+        self.assertEqual({2: 1}, view.all_out_edges_of_node(1))
+        self.assertEqual({3: 1}, view.all_in_edges_of_node(1))
+        self.assertEqual({}, view.all_out_edges_of_node(0))
+        self.assertFalse(view.add_edge(1, 3, 1))
+        self.assertFalse(view.remove_node(1))
+        self.graph.remove_edge(3, 1)
+        self.graph.add_node(9)
+        self.graph.add_edge(3, 9, 1)
+        self.assertEqual(self.graph.get_mc(), view.get_mc())
+        self.assertEqual([1, 2, 3, 9], list(view.get_all_v()))
+        self.assertEqual(3, view.e_size())
+        self.assertEqual([2, 1], list(view.subgraph([2, 1, 0]).get_all_v()))
+
+    def test_reverse_view(self):
+        view = self.graph.reverse_view()
+        self.assertIs(self.graph.get_all_v(), view.get_all_v())
+        self.assertIs(self.graph.all_in_edges_of_node(5), view.all_out_edges_of_node(5))
+        self.assertEqual((6, 7), (view.v_size(), view.e_size()))
+        self.assertEqual({4: 1, 0: 10}, view.all_out_edges_of_node(5))
+        self.assertIs(self.graph, view.reverse_view())
+        induced = view.subgraph([0, 1, 5])
+        self.assertEqual({0: 10}, induced.all_out_edges_of_node(5))
+        self.assertEqual({1: 1, 5: 10}, induced.reverse_view().all_out_edges_of_node(0))
+
+    def test_graph_algo(self):
+        reverse = GraphAlgo(self.graph.reverse_view())
+        self.assertEqual((5, [5, 4, 3, 2, 1, 0]), reverse.shortest_path(5, 0))
+        self.assertEqual((float('inf'), []), reverse.shortest_path(0, 5))
+        self.assertEqual((5, [5, 4, 3, 2, 1, 0]), reverse.shortest_path(5, 0, method="bidirectional"))
+        self.assertEqual((5, [5, 4, 3, 2, 1, 0]), reverse.shortest_path(5, 0, method="astar"))
+        view = self.graph.subgraph([0, 1, 2, 3, 5])
+        algo = GraphAlgo(view)
+        self.assertEqual((10, [0, 5]), algo.shortest_path(0, 5))
+        self.assertEqual([[0], [1, 2, 3], [5]], sorted(sorted(c) for c in algo.connected_components()))
+        self.assertEqual([1, 2, 3], sorted(algo.connected_component(2)))
+        frozen = view.freeze()
+        self.assertIs(frozen, view.get_frozen())
+        self.assertEqual((5, 5), (frozen.v_size(), frozen.e_size()))
+        self.assertEqual((10, [0, 5]), algo.shortest_path(0, 5))
+        self.graph.remove_edge(0, 5)
+        self.assertIsNone(view.get_frozen())
+        self.assertEqual((float('inf'), []), algo.shortest_path(0, 5))
+        self.assertEqual(3, len(algo.connected_components()))
@@ -0,0 +1,95 @@
+import random
+from unittest import TestCase
+
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+from IncrementalSCC import IncrementalSCC
+
+
+class TestIncrementalSCC(TestCase):
+
+    def setUp(self) -> None:
+        self.graph = DiGraph()
+        for i in range(1, 6):
+            self.graph.add_node(i)
+        for i in range(4):
+            self.graph.add_edge(i + 1, i + 2, i + 1)
+        self.tracker = IncrementalSCC(self.graph)
+
+    def assertMatches(self, graph, tracker):
+        expected = sorted(sorted(c) for c in GraphAlgo(graph).connected_components())
+        self.assertEqual(expected, sorted(sorted(c) for c in tracker.components()))
+        for key in graph.get_all_v():
+            self.assertIn(key, tracker.get_members(tracker.component_of(key)))
+
+    def test_merge_and_split(self):
+        self.assertEqual(5, len(self.tracker.get_components()))
+        self.graph.add_edge(4, 2, 1)
+        self.assertEqual(self.tracker.component_of(2), self.tracker.component_of(4))
+        self.assertEqual({2, 3, 4}, self.tracker.get_members(self.tracker.component_of(3)))
+        self.graph.add_edge(5, 1, 1)
+        self.assertEqual(1, len(self.tracker.get_components()))
+        self.graph.remove_edge(2, 3)
+        self.assertMatches(self.graph, self.tracker)
+        self.graph.remove_node(4)
+        self.assertMatches(self.graph, self.tracker)
+        self.assertEqual(-1, self.tracker.component_of(4))
+        self.graph.add_node(6)
+        self.assertEqual({6}, self.tracker.get_members(self.tracker.component_of(6)))
+        self.tracker.close()
+        self.graph.add_edge(5, 6, 1)
+        self.graph.add_edge(6, 5, 1)
+        self.assertNotEqual(self.tracker.component_of(5), self.tracker.component_of(6))
+
+    def test_remove_node(self):
+        for i in range(1, 5):
+            self.graph.add_edge(i + 1, i, 1)
+        self.graph.add_edge(5, 1, 1)
+        self.graph.add_edge(1, 5, 1)
+        self.assertEqual(1, len(self.tracker.get_components()))
+        comp_id = self.tracker.component_of(1)
+        self.graph.remove_node(3)
+        self.assertEqual({1, 2, 4, 5}, self.tracker.get_members(comp_id))
+        self.graph.remove_node(1)
+        self.assertMatches(self.graph, self.tracker)
+        self.assertEqual(2, len(self.tracker.get_components()))
+        self.graph.remove_nodes_from([2, 4])
+        self.assertEqual([[5]], self.tracker.components())
+
+    def test_random_updates(self):
+        rnd = random.Random(11)
+        graph = DiGraph()
+        graph.add_nodes_from(range(30))
+        tracker = IncrementalSCC(graph)
+        for step in range(400):
+            u, v = rnd.randrange(30), rnd.randrange(30)
+            if rnd.random() < 0.6:
+                graph.add_edge(u, v, 1)
+            elif rnd.random() < 0.95:
+                graph.remove_edge(u, v)
+                out = list(graph.all_out_edges_of_node(u))
+                if out:
+                    graph.remove_edge(u, rnd.choice(out))
+            else:
+                graph.remove_node(u)
+                graph.add_node(u)
+            if step % 10 == 0:
+                self.assertMatches(graph, tracker)
+        self.assertMatches(graph, tracker)
+
+    def test_graph_algo_tracking(self):
+        algo = GraphAlgo(self.graph)
+        tracker = algo.track_components()
+        self.assertIs(tracker, algo.track_components())
+        self.graph.add_edge(2, 1, 1)
+        self.assertEqual([2, 1], algo.connected_component(2))
+        self.assertEqual(algo.scc_id(1), tracker.component_of(2))
+        self.assertEqual(4, len(algo.connected_components()))
+        algo.untrack_components()
+        self.assertEqual([[1, 2], [3], [4], [5]], algo.connected_components())
+
+    def test_read_only_graphs(self):
+        for graph in (self.graph.subgraph([1, 2, 3]), self.graph.freeze()):
+            self.assertRaises(ValueError, IncrementalSCC, graph)
+            self.assertRaises(ValueError, GraphAlgo(graph).track_components)
+            self.assertEqual([[1], [2], [3]], sorted(GraphAlgo(graph).connected_components())[:3])
@@ -0,0 +1,97 @@
+import os
+from unittest import TestCase
+
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+from Instrumentation import Instrumentation
+
+
+class TestInstrumentation(TestCase):
+
+    def setUp(self) -> None:
+        self.graph = DiGraph()
+        for i in range(6):
+            self.graph.add_node(i, (i, 0, 0))
+        for i in range(5):
+            self.graph.add_edge(i, i + 1, 1)
+        self.graph.add_edge(0, 5, 10)
+        self.graph_algo = GraphAlgo(self.graph)
+
+    def tearDown(self) -> None:
+        Instrumentation.active = None
+
+    def test_disabled(self):
+        instrumentation = Instrumentation()
+        self.graph.add_edge(5, 0, 1)
+        self.graph_algo.shortest_path(0, 5)
+        self.assertEqual({}, instrumentation.get_stats())
+        self.assertIsNone(Instrumentation.counters())
+
+    def test_histograms_and_callback(self):
+        calls = []
+        with Instrumentation(callback=lambda *call: calls.append(call)) as instrumentation:
+            self.assertIs(instrumentation, Instrumentation.active)
+            self.graph.add_edge(5, 0, 1)
+            self.graph.add_edge(5, 0, 1)
+            self.graph.remove_node(3)
+            self.assertEqual((10, [0, 5]), self.graph_algo.shortest_path(0, 5))
+        self.assertIsNone(Instrumentation.active)
+        self.graph.add_edge(2, 4, 1)
+        stats = instrumentation.get_stats()
+        self.assertEqual({"DiGraph.add_edge", "DiGraph.remove_node", "GraphAlgo.shortest_path"}, set(stats))
+        self.assertEqual(2, stats["DiGraph.add_edge"]["calls"])
+        self.assertEqual(2, sum(count for bound, count in stats["DiGraph.add_edge"]["histogram"]))
+        add_edge = stats["DiGraph.add_edge"]
+        self.assertTrue(add_edge["min"] <= add_edge["mean"] <= add_edge["max"] <= add_edge["p99"] * 2)
+        self.assertEqual(["DiGraph.add_edge", "DiGraph.add_edge", "DiGraph.remove_node", "GraphAlgo.shortest_path"],
+                         [call[0] for call in calls])
+        instrumentation.clear()
+        self.assertEqual({}, instrumentation.get_stats())
+
+    def test_search_counters(self):
+        with Instrumentation() as instrumentation:
+            for method in ("dijkstra", "astar", "bidirectional"):
+                self.assertEqual((5, [0, 1, 2, 3, 4, 5]), self.graph_algo.shortest_path(0, 5, method=method))
+        counters = instrumentation.get_stats()["GraphAlgo.shortest_path"]["counters"]
+        self.assertEqual(18, counters["path_length"])
+        self.assertTrue(counters["nodes_settled"] >= 15)
+        self.assertTrue(counters["edges_relaxed"] >= counters["nodes_settled"])
+        self.assertEqual(counters["heap_pops"], counters["nodes_settled"] + counters["stale_pops"])
+        self.assertTrue(counters["heap_pushes"] >= counters["heap_pops"])
+        self.assertTrue(counters["stale_pops"] >= 0)
+
+    def test_nearest_counters(self):
+        with Instrumentation() as instrumentation:
+            self.assertEqual([(1, 1), (2, 2)], list(self.graph_algo.within_distance(0, 2)))
+            self.assertEqual([(1, 1)], list(self.graph_algo.k_nearest(0, 1)))
+            nearest = self.graph_algo.k_nearest(0, 3)
+            self.assertEqual((1, 1), next(nearest))
+            self.assertEqual(1, instrumentation.get_stats()["GraphAlgo.k_nearest"]["calls"])
+            nearest.close()
+        stats = instrumentation.get_stats()
+        self.assertEqual({"heap_pushes": 5, "heap_pops": 4, "stale_pops": 0, "nodes_settled": 4, "nodes_reached": 5,
+                          "edges_relaxed": 4, "results": 2}, stats["GraphAlgo.within_distance"]["counters"])
+        self.assertEqual(2, stats["GraphAlgo.k_nearest"]["calls"])
+        self.assertEqual({"heap_pushes": 8, "heap_pops": 4, "stale_pops": 0, "nodes_settled": 4, "nodes_reached": 8,
+                          "edges_relaxed": 6, "results": 2}, stats["GraphAlgo.k_nearest"]["counters"])
+
+    def test_nested_and_components(self):
+        self.graph.add_edge(5, 0, 1)
+        with Instrumentation() as instrumentation:
+            self.assertEqual(6, len(self.graph_algo.connected_component(2)))
+        stats = instrumentation.get_stats()
+        self.assertEqual(1, stats["GraphAlgo.scc_id"]["calls"])
+        inner = stats["GraphAlgo.scc_id"]["counters"]
+        self.assertEqual({"nodes_visited": 6, "components": 1, "dfs_max_stack": 6, "edges_scanned": 7}, inner)
+        self.assertEqual(inner, stats["GraphAlgo.connected_component"]["counters"])
+
+    def test_load_from_json(self):
+        self.graph_algo.save_to_json("instrumentation_test_file.json")
+        try:
+            with Instrumentation() as instrumentation:
+                self.assertTrue(GraphAlgo().load_from_json("instrumentation_test_file.json"))
+            counters = instrumentation.get_stats()["GraphAlgo.load_from_json"]["counters"]
+            self.assertEqual(os.path.getsize("instrumentation_test_file.json"), counters["json_chars"])
+            self.assertEqual((6, 6), (counters["nodes"], counters["edges"]))
+        finally:
+            os.remove("instrumentation_test_file.json")
@@ -0,0 +1,27 @@
+import io
+import json
+from unittest import TestCase
+
+from JsonStream import JsonStream
+
+
+class TestJsonStream(TestCase):
+
+    def test_items(self):
+        document = {"Edges": [{"src": 0, "w": 1.25, "dest": 1}, {"src": 1, "w": 10, "dest": 0}],
+                    "Name": "graph", "Nodes": [{"pos": "1.5,2,0", "id": 0}, {"id": 12345}], "Empty": []}
+        for indent in (None, 4):
+            text = json.dumps(document, indent=indent)
+            for chunk_size in (1, 3, 64, 1 << 16):
+                stream = JsonStream(io.StringIO(text), chunk_size)
+                items = list(stream.items())
+                expected = [("Edges", e) for e in document["Edges"]] + [("Nodes", n) for n in document["Nodes"]]
+                self.assertEqual(expected, items)
+                self.assertEqual(len(text), stream.get_chars_read())
+
+    def test_empty_and_broken(self):
+        self.assertEqual([], list(JsonStream(io.StringIO(" {} ")).items()))
+        with self.assertRaises(ValueError):
+            list(JsonStream(io.StringIO('{"Nodes": [{"id": 1}')).items())
+        with self.assertRaises(ValueError):
+            list(JsonStream(io.StringIO('[1, 2]')).items())
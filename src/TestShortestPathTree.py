@@ -0,0 +1,103 @@
+import random
+from unittest import TestCase
+
+from DiGraph import DiGraph
+from Dijkstra import dijkstra
+from GraphAlgo import GraphAlgo
+from ShortestPathTree import ShortestPathTree
+
+
+class TestShortestPathTree(TestCase):
+
+    def setUp(self) -> None:
+        self.graph = DiGraph()
+        for i in range(1, 6):
+            self.graph.add_node(i)
+        for i in range(4):
+            self.graph.add_edge(i + 1, i + 2, i + 1)
+        self.tree = ShortestPathTree(self.graph, 1)
+
+    def test_update_edge_weight(self):
+        mc = self.graph.get_mc()
+        self.assertTrue(self.graph.update_edge_weight(1, 2, 3))
+        self.assertEqual(3, self.graph.all_out_edges_of_node(1)[2])
+        self.assertEqual(3, self.graph.all_in_edges_of_node(2)[1])
+        self.assertEqual(mc + 1, self.graph.get_mc())
+        self.assertTrue(self.graph.update_edge_weight(1, 2, 3))
+        self.assertEqual(mc + 1, self.graph.get_mc())
+        self.assertFalse(self.graph.update_edge_weight(2, 1, 3))
+        self.assertFalse(self.graph.update_edge_weight(1, 2, 0))
+
+    def test_repair(self):
+        self.assertEqual((10, [1, 2, 3, 4, 5]), (self.tree.distance(5), self.tree.path(5)))
+        self.graph.add_edge(1, 4, 2)
+        self.assertEqual((6, [1, 4, 5]), (self.tree.distance(5), self.tree.path(5)))
+        self.graph.update_edge_weight(1, 4, 5)
+        self.assertEqual((5, [1, 4]), (self.tree.distance(4), self.tree.path(4)))
+        self.graph.update_edge_weight(1, 4, 9)
+        self.assertEqual((6, [1, 2, 3, 4]), (self.tree.distance(4), self.tree.path(4)))
+        self.graph.update_edge_weight(1, 4, 2)
+        self.graph.remove_edge(1, 4)
+        self.assertEqual((10, [1, 2, 3, 4, 5]), (self.tree.distance(5), self.tree.path(5)))
+        self.graph.remove_edge(2, 3)
+        self.assertEqual((float('inf'), []), (self.tree.distance(5), self.tree.path(5)))
+        self.graph.add_edge(2, 5, 1)
+        self.assertEqual(2, self.tree.distance(5))
+        self.graph.remove_node(1)
+        self.assertEqual(float('inf'), self.tree.distance(2))
+
+    def test_random_updates(self):
+        rnd = random.Random(5)
+        graph = DiGraph()
+        graph.add_nodes_from(range(40))
+        graph.add_edges_from((rnd.randrange(40), rnd.randrange(40), rnd.randint(1, 9)) for _ in range(150))
+        tree = ShortestPathTree(graph, 0)
+        algo = GraphAlgo(graph)
+        for step in range(300):
+            u, v = rnd.randrange(40), rnd.randrange(40)
+            action = rnd.random()
+            if action < 0.3:
+                graph.add_edge(u, v, rnd.randint(1, 9))
+            elif action < 0.5:
+                graph.remove_edge(u, v)
+            else:
+                out = list(graph.all_out_edges_of_node(u))
+                if out:
+                    graph.update_edge_weight(u, rnd.choice(out), rnd.randint(1, 9))
+            dist, prev = dijkstra(algo._edges_of(), 0)
+            self.assertEqual(dist, tree.get_distances())
+            for key in (v, 39):
+                path = tree.path(key)
+                self.assertEqual(tree.distance(key), sum(graph.all_out_edges_of_node(a)[b]
+                                                         for a, b in zip(path, path[1:])) if path else float('inf'))
+
+    def test_graph_algo_tree(self):
+        algo = GraphAlgo(self.graph)
+        tree = algo.shortest_path_tree(1)
+        self.assertIs(tree, algo.shortest_path_tree(1))
+        self.graph.update_edge_weight(3, 4, 0.5)
+        self.assertEqual((7.5, [1, 2, 3, 4, 5]), algo.shortest_path(1, 5))
+        self.assertEqual((float('inf'), []), algo.shortest_path(1, 9))
+        algo.release_shortest_path_tree(1)
+        self.graph.update_edge_weight(3, 4, 1)
+        self.assertEqual(7.5, tree.distance(5))
+        self.assertEqual((8, [1, 2, 3, 4, 5]), algo.shortest_path(1, 5))
+
+    def test_source_removed_and_added(self):
+        algo = GraphAlgo(self.graph)
+        algo.shortest_path_tree(1)
+        self.graph.remove_node(1)
+        self.assertEqual((float('inf'), []), algo.shortest_path(1, 2))
+        self.graph.add_node(1)
+        self.graph.add_edge(1, 3, 4)
+        self.assertEqual((4, [1, 3]), algo.shortest_path(1, 3))
+        self.assertEqual((GraphAlgo(self.graph).shortest_path(1, 5)), algo.shortest_path(1, 5))
+        tree = ShortestPathTree(self.graph, 7)
+        self.graph.add_node(7)
+        self.graph.add_edge(7, 5, 2)
+        self.assertEqual((2, [7, 5]), (tree.distance(5), tree.path(5)))
+
+    def test_read_only_graphs(self):
+        for graph in (self.graph.reverse_view(), self.graph.freeze()):
+            self.assertRaises(ValueError, ShortestPathTree, graph, 1)
+            self.assertRaises(ValueError, GraphAlgo(graph).shortest_path_tree, 1)
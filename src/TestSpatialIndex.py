@@ -0,0 +1,75 @@
+import math
+import pickle
+import random
+from unittest import TestCase
+
+from DiGraph import DiGraph
+from SpatialIndex import SpatialIndex
+
+
+class TestSpatialIndex(TestCase):
+
+    def setUp(self) -> None:
+        self.graph = DiGraph()
+        for i in range(5):
+            self.graph.add_node(i, (i, 2 * i, 0))
+        self.graph.add_node(5)
+        self.index = self.graph.spatial_index()
+
+    def brute_nearest(self, x, y):
+        return min(math.hypot(v.get_location()[0] - x, v.get_location()[1] - y)
+                   for v in self.graph.get_all_v().values() if v.get_location() is not None)
+
+    def test_lookups(self):
+        self.assertIs(self.index, self.graph.spatial_index())
+        self.assertEqual(5, self.index.size())
+        self.assertEqual((0, 0, 4, 8), self.index.get_bounds())
+        self.assertEqual((2, 0.0), self.index.nearest(2, 4))
+        self.assertEqual(4, self.index.nearest(100, 5)[0])
+        self.assertEqual(4, self.index.nearest(1e7, 8)[0])
+        self.assertEqual(0, self.index.nearest(-1e7, -1e7)[0])
+        self.assertEqual({1, 2}, set(self.index.within_box(1, 1, 2.5, 5)))
+        self.assertEqual([], self.index.within_box(3, 0, 1, 5))
+        self.assertEqual([1, 2, 0], [key for key, dist in self.index.within_radius(1.2, 2.5, 3)])
+        self.assertEqual((None, float('inf')), SpatialIndex(DiGraph()).nearest(0, 0))
+
+    def test_updates(self):
+        self.graph.add_node(6, (-3, 10, 0))
+        self.assertEqual((-3, 0, 4, 10), self.index.get_bounds())
+        self.graph.remove_node(6)
+        self.assertEqual((0, 0, 4, 8), self.index.get_bounds())
+        mc = self.graph.get_mc()
+        self.graph.get_all_v()[4].set_location((1, -1, 0))
+        self.assertEqual(mc + 1, self.graph.get_mc())
+        self.assertEqual((0, -1, 3, 6), self.index.get_bounds())
+        self.assertEqual(4, self.index.nearest(1, -2)[0])
+        self.graph.get_all_v()[5].set_location((9, 9, 0))
+        self.assertEqual(5, self.index.nearest(8, 8)[0])
+        self.index.close()
+        self.graph.remove_node(5)
+        self.assertEqual(6, self.index.size())
+        node = self.graph.get_all_v()[0]
+        self.graph.remove_nodes_from([0])
+        node.set_location((7, 7, 7))
+        self.assertEqual((7, 7, 7), node.get_location())
+        copy = pickle.loads(pickle.dumps(self.graph))
+        self.assertEqual(copy, self.graph)
+        self.assertEqual(2, copy.spatial_index().nearest(2, 4)[0])
+
+    def test_random(self):
+        rnd = random.Random(3)
+        keys = []
+        for i in range(2000):
+            self.graph.add_node(10 + i, (rnd.uniform(0, 100), rnd.uniform(0, 30), 0))
+            keys.append(10 + i)
+        for key in rnd.sample(keys, 1500):
+            if rnd.random() < 0.5:
+                self.graph.remove_node(key)
+            else:
+                self.graph.get_all_v()[key].set_location((rnd.uniform(-50, 50), rnd.uniform(0, 300), 0))
+        for _ in range(50):
+            x, y, r = rnd.uniform(-80, 130), rnd.uniform(-50, 350), rnd.uniform(0, 40)
+            self.assertAlmostEqual(self.brute_nearest(x, y), self.index.nearest(x, y)[1])
+            expected = {key for key, v in self.graph.get_all_v().items() if v.get_location() is not None
+                        and math.hypot(v.get_location()[0] - x, v.get_location()[1] - y) <= r}
+            self.assertEqual(expected, {key for key, dist in self.index.within_radius(x, y, r)})
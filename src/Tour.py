@@ -0,0 +1,103 @@
+import numpy as np
+
+_TSP_EPSILON = 1e-9
+
+
+def greedy_tour(dist: np.ndarray) -> list:
+    """This function builds a nearest neighbour tour over a distance matrix, starting at index 0.
+    @:param dist - np.ndarray, the |N|x|N| distance matrix
+    @:return list - the order of the indices in the tour"""
+    visited = np.zeros(len(dist), dtype=bool)
+    visited[0] = True
+    tour = [0]
+    for _ in range(len(dist) - 1):
+        nearest = int(np.argmin(np.where(visited, np.inf, dist[tour[-1]])))
+        visited[nearest] = True
+        tour.append(nearest)
+    return tour
+
+
+def chain_distances(dist: np.ndarray) -> np.ndarray:
+    """This function bounds the unknown entries of a distance matrix from above by the shortest chains of known
+    entries (Floyd-Warshall over the matrix), every such chain is a real route between its ends.
+    @:param dist - np.ndarray, the |N|x|N| distance matrix, inf for the unknown entries
+    @:return np.ndarray - the bounded matrix, still inf where no chain exists"""
+    dist = dist.copy()
+    for k in range(len(dist)):
+        np.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+    return dist
+
+
+def _two_opt_move(dist: np.ndarray, tour: list) -> (float, int, int):
+    """This function finds the best 2-opt move of a closed tour: reversing the part of the tour between
+    two positions. The distances may be asymmetric, so the reversed part is priced by prefix sums of the
+    tour in both directions. The first position of the tour never moves.
+    @:param dist - np.ndarray, the |N|x|N| distance matrix
+    @:param tour - list, the order of the indices in the tour
+    @:return (delta, i, j) - the change of the tour length by reversing tour[i:j + 1]"""
+    n = len(tour)
+    ordered = dist[np.ix_(tour, tour)]
+    following = np.roll(np.arange(n), -1)
+    edge = ordered[np.arange(n), following]
+    forward = np.concatenate(([0.0], np.cumsum(edge[:-1])))
+    backward = np.concatenate(([0.0], np.cumsum(ordered[np.arange(1, n), np.arange(n - 1)])))
+    i = np.arange(1, n)[:, None]
+    j = np.arange(1, n)[None, :]
+    delta = (ordered[:-1, 1:] + ordered[1:][:, following[1:]] - edge[i - 1] - edge[j]
+             + (backward[j] - backward[i]) - (forward[j] - forward[i]))
+    delta = np.where(j > i, delta, np.inf)
+    best = np.unravel_index(np.argmin(delta), delta.shape)
+    return float(delta[best]), int(best[0]) + 1, int(best[1]) + 1
+
+
+def _or_opt_move(dist: np.ndarray, tour: list, max_length: int = 3) -> (float, int, int, int):
+    """This function finds the best Or-opt move of a closed tour: moving up to max_length consecutive
+    positions, in the same direction, between two other neighbours. The first position of the tour never moves.
+    @:param dist - np.ndarray, the |N|x|N| distance matrix
+    @:param tour - list, the order of the indices in the tour
+    @:param max_length - int, the longest part of the tour which is moved
+    @:return (delta, i, length, p) - the change of the tour length by moving tour[i:i + length]
+    between tour[p] and the position after it"""
+    n = len(tour)
+    ordered = dist[np.ix_(tour, tour)]
+    following = np.roll(np.arange(n), -1)
+    edge = ordered[np.arange(n), following]
+    best = (np.inf, 0, 0, 0)
+    for length in range(1, min(max_length, n - 2) + 1):
+        i = np.arange(1, n - length + 1)
+        end = i + length - 1
+        gain = edge[i - 1] + edge[end] - ordered[i - 1, following[end]]
+        delta = ordered[:, i].T + np.roll(ordered[end], -1, axis=1) - (edge[None, :] + gain[:, None])
+        delta[np.arange(len(i))[:, None], i[:, None] - 1 + np.arange(length + 1)] = np.inf
+        k = np.unravel_index(np.argmin(delta), delta.shape)
+        if delta[k] < best[0]:
+            best = (float(delta[k]), int(k[0]) + 1, length, int(k[1]))
+    return best
+
+
+def improve_tour(dist: np.ndarray, tour: list) -> (list, int):
+    """This function improves a closed tour by the best 2-opt or Or-opt move, as long as one shortens it.
+    The first position of the tour never moves.
+    @:param dist - np.ndarray, the |N|x|N| distance matrix
+    @:param tour - list, the order of the indices in the tour
+    @:return (tour, moves) - the improved tour and the number of moves made"""
+    moves = 0
+    if len(tour) < 3:
+        return tour, moves
+    for _ in range(100 * len(tour)):
+        length = float(dist[tour, np.roll(tour, -1)].sum())
+        two_opt = _two_opt_move(dist, tour)
+        or_opt = _or_opt_move(dist, tour)
+        if min(two_opt[0], or_opt[0]) >= -_TSP_EPSILON * (1 + length):
+            break
+        if two_opt[0] <= or_opt[0]:
+            delta, i, j = two_opt
+            tour = tour[:i] + tour[i:j + 1][::-1] + tour[j + 1:]
+        else:
+            delta, i, count, p = or_opt
+            part = tour[i:i + count]
+            rest = tour[:i] + tour[i + count:]
+            q = rest.index(tour[p]) + 1
+            tour = rest[:q] + part + rest[q:]
+        moves += 1
+    return tour, moves